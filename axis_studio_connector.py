@@ -6,8 +6,14 @@ It is intentionally separated from MocapConnector:
 - Mocap mode talks directly to motion capture devices through MocapAPI.
 - Secap mode only receives Axis Studio BVH broadcast data.
 """
+import ctypes
+import operator
+import sys
 import threading
 import time
+from collections.abc import Mapping
+from enum import IntEnum
+from types import MappingProxyType
 from typing import Optional, Dict
 import numpy as np
 
@@ -17,12 +23,161 @@ try:
         MCPBvhData, MCPBvhRotation, MCPBvhDisplacement, MCPEventType
     )
     AXIS_STUDIO_API_AVAILABLE = True
+    # 事件类型在导入时解析为普通 int，轮询时无需再查 MCPEventType 属性
+    _EVT_AVATAR = int(MCPEventType.AvatarUpdated)
+    _EVT_ERROR = int(MCPEventType.Error)
 except ImportError as e:
     print(f"Warning: Axis Studio API not available: {e}")
     AXIS_STUDIO_API_AVAILABLE = False
+    _EVT_AVATAR = None
+    _EVT_ERROR = None
 
 
-class AxisStudioConnectionState:
+_ZERO_POSITION = (0.0, 0.0, 0.0)
+_IDENTITY_ROTATION = (1.0, 0.0, 0.0, 0.0)
+_FRAME_POOL_SIZE = 4  # 渲染端同时持有的帧数很少，少量复用即可
+
+# UDP 接收缓冲区期望大小：120Hz × ~5KB BVH 帧，留足 GC / UI 卡顿时的突发余量。
+# MocapAPI 的 socket 在原生库内部创建且未暴露，无法直接 setsockopt(SO_RCVBUF)；
+# 其大小取决于系统默认值，Linux 下可通过以下命令调大：
+#   sysctl -w net.core.rmem_max=8388608 net.core.rmem_default=8388608
+_UDP_RCVBUF_TARGET = 8 * 1024 * 1024
+_LINUX_RMEM_DEFAULT_PATH = "/proc/sys/net/core/rmem_default"
+
+_TIMEOUT_CHECK_INTERVAL_NS = 100_000_000  # 空轮询时数据超时检查的最小间隔（100ms）
+_MCP_NO_ERROR = 0  # MCPError.NoError
+_ERROR_REPORT_RATE = 5.0  # 热路径错误信息每秒最多输出条数
+_ERROR_REPEAT_INTERVAL_NS = 1_000_000_000  # 相同错误信息的最小重复输出间隔
+
+# 事件字段访问器（C 实现，省去逐级属性解析）
+_get_avatar_handle = operator.attrgetter('event_data.avatar_handle')
+_get_event_error = operator.attrgetter('event_data.error')
+
+
+def _joint_buffer_pointers(pos_buf, rot_buf) -> list:
+    """
+    为 SoA 缓冲区的每一行预生成 c_float 指针
+    
+    MocapAPI 的关节接口以输出指针返回分量，直接传入缓冲区地址即可
+    让原生库写入 float32 行，省去每帧的 c_float 临时对象和 tuple。
+    旋转接口的参数顺序为 (x, y, z, w)，缓冲区布局为 (w, x, y, z)。
+    """
+    float_ptr = ctypes.POINTER(ctypes.c_float)
+    size = ctypes.sizeof(ctypes.c_float)
+    pos_base = pos_buf.ctypes.data
+    rot_base = rot_buf.ctypes.data
+    
+    pointers = []
+    for i in range(len(pos_buf)):
+        p = pos_base + i * 3 * size
+        r = rot_base + i * 4 * size
+        pointers.append((
+            ctypes.cast(p, float_ptr),
+            ctypes.cast(p + size, float_ptr),
+            ctypes.cast(p + 2 * size, float_ptr),
+            ctypes.cast(r + size, float_ptr),
+            ctypes.cast(r + 2 * size, float_ptr),
+            ctypes.cast(r + 3 * size, float_ptr),
+            ctypes.cast(r, float_ptr),
+        ))
+    return pointers
+
+
+def _quats_to_matrices(quats, out):
+    """
+    批量把 (w, x, y, z) 四元数转换为 3×3 旋转矩阵
+    
+    参数:
+        quats: (N, 4) 四元数缓冲区
+        out: (N, 3, 3) 输出缓冲区，原地写入
+    """
+    w, x, y, z = quats[:, 0], quats[:, 1], quats[:, 2], quats[:, 3]
+    xx, yy, zz = x * x, y * y, z * z
+    xy, xz, yz = x * y, x * z, y * z
+    wx, wy, wz = w * x, w * y, w * z
+    
+    out[:, 0, 0] = 1 - 2 * (yy + zz)
+    out[:, 0, 1] = 2 * (xy - wz)
+    out[:, 0, 2] = 2 * (xz + wy)
+    out[:, 1, 0] = 2 * (xy + wz)
+    out[:, 1, 1] = 1 - 2 * (xx + zz)
+    out[:, 1, 2] = 2 * (yz - wx)
+    out[:, 2, 0] = 2 * (xz - wy)
+    out[:, 2, 1] = 2 * (yz + wx)
+    out[:, 2, 2] = 1 - 2 * (xx + yy)
+    return out
+
+
+class JointFrameView(Mapping):
+    """
+    关节数据的兼容视图（按名称访问）
+
+    实时帧数据以 SoA 缓冲区（positions: (N,3), rotations: (N,4)）保存，
+    此视图为仍使用 ``joints['Hips']['position']`` 的调用方按需构建
+    ``{name: {'position': tuple, 'rotation': tuple}}`` 字典，只在首次访问时构建一次。
+    """
+
+    __slots__ = ('_names', '_index', '_positions', '_rotations', '_joints')
+
+    def __init__(self, names, positions, rotations, index=None):
+        self.rebind(names, positions, rotations, index)
+
+    def rebind(self, names, positions, rotations, index=None):
+        """绑定到新一帧的缓冲区并丢弃已构建的字典（帧对象复用时调用）"""
+        self._names = names
+        self._index = index
+        self._positions = positions
+        self._rotations = rotations
+        self._joints = None
+
+    def _materialize(self) -> Dict:
+        if self._joints is None:
+            self._joints = {
+                name: {'position': tuple(pos), 'rotation': tuple(rot)}
+                for name, pos, rot in zip(
+                    self._names, self._positions.tolist(), self._rotations.tolist()
+                )
+            }
+        return self._joints
+
+    def __getitem__(self, name):
+        return self._materialize()[name]
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        if self._index is not None:
+            return name in self._index
+        return name in self._materialize()
+
+
+class _TokenBucket:
+    """令牌桶：按固定速率补充令牌，用于限制输出频率"""
+
+    __slots__ = ('rate', 'capacity', '_tokens', '_last_ns')
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._last_ns = time.monotonic_ns()
+
+    def consume(self) -> bool:
+        """尝试取出一个令牌，成功返回 True"""
+        now_ns = time.monotonic_ns()
+        self._tokens = min(self.capacity, self._tokens + (now_ns - self._last_ns) * self.rate / 1e9)
+        self._last_ns = now_ns
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        return False
+
+
+class AxisStudioConnectionState(IntEnum):
     """Axis Studio 连接状态"""
     DISCONNECTED = 0      # 未连接（未监听 UDP）
     LISTENING = 1         # 正在监听/连接 Axis Studio 广播
@@ -45,11 +200,26 @@ class AxisStudioConnector:
     - 无需发送命令（单向接收）
     """
     
+    # 固定属性集合：poll_and_update 中频繁读写的字段走 slot 描述符而非实例 __dict__
+    __slots__ = (
+        'app', 'settings', 'is_listening', 'is_receiving_data',
+        'latest_frame_data', '_lock', 'connection_state',
+        'transport', 'udp_port', 'tcp_ip', 'tcp_port',
+        'frame_count', 'last_fps_time_ns', 'current_fps', 'dropped_frames', 'frame_seq',
+        'last_data_time_ns', 'data_timeout_ns', '_next_timeout_check_ns',
+        '_err_throttle', '_last_error_message', '_last_error_time_ns', '_suppressed_errors',
+        '_joint_names', '_name_to_id', '_avatar_handle', '_pos_buf', '_rot_buf', '_frame_pool',
+        '_poll_thread', '_poll_stop', 'frame_ready',
+        '_status_dict', '_status_view', '_serialize_buf', '_serialize_mv',
+    )
+    
     def __init__(self):
         self.app = None
         self.settings = None
         self.is_listening = False
         self.is_receiving_data = False
+        # 最新帧引用：单写者（轮询线程）整体替换引用，读者直接读取。
+        # 属性赋值本身是原子的，无需加锁；_lock 仅保护帧对象池。
         self.latest_frame_data = None
         self._lock = threading.Lock()
         self.connection_state = AxisStudioConnectionState.DISCONNECTED
@@ -62,12 +232,46 @@ class AxisStudioConnector:
         
         # 帧率统计
         self.frame_count = 0
-        self.last_fps_time = time.time()
+        self.last_fps_time_ns = time.monotonic_ns()
         self.current_fps = 0.0
+        self.dropped_frames = 0  # 同一次轮询中被更新帧覆盖、未解析的帧数
+        self.frame_seq = 0  # 每解析出一帧新数据加一；重复帧沿用上一帧的序号
         
         # 数据接收状态
-        self.last_data_time = None
-        self.data_timeout = 5.0  # 5秒无数据视为断开
+        self.last_data_time_ns = None
+        self.data_timeout_ns = 5_000_000_000  # 5秒无数据视为断开
+        self._next_timeout_check_ns = 0
+        
+        # 热路径错误输出限流（错误风暴时 print 的 I/O 锁会拖慢接收线程）
+        self._err_throttle = _TokenBucket(_ERROR_REPORT_RATE)
+        self._last_error_message = None
+        self._last_error_time_ns = 0
+        self._suppressed_errors = 0
+        
+        # 关节 SoA 缓冲区（首次收到 AvatarUpdated 时按关节数分配）
+        self._joint_names = []  # 关节 ID -> 名称
+        self._name_to_id = {}  # 名称 -> 关节 ID（缓冲区行号）
+        self._avatar_handle = None  # 上述布局所属的 Avatar 句柄
+        # 上一帧关节位置/旋转的副本，用于识别重复帧
+        self._pos_buf = None  # (N, 3) float32
+        self._rot_buf = None  # (N, 4) float32 (w, x, y, z)
+        
+        # 帧字典对象池（Visualizer 渲染后通过 release_frame 归还）
+        self._frame_pool = []
+        
+        # 后台轮询线程（可选，见 start_background_polling）
+        self._poll_thread = None
+        self._poll_stop = threading.Event()
+        # 新帧发布后置位，消费者 wait()/clear() 代替忙等轮询
+        self.frame_ready = threading.Event()
+        
+        # get_status_info 复用的状态字典及其只读视图
+        self._status_dict = {}
+        self._status_view = MappingProxyType(self._status_dict)
+        
+        # get_latest_frame_bytes 复用的序列化缓冲区（64KB 足够常见骨骼，不足时扩容）
+        self._serialize_buf = bytearray(1 << 16)
+        self._serialize_mv = memoryview(self._serialize_buf)
     
     def configure(
         self,
@@ -125,8 +329,11 @@ class AxisStudioConnector:
             success, msg = self.app.open()
             
             if success:
+                self._reset_joint_buffers()
                 self.is_listening = True
-                self.last_data_time = time.time()
+                self.last_data_time_ns = time.monotonic_ns()
+                if self.transport == "udp":
+                    self._check_udp_receive_buffer()
                 print(f"[AxisStudioConnector] Listening on {self.get_endpoint_label()}")
                 print(f"[AxisStudioConnector] Waiting for Axis Studio BVH broadcast...")
                 return True, f"Listening on {self.get_endpoint_label()}"
@@ -138,8 +345,27 @@ class AxisStudioConnector:
             self.connection_state = AxisStudioConnectionState.ERROR
             return False, str(e)
     
+    def _check_udp_receive_buffer(self):
+        """
+        检查系统默认 UDP 接收缓冲区大小
+        
+        缓冲区过小时突发帧会被内核静默丢弃，表现为数据超时；
+        这里只能读取系统设置并给出调整提示。
+        """
+        try:
+            with open(_LINUX_RMEM_DEFAULT_PATH) as f:
+                rmem_default = int(f.read().strip())
+        except (OSError, ValueError):
+            return  # 非 Linux 或无权限读取
+        
+        if rmem_default < _UDP_RCVBUF_TARGET:
+            print(f"[AxisStudioConnector] UDP receive buffer is {rmem_default // 1024} KB; "
+                  f"consider 'sysctl -w net.core.rmem_max={_UDP_RCVBUF_TARGET} "
+                  f"net.core.rmem_default={_UDP_RCVBUF_TARGET}' to avoid packet drops")
+    
     def stop_listening(self):
         """停止监听 BVH 广播"""
+        self.stop_background_polling()
         try:
             if self.app:
                 self.app.close()
@@ -163,101 +389,360 @@ class AxisStudioConnector:
         返回:
             最新的帧数据，格式为:
             {
-                'joints': {
-                    'Hips': {'position': (x,y,z), 'rotation': (w,x,y,z)},
-                    'RightUpLeg': {...},
-                    ...
-                },
-                'timestamp': float
+                'joints_pos': np.ndarray (N, 3) float32,
+                'joints_rot': np.ndarray (N, 4) float32, (w, x, y, z)
+                'joints_rotmat': np.ndarray (N, 3, 3) float32, 与 joints_rot 对应的旋转矩阵
+                'names': [str, ...],  # 关节 ID -> 名称，与缓冲区行顺序一致
+                'name_to_id': {str: int},  # 名称 -> 关节 ID，骨骼不变时为同一对象
+                'joints': JointFrameView,  # 兼容旧接口: joints['Hips']['position']
+                'timestamp': float,
+                'seq': int  # 新数据帧序号，重复帧不变；序号未变时无需重算骨骼
             }
+            
+            注意：帧对象池化复用，release_frame 归还后不应再访问其缓冲区。
         """
         if not self.is_listening or not self.app:
             return None
         
-        frame_data = None
-        
+        # 只有 SDK 调用可能抛出异常；其余事件分发为纯 Python，出错应直接暴露
         try:
             events = self.app.poll_next_event()
+        except Exception as e:
+            self._report_error(f"Poll error: {e}")
+            return None
+        
+        # 空轮询是最常见的情况（帧间隙 / Axis Studio 暂停），只做节流后的超时检查
+        if not events:
+            self._check_data_timeout()
+            return None
+        
+        frame_data = None
+        
+        # 一次轮询可能积压多帧，渲染端只需要最新一帧：
+        # 只解析最后一个 AvatarUpdated，其余计入 dropped_frames
+        latest_avatar_evt = None
+        avatar_count = 0
+        evt_avatar = _EVT_AVATAR
+        evt_error = _EVT_ERROR
+        for evt in events:
+            event_type = evt.event_type
+            if event_type == evt_avatar:
+                latest_avatar_evt = evt
+                avatar_count += 1
+            elif event_type == evt_error:
+                self._report_error(f"Error event: {_get_event_error(evt)}")
+            # RigidBodyUpdated: Axis Studio BVH 模式通常不包含刚体数据
+        
+        if latest_avatar_evt is not None:
+            # 标记正在接收数据
+            if not self.is_receiving_data:
+                self.is_receiving_data = True
+                self.connection_state = AxisStudioConnectionState.RECEIVING
+                print("[AxisStudioConnector] Started receiving BVH data from Axis Studio")
             
-            for evt in events:
-                if evt.event_type == MCPEventType.AvatarUpdated:
-                    # 标记正在接收数据
-                    if not self.is_receiving_data:
-                        self.is_receiving_data = True
-                        self.connection_state = AxisStudioConnectionState.RECEIVING
-                        print("[AxisStudioConnector] Started receiving BVH data from Axis Studio")
-                    
-                    # 解析 Avatar 数据
-                    frame_data = self._parse_avatar(evt.event_data.avatar_handle)
-                    frame_data['timestamp'] = evt.timestamp
-                    
-                    # 更新帧率统计
-                    self._update_fps()
-                    
-                    # 更新最后接收时间
-                    self.last_data_time = time.time()
-                    
-                elif evt.event_type == MCPEventType.RigidBodyUpdated:
-                    pass  # Axis Studio BVH 模式通常不包含刚体数据
-                elif evt.event_type == MCPEventType.Error:
-                    print(f"[AxisStudioConnector] Error event: {evt.event_data.error}")
-            
-            if frame_data:
-                with self._lock:
-                    self.latest_frame_data = frame_data
+            # 解析 Avatar 数据；解析失败时不发布帧，也不推进序号
+            frame_data = self._parse_avatar(_get_avatar_handle(latest_avatar_evt))
+            if frame_data is not None:
+                if self._is_repeated_frame(frame_data):
+                    # 静止/暂停时的重复帧：归还新帧，沿用已发布的上一帧（不改动其内容）
+                    if frame_data is not self.latest_frame_data:
+                        self.release_frame(frame_data)
+                    frame_data = self.latest_frame_data
+                else:
+                    self.frame_seq += 1
+                    frame_data['timestamp'] = latest_avatar_evt.timestamp
+                    frame_data['seq'] = self.frame_seq
+            self.dropped_frames += avatar_count - 1
             
-            # 检查数据超时
-            if self.is_receiving_data and self.last_data_time:
-                elapsed = time.time() - self.last_data_time
-                if elapsed > self.data_timeout:
-                    print(f"[AxisStudioConnector] No data received for {self.data_timeout}s - Axis Studio might have stopped broadcasting")
-                    self.is_receiving_data = False
-                    self.connection_state = AxisStudioConnectionState.LISTENING
+            # 更新帧率统计（按接收到的帧数计）
+            self._update_fps(avatar_count)
             
-        except Exception as e:
-            print(f"[AxisStudioConnector] Poll error: {e}")
+            # 更新最后接收时间
+            self.last_data_time_ns = time.monotonic_ns()
+        else:
+            self._check_data_timeout()
+        
+        if frame_data:
+            self.latest_frame_data = frame_data
+            self.frame_ready.set()
         
         return frame_data
     
-    def _parse_avatar(self, avatar_handle) -> Dict:
+    def _report_error(self, message: str):
+        """
+        限流输出热路径中的错误信息
+        
+        相同信息 1 秒内只输出一次，总输出速率受令牌桶限制；
+        被抑制的条数附在下一条输出的信息后面。
+        """
+        now_ns = time.monotonic_ns()
+        if (message == self._last_error_message
+                and now_ns - self._last_error_time_ns < _ERROR_REPEAT_INTERVAL_NS) \
+                or not self._err_throttle.consume():
+            self._suppressed_errors += 1
+            return
+        
+        suffix = f" ({self._suppressed_errors} similar messages suppressed)" if self._suppressed_errors else ""
+        self._suppressed_errors = 0
+        self._last_error_message = message
+        self._last_error_time_ns = now_ns
+        print(f"[AxisStudioConnector] {message}{suffix}")
+    
+    def _check_data_timeout(self):
+        """检查数据超时（最多每 _TIMEOUT_CHECK_INTERVAL_NS 检查一次）"""
+        now_ns = time.monotonic_ns()
+        if now_ns < self._next_timeout_check_ns:
+            return
+        self._next_timeout_check_ns = now_ns + _TIMEOUT_CHECK_INTERVAL_NS
+        
+        if self.is_receiving_data and self.last_data_time_ns is not None:
+            if now_ns - self.last_data_time_ns > self.data_timeout_ns:
+                print(f"[AxisStudioConnector] No data received for {self.data_timeout_ns / 1e9:.0f}s - Axis Studio might have stopped broadcasting")
+                self.is_receiving_data = False
+                self.connection_state = AxisStudioConnectionState.LISTENING
+    
+    def _is_repeated_frame(self, frame: Dict) -> bool:
+        """
+        判断刚解析出的帧是否与上一帧相同
+        
+        MocapAPI 不暴露原始数据包，这里比较全部关节的位置和旋转缓冲区：
+        实时数据中浮点值逐位相同基本只出现在 Axis Studio 暂停或重复发送时。
+        只看根关节会把根固定、四肢在动的数据（原地/无位移广播、上半身捕捉）误判为重复帧。
+        上一帧的值保存在连接器自己的副本中，帧对象池复用缓冲区时不受影响。
+        """
+        pos = frame.get('joints_pos')
+        rot = frame.get('joints_rot')
+        if pos is None or rot is None:
+            return False
+        
+        last_pos = self._pos_buf
+        if last_pos is not None and last_pos.shape == pos.shape:
+            if np.array_equal(last_pos, pos) and np.array_equal(self._rot_buf, rot):
+                return True
+            np.copyto(last_pos, pos)
+            np.copyto(self._rot_buf, rot)
+        else:
+            self._pos_buf = pos.copy()
+            self._rot_buf = rot.copy()
+        return False
+    
+    def _parse_avatar(self, avatar_handle) -> Optional[Dict]:
         """
-        解析 Avatar 数据为字典格式
+        解析 Avatar 数据到预分配的 SoA 缓冲区
         
-        与 MocapConnector 的实现相同，但属于独立模块
+        关节名称与数量按 Avatar 缓存，之后每帧只写入位置和旋转，
+        不再为每个关节分配 tuple/dict。缓冲区归属于（池化的）帧对象，
+        后台轮询线程写入新帧时不会改动渲染端仍持有的帧。
+        解析失败时返回 None：池中取出的帧缓冲区里还是旧数据，不能当作新帧发布。
         """
-        avatar = MCPAvatar(avatar_handle)
-        joints_data = {}
+        frame = None
         
         try:
-            for joint in avatar.get_joints():
-                name = joint.get_name()
-                pos = joint.get_local_position()  # (x, y, z)
-                rot = joint.get_local_rotation()  # (w, x, y, z)
-                
-                joints_data[name] = {
-                    'position': pos if pos else (0.0, 0.0, 0.0),
-                    'rotation': rot if rot else (1.0, 0.0, 0.0, 0.0)
-                }
+            joints = MCPAvatar(avatar_handle).get_joints()
+            # 换了 Avatar（骨骼可能关节数相同但名称不同）或关节数变化时重新读取名称
+            if (not self._joint_names or avatar_handle != self._avatar_handle
+                    or len(joints) != len(self._joint_names)):
+                self._joint_names = [joint.get_name() for joint in joints]
+                self._avatar_handle = avatar_handle
+                self._name_to_id = {name: i for i, name in enumerate(self._joint_names)}
+                self._pos_buf = None  # 新骨骼的第一帧不与旧骨骼比较
+                self._rot_buf = None
+            
+            frame = self._acquire_frame(len(self._joint_names))
+            pos_buf = frame['joints_pos']
+            rot_buf = frame['joints_rot']
+            joint_api = getattr(MCPJoint, 'api', None)
+            if joint_api and frame.get('_c_ptrs'):
+                self._read_joints_native(joint_api.contents, joints, frame['_c_ptrs'], pos_buf, rot_buf)
+            else:
+                for i, joint in enumerate(joints):
+                    pos = joint.get_local_position()  # (x, y, z)
+                    rot = joint.get_local_rotation()  # (w, x, y, z)
+                    pos_buf[i] = pos if pos else _ZERO_POSITION
+                    rot_buf[i] = rot if rot else _IDENTITY_ROTATION
+            
+            # 一次向量化运算得到全部关节的旋转矩阵，渲染端无需逐关节转换
+            _quats_to_matrices(rot_buf, frame['joints_rotmat'])
         except Exception as e:
-            print(f"[AxisStudioConnector] Parse avatar error: {e}")
+            self._report_error(f"Parse avatar error: {e}")
+            self.release_frame(frame)
+            return None
         
-        return {'joints': joints_data}
+        return frame
+    
+    @staticmethod
+    def _read_joints_native(api, joints, pointers, pos_buf, rot_buf):
+        """直接调用 MocapAPI 函数表，把关节分量写入缓冲区行"""
+        get_position = api.GetJointLocalTransformation
+        get_rotation = api.GetJointLocalRotation
+        for i, joint in enumerate(joints):
+            px, py, pz, rx, ry, rz, rw = pointers[i]
+            handle = joint.handle
+            if get_position(px, py, pz, handle) != _MCP_NO_ERROR:
+                pos_buf[i] = _ZERO_POSITION
+            if get_rotation(rx, ry, rz, rw, handle) != _MCP_NO_ERROR:
+                rot_buf[i] = _IDENTITY_ROTATION
+    
+    def _acquire_frame(self, joint_count: int) -> Dict:
+        """从对象池取出一个帧字典，池为空或关节数不符时分配新缓冲区"""
+        with self._lock:
+            frame = self._frame_pool.pop() if self._frame_pool else None
+        if frame is None:
+            frame = {
+                'joints_pos': None,
+                'joints_rot': None,
+                'joints_rotmat': None,
+                'names': None,
+                'name_to_id': None,
+                'joints': JointFrameView((), None, None),
+                'timestamp': 0.0,
+                '_c_ptrs': None,  # 缓冲区行指针，随缓冲区一起重建
+            }
+        if frame['joints_pos'] is None or len(frame['joints_pos']) != joint_count:
+            frame['joints_pos'] = np.empty((joint_count, 3), dtype=np.float32)
+            frame['joints_rot'] = np.empty((joint_count, 4), dtype=np.float32)
+            frame['joints_rotmat'] = np.empty((joint_count, 3, 3), dtype=np.float32)
+            frame['_c_ptrs'] = _joint_buffer_pointers(frame['joints_pos'], frame['joints_rot'])
+        frame['names'] = self._joint_names
+        frame['name_to_id'] = self._name_to_id
+        frame['joints'].rebind(self._joint_names, frame['joints_pos'], frame['joints_rot'], self._name_to_id)
+        return frame
+    
+    def joint_id(self, name: str) -> Optional[int]:
+        """
+        查询关节 ID（即 SoA 缓冲区行号）
+        
+        骨骼布局在收到第一帧后确定，调用方可缓存返回值，
+        之后直接用 frame['joints_pos'][joint_id] 访问，避免逐帧按名称查找。
+        尚未收到数据或关节不存在时返回 None。
+        """
+        return self._name_to_id.get(name)
     
-    def _update_fps(self):
+    def release_frame(self, frame: Optional[Dict]):
+        """
+        归还 poll_and_update 返回的帧字典，供下一帧复用
+        
+        调用后不应再访问该帧的内容。仍作为 latest_frame_data 发布的帧不会入池，
+        避免后台轮询线程覆盖其他读者可见的数据。
+        """
+        if not frame or not isinstance(frame.get('joints'), JointFrameView):
+            return
+        if frame is self.latest_frame_data and self.is_background_polling():
+            return
+        with self._lock:
+            if len(self._frame_pool) < _FRAME_POOL_SIZE and all(f is not frame for f in self._frame_pool):
+                self._frame_pool.append(frame)
+    
+    def _reset_joint_buffers(self):
+        """丢弃缓存的骨骼布局，下一帧重新分配"""
+        self._joint_names = []
+        self._name_to_id = {}
+        self._avatar_handle = None
+        self._pos_buf = None
+        self._rot_buf = None
+        with self._lock:
+            self._frame_pool.clear()
+    
+    # ======================== 后台轮询 ========================
+    def start_background_polling(self, interval: float = 0.001, on_frame=None) -> bool:
+        """
+        在后台守护线程中持续调用 poll_and_update
+        
+        渲染线程只需读取 get_latest_frame()，不再因轮询/解析占用主循环时间。
+        在 free-threaded（无 GIL）构建上该线程可与渲染线程真正并行。
+        
+        参数:
+            interval: 两次轮询之间的等待时间（秒）
+            on_frame: 每收到一帧即在轮询线程中调用 on_frame(frame_data)，
+                用于录制等不应受渲染卡顿影响的消费者
+        返回:
+            是否已在后台轮询
+        """
+        if not self.is_listening:
+            return False
+        if self.is_background_polling():
+            return True
+        
+        self._poll_stop.clear()
+        self._poll_thread = threading.Thread(
+            target=self._poll_loop,
+            args=(interval, on_frame),
+            name="AxisStudioPoll",
+            daemon=True
+        )
+        self._poll_thread.start()
+        gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+        print(f"[AxisStudioConnector] Background polling started (GIL {'enabled' if gil_enabled else 'disabled'})")
+        return True
+    
+    def stop_background_polling(self):
+        """停止后台轮询线程并等待其退出"""
+        thread = self._poll_thread
+        if thread is None:
+            return
+        self._poll_stop.set()
+        if thread is not threading.current_thread():
+            thread.join(timeout=1.0)
+        self._poll_thread = None
+    
+    def is_background_polling(self) -> bool:
+        """后台轮询线程是否在运行"""
+        return self._poll_thread is not None and self._poll_thread.is_alive()
+    
+    def _poll_loop(self, interval: float, on_frame=None):
+        """后台轮询主循环：Event.wait 代替 sleep，停止请求可立即唤醒"""
+        while self.is_listening and not self._poll_stop.is_set():
+            try:
+                frame_data = self.poll_and_update()
+                if frame_data and on_frame is not None:
+                    on_frame(frame_data)
+            except Exception as e:
+                # 后台线程内的异常不会传到调用方，记录后继续轮询
+                self._report_error(f"Background poll error: {e!r}")
+            self._poll_stop.wait(interval)
+    
+    def _update_fps(self, frames: int = 1):
         """更新帧率统计"""
-        self.frame_count += 1
-        current_time = time.time()
-        elapsed = current_time - self.last_fps_time
+        self.frame_count += frames
+        now_ns = time.monotonic_ns()
+        elapsed_ns = now_ns - self.last_fps_time_ns
         
-        if elapsed >= 1.0:
-            self.current_fps = self.frame_count / elapsed
+        if elapsed_ns >= 1_000_000_000:
+            self.current_fps = self.frame_count * 1e9 / elapsed_ns
             self.frame_count = 0
-            self.last_fps_time = current_time
+            self.last_fps_time_ns = now_ns
     
     def get_latest_frame(self) -> Optional[Dict]:
-        """获取最新的帧数据（线程安全）"""
-        with self._lock:
-            return self.latest_frame_data
+        """获取最新的帧数据（引用发布为原子操作，无需加锁）"""
+        return self.latest_frame_data
+    
+    def get_latest_frame_bytes(self) -> Optional[memoryview]:
+        """
+        把最新帧的关节数据打包为连续字节，供录制/网络转发使用
+        
+        布局: positions float32 (N×3) 紧接 rotations float32 (N×4, w,x,y,z)，
+        行顺序与 frame['names'] 一致。
+        
+        返回:
+            指向内部复用缓冲区的 memoryview，下一次调用时会被覆盖；
+            需要保留时请自行 bytes(...) 复制。尚无数据时返回 None。
+        """
+        frame = self.latest_frame_data
+        if not frame or frame.get('joints_pos') is None:
+            return None
+        
+        pos_bytes = memoryview(frame['joints_pos']).cast('B')
+        rot_bytes = memoryview(frame['joints_rot']).cast('B')
+        pos_size = pos_bytes.nbytes
+        total = pos_size + rot_bytes.nbytes
+        if total > len(self._serialize_buf):
+            self._serialize_mv.release()
+            self._serialize_buf = bytearray(total)
+            self._serialize_mv = memoryview(self._serialize_buf)
+        
+        self._serialize_mv[:pos_size] = pos_bytes
+        self._serialize_mv[pos_size:total] = rot_bytes
+        return self._serialize_mv[:total]
     
     def get_connection_status_text(self) -> str:
         """获取连接状态文本"""
@@ -279,30 +764,35 @@ class AxisStudioConnector:
         """
         return self.is_receiving_data
     
-    def get_status_info(self) -> Dict:
+    def get_status_info(self) -> Mapping:
         """
         获取详细状态信息
         
+        返回同一个只读视图，每次调用原地刷新其中的值；
+        调用方如需跨调用保留，请自行 dict(...) 复制。
+        
         返回:
             {
                 'listening': bool,
                 'receiving': bool,
                 'fps': float,
+                'dropped_frames': int,
                 'port': int,
                 'last_data_age': float  # 秒
             }
         """
-        return {
-            'listening': self.is_listening,
-            'receiving': self.is_receiving_data,
-            'fps': self.current_fps,
-            'transport': self.transport,
-            'port': self.udp_port,
-            'tcp_ip': self.tcp_ip,
-            'tcp_port': self.tcp_port,
-            'endpoint': self.get_endpoint_label(),
-            'last_data_age': time.time() - self.last_data_time if self.last_data_time else None
-        }
+        status = self._status_dict
+        status['listening'] = self.is_listening
+        status['receiving'] = self.is_receiving_data
+        status['fps'] = self.current_fps
+        status['dropped_frames'] = self.dropped_frames
+        status['transport'] = self.transport
+        status['port'] = self.udp_port
+        status['tcp_ip'] = self.tcp_ip
+        status['tcp_port'] = self.tcp_port
+        status['endpoint'] = self.get_endpoint_label()
+        status['last_data_age'] = (time.monotonic_ns() - self.last_data_time_ns) / 1e9 if self.last_data_time_ns is not None else None
+        return self._status_view
 
 
 # ======================== 测试代码 ========================
@@ -334,10 +824,14 @@ def test_axis_studio_receiver():
         return
     
     print(f"\nListening... Press Ctrl+C to stop")
+    connector.start_background_polling()
     
     try:
         while True:
-            frame_data = connector.poll_and_update()
+            # 阻塞等待新帧（超时后照常刷新一次状态），不再 1000 次/秒空转
+            connector.frame_ready.wait(timeout=0.1)
+            connector.frame_ready.clear()
+            frame_data = connector.get_latest_frame()
             
             if frame_data:
                 joints = frame_data.get('joints', {})
@@ -347,8 +841,6 @@ def test_axis_studio_receiver():
                 if 'Hips' in joints:
                     hips_pos = joints['Hips']['position']
                     print(f" | Hips: ({hips_pos[0]:.2f}, {hips_pos[1]:.2f}, {hips_pos[2]:.2f})", end='')
-            
-            time.sleep(0.001)
     
     except KeyboardInterrupt:
         print("\n\nStopping...")
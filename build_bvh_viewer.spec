@@ -36,11 +36,20 @@ hidden_imports = [
     'OpenGL.GL',
     'OpenGL.GLU',
     'OpenGL.GLUT',
+    'OpenGL_accelerate',  # optional C fast paths for array handoff, loaded dynamically by PyOpenGL
+    'OpenGL_accelerate.formathandler',
+    'OpenGL_accelerate.numpy_formathandler',
+    'OpenGL_accelerate.arraydatatype',
+    'OpenGL_accelerate.wrapper',
+    'OpenGL_accelerate.latebind',
+    'OpenGL_accelerate.errorchecker',
+    'OpenGL_accelerate.vbo',
     'numpy',
     'numpy.core',
     'numpy.core._multiarray_umath',
     'matplotlib',
     'matplotlib.pyplot',
+    'matplotlib.widgets',  # imported lazily inside TennisAnalyzer.show_custom_plot
     'matplotlib.backends.backend_agg',
     'tkinter',
     'tkinter.filedialog',
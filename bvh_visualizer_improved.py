@@ -1,14 +1,16 @@
 # Standard library imports
-import csv
+import atexit
+import ctypes
 import json
 import math
 import os
 import sys
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
 from datetime import datetime
 
 # Third-party library imports
 import colorsys
-import matplotlib.pyplot as plt
 import numpy as np
 import pygame
 from pygame.locals import *
@@ -83,6 +85,16 @@ except ImportError as e:
     ToastManager = None
     DropdownMenu = None
 
+# ======================== Optional JIT Acceleration ========================
+# Numba 为可选依赖：缺失时骨骼更新退回纯 NumPy 的分层批量计算
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    njit = None
+    prange = range
+    NUMBA_AVAILABLE = False
+
 
 # ======================== UI Configuration Constants ========================
 # These constants can be easily modified for future UI redesign without changing logic
@@ -401,12 +413,95 @@ class AppState:
 # ======================== 实时模式集成模块结束 ========================
 
 # ======================== 网球动作分析模块 (矩阵式交互控制版) ========================
-from matplotlib.widgets import CheckButtons
-import matplotlib.cm as cm # 用于生成颜色
+# matplotlib 只在绘制分析图表时才导入（见 show_custom_plot），不拖慢程序启动
+
+# 旋转通道名 -> 轴编号，解析时一次性转换，避免逐帧比较字符串
+ROTATION_AXIS_CODE = {'Xrotation': 0, 'Yrotation': 1, 'Zrotation': 2}
+# 按轴编号索引的平面旋转分量 (行, 列)，依次对应 [c, -s, s, c]
+# X: (1, 2)，Y: (2, 0)，Z: (0, 1)
+ROTATION_PLANE_INDEX = (
+    ((1, 1, 2, 2), (1, 2, 1, 2)),
+    ((2, 2, 0, 0), (2, 0, 2, 0)),
+    ((0, 0, 1, 1), (0, 1, 0, 1)),
+)
+IDENTITY_4X4 = np.identity(4)
+IDENTITY_4X4.flags.writeable = False
+
+# 共享的隐藏 Tk 根窗口：对话框都作为它的 Toplevel 打开，避免每次弹窗新建 Tcl 解释器
+_tk_root = None
+
+def get_tk_root():
+    """返回隐藏的共享 Tk 根窗口（首次调用或已被销毁时创建）"""
+    global _tk_root
+    if _tk_root is not None:
+        try:
+            _tk_root.winfo_exists()
+        except tk.TclError:
+            _tk_root = None
+    if _tk_root is None:
+        _tk_root = tk.Tk()
+        _tk_root.withdraw()
+    return _tk_root
+
+def release_tk_root():
+    """退出时销毁共享 Tk 根窗口（已被销毁或从未创建时什么也不做）"""
+    global _tk_root
+    if _tk_root is not None:
+        try:
+            _tk_root.destroy()
+        except tk.TclError:
+            pass
+        _tk_root = None
+
+atexit.register(release_tk_root)
+
+
+class HistoryArrays(Mapping):
+    """
+    历史记录的曲线数据：各部位 float32 数组存放在 .npz 中，首次访问某部位时才读取
+    
+    兼容原 velocities 字典的用法：data['6. Hand']、data.get('meta_config') 等
+    """
+    def __init__(self, path, parts, meta_config=None):
+        self.path = path
+        self.parts = list(parts)
+        self.meta_config = meta_config or {}
+        self._arrays = {}
+
+    def __getitem__(self, key):
+        if key == 'meta_config':
+            return self.meta_config
+        if key not in self._arrays:
+            if key not in self.parts:
+                raise KeyError(key)
+            try:
+                with np.load(self.path) as npz:
+                    self._arrays[key] = npz[key]
+            except (OSError, KeyError, ValueError):
+                self._arrays[key] = np.zeros(0, dtype=np.float32)  # 数据文件丢失时按空曲线处理
+        return self._arrays[key]
+
+    def __contains__(self, key):
+        return key == 'meta_config' or key in self.parts
+
+    def __iter__(self):
+        yield from self.parts
+        yield 'meta_config'
+
+    def __len__(self):
+        return len(self.parts) + 1
+
 
 class TennisAnalyzer:
     """网球动作分析器 - 支持多部位、多历史文件的矩阵式交互对比"""
-    HISTORY_FILE = "tennis_analysis_history.json"
+    # JSON Lines：每条记录一行，保存时只追加，不再整体读写
+    HISTORY_FILE = "tennis_analysis_history.jsonl"
+    LEGACY_HISTORY_FILE = "tennis_analysis_history.json"
+    MAX_HISTORY = 50
+    COMPACT_EVERY = 10  # 每追加 N 次压缩一次，只保留最近 MAX_HISTORY 条
+    _saves_since_compact = 0
+    # 曲线以 float32 二进制存放在该目录（每条记录一个 .npz），JSONL 中只保留元数据
+    HISTORY_DATA_DIR = "tennis_analysis_history"
 
     # ... (euler_to_matrix, calculate_angular_velocities 等方法保持不变，为节省篇幅略去) ...
     # 请确保保留这两个核心计算方法，直接复制之前的即可，或者只替换 show_custom_plot 及其辅助部分
@@ -416,7 +511,7 @@ class TennisAnalyzer:
     def get_analysis_options():
         """弹出对话框，获取左右手/脚的配置 (代码保持不变)"""
         options = {}
-        dialog = tk.Tk()
+        dialog = tk.Toplevel(get_tk_root())
         dialog.title("Analysis Settings")
         dialog.geometry("300x250")
         screen_width = dialog.winfo_screenwidth()
@@ -454,22 +549,125 @@ class TennisAnalyzer:
         dialog.wait_window()
         return options
 
+    AXIS_CODE = ROTATION_AXIS_CODE
+
+    @staticmethod
+    def axis_codes(order):
+        """把通道名序列转换为 int8 轴编号数组（已是编号时原样返回）"""
+        return np.array([TennisAnalyzer.AXIS_CODE.get(a, a) for a in order], dtype=np.int8)
+
+    @staticmethod
+    def _rot_x(c, s):
+        return np.array([[1, 0, 0], [0, c, -s], [0, s, c]])
+
+    @staticmethod
+    def _rot_y(c, s):
+        return np.array([[c, 0, s], [0, 1, 0], [-s, 0, c]])
+
+    @staticmethod
+    def _rot_z(c, s):
+        return np.array([[c, -s, 0], [s, c, 0], [0, 0, 1]])
+
+    @staticmethod
+    def _rot_x_batch(c, s):
+        M = np.zeros((len(c), 3, 3))
+        M[:, 0, 0] = 1
+        M[:, 1, 1], M[:, 1, 2] = c, -s
+        M[:, 2, 1], M[:, 2, 2] = s, c
+        return M
+
+    @staticmethod
+    def _rot_y_batch(c, s):
+        M = np.zeros((len(c), 3, 3))
+        M[:, 0, 0], M[:, 0, 2] = c, s
+        M[:, 1, 1] = 1
+        M[:, 2, 0], M[:, 2, 2] = -s, c
+        return M
+
+    @staticmethod
+    def _rot_z_batch(c, s):
+        M = np.zeros((len(c), 3, 3))
+        M[:, 0, 0], M[:, 0, 1] = c, -s
+        M[:, 1, 0], M[:, 1, 1] = s, c
+        M[:, 2, 2] = 1
+        return M
+
+    # 轴编号 -> 旋转矩阵构造函数（下标与 AXIS_CODE 对应）
+    _AXIS_BUILDERS = (_rot_x.__func__, _rot_y.__func__, _rot_z.__func__)
+    _AXIS_BATCH_BUILDERS = (_rot_x_batch.__func__, _rot_y_batch.__func__, _rot_z_batch.__func__)
+
     @staticmethod
     def euler_to_matrix(angles, order):
         rads = np.radians(angles)
-        def get_rot_mat(axis, theta):
-            c, s = np.cos(theta), np.sin(theta)
-            if axis == 'Xrotation': return np.array([[1, 0, 0], [0, c, -s], [0, s, c]])
-            elif axis == 'Yrotation': return np.array([[c, 0, s], [0, 1, 0], [-s, 0, c]])
-            elif axis == 'Zrotation': return np.array([[c, -s, 0], [s, c, 0], [0, 0, 1]])
-            return np.eye(3)
+        builders = TennisAnalyzer._AXIS_BUILDERS
         R = np.eye(3)
-        for i, axis_name in enumerate(order):
-            R = R @ get_rot_mat(axis_name, rads[i])
+        for i, axis in enumerate(TennisAnalyzer.axis_codes(order)):
+            R = R @ builders[axis](np.cos(rads[i]), np.sin(rads[i]))
         return R
 
     @staticmethod
-    def calculate_angular_velocities(joints, motion_data, frame_time, hand_side="Right", leg_side="Right"):
+    def euler_to_matrices(angles, order):
+        """
+        euler_to_matrix 的批量版本
+        
+        angles: (N, k) 角度数组（度），列顺序与 order 一致
+        order: 通道名序列或 axis_codes() 得到的轴编号
+        返回: (N, 3, 3) 旋转矩阵
+        """
+        rads = np.radians(angles)
+        axes = TennisAnalyzer.axis_codes(order)
+        
+        # 三轴顺序直接用与 SkeletonState 共用的闭式展开
+        if len(axes) == 3:
+            R = np.empty((rads.shape[0], 3, 3))
+            euler_rotation_kernel(axes)(rads, R)
+            return R
+        
+        c, s = np.cos(rads), np.sin(rads)
+        builders = TennisAnalyzer._AXIS_BATCH_BUILDERS
+        R = np.broadcast_to(np.eye(3), (rads.shape[0], 3, 3)).copy()
+        for i, axis in enumerate(axes):
+            R = np.matmul(R, builders[axis](c[:, i], s[:, i]))
+        return R
+
+    @staticmethod
+    def euler_to_quats(angles, order):
+        """
+        欧拉角序列批量转换为单位四元数
+        
+        angles: (N, k) 角度数组（度），列顺序与 order 一致
+        order: 通道名序列或 axis_codes() 得到的轴编号
+        返回: (N, 4) 四元数 (w, x, y, z)，与 euler_to_matrices 的旋转一致
+        """
+        half = np.radians(angles) * 0.5
+        c, s = np.cos(half), np.sin(half)
+        n = half.shape[0]
+        q = np.zeros((n, 4))
+        q[:, 0] = 1.0
+        for i, axis in enumerate(TennisAnalyzer.axis_codes(order)):
+            qa = np.zeros((n, 4))
+            qa[:, 0] = c[:, i]
+            qa[:, axis + 1] = s[:, i]
+            # Hamilton 积 q = q ⊗ qa（与矩阵右乘顺序一致）
+            w1, x1, y1, z1 = q.T
+            w2, x2, y2, z2 = qa.T
+            q = np.stack([
+                w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
+                w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+                w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+                w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2,
+            ], axis=1)
+        return q
+
+    @staticmethod
+    def calculate_angular_velocities(joints, motion_data, frame_time, hand_side="Right", leg_side="Right",
+                                     use_matrix=False):
+        """
+        计算击球链各部位的角速度（deg/s）
+        
+        相邻两帧的夹角默认用四元数点积 theta = 2*acos(|q_prev · q_curr|) 计算；
+        use_matrix=True 时使用旋转矩阵迹的原始公式，便于回归对比。
+        """
         target_joints = {
             '1. Thigh': f'{leg_side}UpLeg',
             '2. Hips': 'Hips',
@@ -486,51 +684,147 @@ class TennisAnalyzer:
             final_name = name
             if name not in joints:
                 continue
-            raw_channels = joints[final_name].channels
-            rot_channels = [c for c in raw_channels if 'rotation' in c]
-            if not rot_channels: continue
-            indices = [joints[final_name].channel_indices[c] for c in rot_channels]
-            joint_info[label] = {'indices': indices, 'order': rot_channels}
-
-        for i in range(2, num_frames):
+            joint = joints[final_name]
+            if not len(joint.rot_indices): continue
+            joint_info[label] = {'indices': joint.rot_indices, 'axes': joint.rot_axes}
+
+        # 整段序列一次性计算：相邻帧 (i-1, i), i = 2..num_frames-1
+        if num_frames > 2:
+            # 运动数据保持加载时的 float32，只把用到的旋转通道列升为 float64（小角度的 arccos 需要双精度）
+            md = np.asarray(motion_data)
             for label, info in joint_info.items():
-                curr_angles = [motion_data[i][idx] for idx in info['indices']]
-                prev_angles = [motion_data[i-1][idx] for idx in info['indices']]
-                R_curr = TennisAnalyzer.euler_to_matrix(curr_angles, info['order'])
-                R_prev = TennisAnalyzer.euler_to_matrix(prev_angles, info['order'])
-                R_diff = R_prev.T @ R_curr
-                trace = np.clip(np.trace(R_diff), -1.0, 3.0)
-                theta_deg = np.degrees(np.arccos((trace - 1) / 2))
-                velocities[label].append(theta_deg / frame_time)
+                angles = md[1:, info['indices']].astype(np.float64)
+                if use_matrix:
+                    R = TennisAnalyzer.euler_to_matrices(angles, info['axes'])
+                    R_diff = np.matmul(R[:-1].transpose(0, 2, 1), R[1:])
+                    trace = np.clip(np.einsum('nii->n', R_diff), -1.0, 3.0)
+                    theta_deg = np.degrees(np.arccos((trace - 1) / 2))
+                else:
+                    q = TennisAnalyzer.euler_to_quats(angles, info['axes'])
+                    dots = np.abs(np.einsum('ij,ij->i', q[:-1], q[1:]))
+                    theta_deg = np.degrees(2 * np.arccos(np.clip(dots, -1.0, 1.0)))
+                velocities[label] = (theta_deg / frame_time).tolist()
 
         velocities['meta_config'] = {'hand': hand_side, 'leg': leg_side}
         return velocities
 
     @staticmethod
     def load_history():
-        if os.path.exists(TennisAnalyzer.HISTORY_FILE):
-            try:
-                with open(TennisAnalyzer.HISTORY_FILE, 'r') as f: return json.load(f)
-            except: pass
-        return []
+        if not os.path.exists(TennisAnalyzer.HISTORY_FILE):
+            return TennisAnalyzer._migrate_legacy_history()
+        history = []
+        try:
+            with open(TennisAnalyzer.HISTORY_FILE, 'r') as f:
+                for line in f:
+                    if not line.strip(): continue
+                    try: history.append(json.loads(line))
+                    except ValueError: pass  # 跳过写到一半的损坏行
+        except OSError: pass
+        history = history[-TennisAnalyzer.MAX_HISTORY:]
+        for entry in history:
+            if 'arrays' in entry:
+                entry['data'] = HistoryArrays(
+                    os.path.join(TennisAnalyzer.HISTORY_DATA_DIR, entry['arrays']),
+                    entry.get('parts', ()), entry.get('meta_config'))
+        return history
+
+    @staticmethod
+    def _sidecar_line(entry):
+        """二进制存储的记录不再把曲线写进 JSON"""
+        if 'arrays' in entry:
+            entry = {k: v for k, v in entry.items() if k != 'data'}
+        return json.dumps(entry) + '\n'
+
+    @staticmethod
+    def write_history(history):
+        """整体重写历史文件（删除、升级和压缩时使用），并清理不再引用的数据文件"""
+        history = history[-TennisAnalyzer.MAX_HISTORY:]
+        with open(TennisAnalyzer.HISTORY_FILE, 'w') as f:
+            for entry in history:
+                f.write(TennisAnalyzer._sidecar_line(entry))
+        
+        data_dir = TennisAnalyzer.HISTORY_DATA_DIR
+        if os.path.isdir(data_dir):
+            referenced = {entry['arrays'] for entry in history if 'arrays' in entry}
+            for name in os.listdir(data_dir):
+                if name.endswith('.npz') and name not in referenced:
+                    try: os.remove(os.path.join(data_dir, name))
+                    except OSError: pass
+
+    @staticmethod
+    def _migrate_legacy_history():
+        """把旧版整体 JSON 历史文件转换为 JSON Lines"""
+        if not os.path.exists(TennisAnalyzer.LEGACY_HISTORY_FILE):
+            return []
+        try:
+            with open(TennisAnalyzer.LEGACY_HISTORY_FILE, 'r') as f: history = json.load(f)
+        except (OSError, ValueError): return []
+        history = history[-TennisAnalyzer.MAX_HISTORY:]
+        TennisAnalyzer.write_history(history)
+        return history
+
+    @staticmethod
+    def compute_derived(velocities):
+        """
+        预计算历史记录的派生统计量，随原始曲线一起保存
+        
+        返回: {'peaks': {part: [峰值帧号(从1开始), 峰值]}, 'len_frames': 帧数}
+        """
+        peaks = {}
+        len_frames = 0
+        for part, vals in velocities.items():
+            if part == 'meta_config' or vals is None or len(vals) == 0:
+                continue
+            arr = np.asarray(vals, dtype=np.float64)
+            max_idx = int(np.argmax(arr))
+            peaks[part] = [max_idx + 1, float(arr[max_idx])]
+            len_frames = max(len_frames, len(vals))
+        return {'peaks': peaks, 'len_frames': len_frames}
+
+    @staticmethod
+    def ensure_derived(entry):
+        """为旧版历史记录补齐 'derived' 字段，返回是否有更新"""
+        if 'derived' in entry:
+            return False
+        entry['derived'] = TennisAnalyzer.compute_derived(entry.get('data') or {})
+        return True
 
     @staticmethod
     def save_to_history(velocities, filename="Current_Session"):
+        now = datetime.now()
+        arrays = {part: np.asarray(vals, dtype=np.float32)
+                  for part, vals in velocities.items() if part != 'meta_config'}
+        arrays_name = now.strftime("%Y%m%d_%H%M%S_%f") + ".npz"
+        os.makedirs(TennisAnalyzer.HISTORY_DATA_DIR, exist_ok=True)
+        np.savez(os.path.join(TennisAnalyzer.HISTORY_DATA_DIR, arrays_name), **arrays)
+        
+        meta_config = velocities.get('meta_config', {})
         data_entry = {
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "timestamp": now.strftime("%Y-%m-%d %H:%M:%S"),
             "filename": filename,
-            "data": velocities
+            "meta_config": meta_config,
+            "derived": TennisAnalyzer.compute_derived(arrays),
+            "arrays": arrays_name,
+            "parts": list(arrays),
         }
-        history = TennisAnalyzer.load_history()
-        history.append(data_entry)
-        if len(history) > 50: history = history[-50:] 
-        with open(TennisAnalyzer.HISTORY_FILE, 'w') as f: json.dump(history, f)
-        return history
+        if not os.path.exists(TennisAnalyzer.HISTORY_FILE):
+            TennisAnalyzer._migrate_legacy_history()
+        with open(TennisAnalyzer.HISTORY_FILE, 'a') as f:
+            f.write(TennisAnalyzer._sidecar_line(data_entry))
+        data_entry['data'] = HistoryArrays(
+            os.path.join(TennisAnalyzer.HISTORY_DATA_DIR, arrays_name), arrays, meta_config)
+        data_entry['data']._arrays.update(arrays)
+        
+        TennisAnalyzer._saves_since_compact += 1
+        if TennisAnalyzer._saves_since_compact >= TennisAnalyzer.COMPACT_EVERY:
+            TennisAnalyzer._saves_since_compact = 0
+            TennisAnalyzer.write_history(TennisAnalyzer.load_history())
+        return data_entry
 
     @staticmethod
     def open_history_manager():
         history = TennisAnalyzer.load_history()
-        win = tk.Tk()
+        win = tk.Toplevel(get_tk_root())
         win.title("Tennis Analysis Manager")
         win.geometry("600x500")
 
@@ -563,24 +857,32 @@ class TennisAnalyzer:
             if not selected_indices: return
             indices_to_delete = [len(history) - 1 - i for i in selected_indices]
             indices_to_delete.sort(reverse=True)
-            if not messagebox.askyesno("Confirm", f"Delete {len(indices_to_delete)} records?"): return
+            if not messagebox.askyesno("Confirm", f"Delete {len(indices_to_delete)} records?", parent=win): return
             for idx in indices_to_delete:
                 if 0 <= idx < len(history): del history[idx]
-            with open(TennisAnalyzer.HISTORY_FILE, 'w') as f: json.dump(history, f)
+            TennisAnalyzer.write_history(history)
             refresh_list()
 
+        final_selection = []
+
         def plot_selected():
             selected_ui_indices = listbox.curselection()
             if not selected_ui_indices: return
             data_indices = [len(history) - 1 - i for i in selected_ui_indices]
             data_indices.sort()
-            final_selection = [history[i] for i in data_indices]
+            final_selection[:] = [history[i] for i in data_indices]
+            # 旧记录没有预计算统计量：补齐后写回文件，下次直接读取
+            upgraded = [TennisAnalyzer.ensure_derived(entry) for entry in final_selection]
+            if any(upgraded):
+                TennisAnalyzer.write_history(history)
             win.destroy()
-            TennisAnalyzer.show_custom_plot(final_selection)
 
         tk.Button(btn_frame, text="Delete Selected", bg="#ffdddd", command=delete_selected).pack(side=tk.LEFT, padx=20)
         tk.Button(btn_frame, text="Generate Plot", bg="#ddffdd", command=plot_selected, font=("Arial", 11, "bold")).pack(side=tk.RIGHT, padx=20)
-        win.mainloop()
+        win.wait_window()
+        # 对话框关闭后再绘图，避免在 Tk 回调中阻塞
+        if final_selection:
+            TennisAnalyzer.show_custom_plot(final_selection)
 
     @staticmethod
     def show_custom_plot(entries):
@@ -591,6 +893,8 @@ class TennisAnalyzer:
         - 核心逻辑：Line Visible = Part_Checked AND File_Checked
         """
         if not entries: return
+        import matplotlib.pyplot as plt
+        from matplotlib.widgets import CheckButtons
 
         # 布局：左侧两块用于Checkbox，中间图表，右侧信息
         fig = plt.figure(figsize=(16, 9))
@@ -620,6 +924,12 @@ class TennisAnalyzer:
         }
         part_keys = list(part_colors.keys())
 
+        # 每条记录的曲线只转换一次为 ndarray（缺失或为空的部位直接跳过）
+        def entry_arrays(entry):
+            data = entry.get('data') or {}
+            arrays = {part: np.asarray(data[part], dtype=np.float32) for part in part_keys if part in data}
+            return {part: arr for part, arr in arrays.items() if arr.size}
+
         # 历史文件颜色配置 (用于 History 数据)
         # 使用 colormap 生成不同的颜色
         hist_colors = plt.cm.tab10(np.linspace(0, 1, len(ref_entries))) if len(ref_entries) > 0 else []
@@ -635,21 +945,18 @@ class TennisAnalyzer:
             file_label = f"Hist {i+1}: {fname[:10]}.." # 缩短文件名
             color = hist_colors[i]
             
-            data = entry['data']
-            if not data: continue
+            arrays = entry_arrays(entry)
+            if not arrays: continue
             
-            # 取第一列数据做X轴
-            first_key = next(iter(data))
-            frames = range(1, len(data[first_key]) + 1) if first_key in data else []
+            # 同一记录的各部位共用一条 X 轴，按曲线长度切片
+            xs = np.arange(1, max(arr.size for arr in arrays.values()) + 1)
 
             for part in part_keys:
-                if part in data and data[part]:
-                    vals = data[part]
-                    # 确保帧数匹配
-                    xs = range(1, len(vals)+1)
+                if part in arrays:
+                    vals = arrays[part]
                     plt.sca(ax_plot)
                     # 历史数据用虚线，统一颜色
-                    l, = plt.plot(xs, vals, linestyle='--', color=color, alpha=0.6, linewidth=1)
+                    l, = plt.plot(xs[:vals.size], vals, linestyle='--', color=color, alpha=0.6, linewidth=1)
                     
                     # 记录对象
                     all_lines_data.append({
@@ -661,42 +968,43 @@ class TennisAnalyzer:
         # B. 绘制当前数据 (Main)
         current_label = "Current (Main)"
         curr_data = main_entry['data']
-        if curr_data:
-            first_key = next(iter(curr_data))
-            # 兼容：如果数据里没有meta_config等key
-            valid_keys = [k for k in curr_data.keys() if k in part_colors]
-            if valid_keys:
-                max_len = len(curr_data[valid_keys[0]])
-                frames = range(1, max_len + 1)
-
-                for part in part_keys:
-                    if part in curr_data and curr_data[part]:
-                        vals = curr_data[part]
-                        
-                        max_val = max(vals)
-                        max_frame = vals.index(max_val) + 1
-                        peak_info_main[part] = (max_frame, max_val)
-                        
-                        line_color = part_colors[part]
-                        
-                        plt.sca(ax_plot)
-                        l, = plt.plot(frames, vals, label=part, color=line_color, linewidth=2.5)
-                        p, = plt.plot(max_frame, max_val, 'o', color=line_color, markersize=6)
-                        
-                        # 标签错位
-                        y_offset = 15 if 'Hand' in part or 'Arm' in part else 25
-                        t = plt.annotate(
-                            f'{int(max_val)}\nF{max_frame}', 
-                            xy=(max_frame, max_val), xytext=(0, y_offset), 
-                            textcoords='offset points', ha='center', fontsize=8, fontweight='bold',
-                            bbox=dict(boxstyle="round,pad=0.2", fc="white", ec=line_color, alpha=0.9)
-                        )
-                        
-                        all_lines_data.append({
-                            'lines': [l, p, t],
-                            'part': part,
-                            'file': current_label
-                        })
+        TennisAnalyzer.ensure_derived(main_entry)
+        derived = main_entry['derived']
+        curr_arrays = entry_arrays(main_entry)
+        if curr_arrays:
+            frames = np.arange(1, max(arr.size for arr in curr_arrays.values()) + 1)
+
+            for part in part_keys:
+                if part in curr_arrays:
+                    vals = curr_arrays[part]
+                    
+                    peak = derived['peaks'].get(part)
+                    if peak is None:
+                        max_idx = int(vals.argmax())
+                        peak = (max_idx + 1, float(vals[max_idx]))
+                    max_frame, max_val = peak
+                    peak_info_main[part] = (max_frame, max_val)
+                    
+                    line_color = part_colors[part]
+                    
+                    plt.sca(ax_plot)
+                    l, = plt.plot(frames[:vals.size], vals, label=part, color=line_color, linewidth=2.5)
+                    p, = plt.plot(max_frame, max_val, 'o', color=line_color, markersize=6)
+                    
+                    # 标签错位
+                    y_offset = 15 if 'Hand' in part or 'Arm' in part else 25
+                    t = plt.annotate(
+                        f'{int(max_val)}\nF{max_frame}', 
+                        xy=(max_frame, max_val), xytext=(0, y_offset), 
+                        textcoords='offset points', ha='center', fontsize=8, fontweight='bold',
+                        bbox=dict(boxstyle="round,pad=0.2", fc="white", ec=line_color, alpha=0.9)
+                    )
+                    
+                    all_lines_data.append({
+                        'lines': [l, p, t],
+                        'part': part,
+                        'file': current_label
+                    })
 
         # === C. 创建 CheckButtons ===
         
@@ -781,57 +1089,275 @@ class TennisAnalyzer:
 # 全局变量：当前加载的BVH文件路径
 current_bvh_file_path = None
 
+# 叠加层字体缓存（模块级，窗口缩放/重建 OverlayManager 时无需重新加载）
+_overlay_font_cache = {}
+
 # Overlay Manager Class for high-performance 2D rendering
 class OverlayManager:
+    """
+    2D 文字叠加层
+    
+    可打印 ASCII 文字走字形图集：每个字号把全部字形光栅化进一张纹理，
+    每帧把所有文字的字形四边形（位置、UV、颜色）拼成一个顶点数组，
+    一次上传后每个字号一次 glDrawArrays(GL_TRIANGLES)。
+    其他文字（中文、符号）每个 (文字, 颜色, 字号) 只光栅化一次并上传为独立的小纹理，
+    四边形来自一个常驻显存的单位正方形 VBO，按文字尺寸平移缩放后用 glDrawArrays 绘制。
+    """
+    # 启动时预加载的字号，避免渲染中首次遇到新字号时扫描系统字体
+    PRELOAD_FONT_SIZES = (
+        12,  # 状态栏
+        UIConfig.FONT_SIZE_CAPTION, UIConfig.FONT_SIZE_BODY, UIConfig.FONT_SIZE_DEFAULT,
+        UIConfig.FONT_SIZE_HEADLINE, UIConfig.FONT_SIZE_TITLE,
+    )
+    # 文字纹理缓存上限（FPS 等频繁变化的文字会不断产生新条目）
+    MAX_CACHED_TEXTS = 256
+    # 单位四边形：交错的 (x, y, u, v)，按 GL_TRIANGLE_STRIP 顺序排列
+    QUAD_VERTICES = np.array([
+        0.0, 0.0, 0.0, 0.0,
+        1.0, 0.0, 1.0, 0.0,
+        0.0, 1.0, 0.0, 1.0,
+        1.0, 1.0, 1.0, 1.0,
+    ], dtype=np.float32)
+    QUAD_STRIDE = 4 * 4  # 每个顶点 4 个 float32
+    # 图集覆盖的字符（可打印 ASCII）与图集宽度
+    GLYPH_FIRST, GLYPH_LAST = 32, 126
+    GLYPH_ATLAS_WIDTH = 1024
+    # 字形四边形两个三角形的角点 (cx, cy)
+    GLYPH_CORNERS = np.array([[0, 0], [1, 0], [0, 1], [0, 1], [1, 0], [1, 1]], dtype=np.float32)
+    GLYPH_STRIDE = 8 * 4  # 每个顶点 (x, y, u, v, r, g, b, a) 8 个 float32
+
     def __init__(self):
-        self.surface = None
         self.width = 0
         self.height = 0
-        self.font_cache = {}
-        self.texture_id = None
+        self.font_cache = _overlay_font_cache
+        self._commands = []  # 本帧的 draw_text 命令
+        self._text_cache = OrderedDict()  # (text, color, size) -> (texture_id, w, h)，LRU 顺序
+        self._quad_vbo = None
+        self._glyph_atlases = {}  # size -> 字形图集（纹理与每个字符的宽高、UV）
+        self._text_metrics = {}  # (text, size) -> (w, h)，与 GL 上下文无关，窗口重建后保留
+        self._glyph_vbo = None
+
+    def get_font(self, size):
+        font = self.font_cache.get(size)
+        if font is None:
+            try:
+                font = pygame.font.SysFont("Arial", size)
+            except:
+                font = pygame.font.Font(None, size)
+            self.font_cache[size] = font
+        return font
+
+    def text_size(self, text, size):
+        """
+        绘制后文字的 (宽, 高) 像素尺寸，每个 (文字, 字号) 只测量一次。
+        可打印 ASCII 按图集逐字形排列，宽度为各字形宽度之和；其他文字按整串渲染的尺寸。
+        """
+        key = (text, size)
+        metrics = self._text_metrics.get(key)
+        if metrics is None:
+            font = self.get_font(size)
+            if text.isascii() and text.isprintable():
+                metrics = (sum(font.size(char)[0] for char in text), font.get_height())
+            else:
+                metrics = font.size(text)
+            self._text_metrics[key] = metrics
+        return metrics
+
+    def preload_fonts(self):
+        """预先创建常用字号的字体（需在 pygame 初始化之后调用）"""
+        for size in self.PRELOAD_FONT_SIZES:
+            self.get_font(size)
 
     def update_display_size(self, width, height):
+        if not self.font_cache:
+            self.preload_fonts()
         if self.width != width or self.height != height:
             self.width = width
             self.height = height
-            self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
-            if self.texture_id is not None:
-                glDeleteTextures([self.texture_id])
-            self.texture_id = glGenTextures(1)
+            # 窗口重建后旧的 GL 纹理和缓冲区可能已失效，全部重新生成
+            self._release_textures()
+            self._release_quad_vbo()
+            self._create_quad_vbo()
 
     def clear(self):
-        if self.surface:
-            self.surface.fill((0, 0, 0, 0))
+        self._commands = []
 
     def draw_text(self, x, y, text, color, size=18):
-        if not self.surface: return
-        if size not in self.font_cache:
+        if not self.width: return
+        # 颜色统一为 RGBA（RGB 补不透明 alpha），同字号命令才能拼成一个顶点数组
+        color = tuple(color)
+        if len(color) == 3:
+            color += (255,)
+        self._commands.append((x, y, text, color, size))
+
+    def _get_text_texture(self, text, color, size):
+        key = (text, color, size)
+        entry = self._text_cache.get(key)
+        if entry is not None:
+            self._text_cache.move_to_end(key)
+            return entry
+        
+        text_surf = self.get_font(size).render(text, True, color)
+        w, h = text_surf.get_size()
+        texture_id = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, texture_id)
+        # Use NEAREST for crisp text on overlay
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, w, h, 0, GL_RGBA, GL_UNSIGNED_BYTE,
+                     pygame.image.tostring(text_surf, "RGBA", 1))
+        
+        entry = (texture_id, w, h)
+        self._text_cache[key] = entry
+        if len(self._text_cache) > self.MAX_CACHED_TEXTS:
+            _, (old_id, _, _) = self._text_cache.popitem(last=False)
+            glDeleteTextures([old_id])
+        return entry
+
+    def _get_glyph_atlas(self, size):
+        """字号对应的字形图集：可打印 ASCII 逐个渲染为白色，按行排进一张纹理"""
+        atlas = self._glyph_atlases.get(size)
+        if atlas is not None:
+            return atlas
+        
+        font = self.get_font(size)
+        codes = range(self.GLYPH_FIRST, self.GLYPH_LAST + 1)
+        glyphs = [font.render(chr(code), True, (255, 255, 255)) for code in codes]
+        row_height = max(glyph.get_height() for glyph in glyphs)
+        places = []
+        x = y = 0
+        for glyph in glyphs:
+            if x + glyph.get_width() > self.GLYPH_ATLAS_WIDTH:
+                x, y = 0, y + row_height + 1
+            places.append((x, y))
+            x += glyph.get_width() + 1
+        atlas_height = y + row_height
+        
+        # 底色为透明白：抗锯齿边缘只体现在 alpha 上，颜色由顶点色调制
+        surface = pygame.Surface((self.GLYPH_ATLAS_WIDTH, atlas_height), pygame.SRCALPHA)
+        surface.fill((255, 255, 255, 0))
+        size_table = np.zeros((128, 2), dtype=np.float32)
+        uv_table = np.zeros((128, 4), dtype=np.float32)  # u0, v0 (底), u1, v1 (顶)
+        for code, glyph, (gx, gy) in zip(codes, glyphs, places):
+            surface.blit(glyph, (gx, gy))
+            w, h = glyph.get_size()
+            size_table[code] = (w, h)
+            # 上传时纵向翻转：纹理 v 从图集底部起算
+            uv_table[code] = (gx / self.GLYPH_ATLAS_WIDTH, 1.0 - (gy + h) / atlas_height,
+                              (gx + w) / self.GLYPH_ATLAS_WIDTH, 1.0 - gy / atlas_height)
+        
+        texture_id = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, texture_id)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, self.GLYPH_ATLAS_WIDTH, atlas_height, 0, GL_RGBA, GL_UNSIGNED_BYTE,
+                     pygame.image.tostring(surface, "RGBA", 1))
+        atlas = {'texture': texture_id, 'sizes': size_table, 'uvs': uv_table}
+        self._glyph_atlases[size] = atlas
+        return atlas
+
+    def _glyph_vertices(self, atlas, commands):
+        """一组同字号 ASCII 文字命令 -> (N*6, 8) 交错顶点数组"""
+        texts = [command[2] for command in commands]
+        lengths = np.fromiter(map(len, texts), dtype=np.intp, count=len(texts))
+        codes = np.frombuffer(''.join(texts).encode('ascii'), dtype=np.uint8)
+        owner = np.repeat(np.arange(len(texts)), lengths)
+        params = np.array([(x, y) + color for x, y, _, color, _ in commands], dtype=np.float32)
+        params[:, 2:] /= 255.0
+        
+        # 每个字形的笔位置：全局累加宽度减去所在字符串起点的累加值
+        sizes = atlas['sizes'][codes]
+        pen = np.cumsum(sizes[:, 0]) - sizes[:, 0]
+        first = np.cumsum(lengths) - lengths
+        x0 = params[owner, 0] + pen - pen[first][owner]
+        y0 = params[owner, 1]
+        uvs = atlas['uvs'][codes]
+        
+        cx, cy = self.GLYPH_CORNERS[:, 0], self.GLYPH_CORNERS[:, 1]
+        vertices = np.empty((len(codes), 6, 8), dtype=np.float32)
+        vertices[..., 0] = x0[:, None] + cx * sizes[:, :1]
+        vertices[..., 1] = y0[:, None] + cy * sizes[:, 1:]
+        vertices[..., 2] = uvs[:, :1] + cx * (uvs[:, 2:3] - uvs[:, :1])
+        vertices[..., 3] = uvs[:, 1:2] + cy * (uvs[:, 3:4] - uvs[:, 1:2])
+        vertices[..., 4:8] = params[owner, None, 2:6]
+        return vertices.reshape(-1, 8)
+
+    def _release_textures(self):
+        textures = [entry[0] for entry in self._text_cache.values()]
+        textures += [atlas['texture'] for atlas in self._glyph_atlases.values()]
+        if textures:
             try:
-                self.font_cache[size] = pygame.font.SysFont("Arial", size)
-            except:
-                self.font_cache[size] = pygame.font.Font(None, size)
-        
-        font = self.font_cache[size]
-        text_surf = font.render(text, True, color)
-        
-        # OpenGL coordinates (x, y) where y=0 is bottom.
-        # Pygame coordinates (x, y) where y=0 is top.
-        # Convert OpenGL y to Pygame y: y_pygame = height - y - text_height
-        
-        self.surface.blit(text_surf, (x, self.height - y - text_surf.get_height()))
+                glDeleteTextures(textures)
+            except Exception:
+                pass  # 上下文已销毁时纹理随之释放
+        self._text_cache.clear()
+        self._glyph_atlases.clear()
+
+    def _create_quad_vbo(self):
+        try:
+            self._quad_vbo = glGenBuffers(1)
+            glBindBuffer(GL_ARRAY_BUFFER, self._quad_vbo)
+            glBufferData(GL_ARRAY_BUFFER, self.QUAD_VERTICES.nbytes, self.QUAD_VERTICES, GL_STATIC_DRAW)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+            self._glyph_vbo = glGenBuffers(1)
+        except Exception as e:
+            print(f"Warning: overlay VBO unavailable: {e}")
+            self._quad_vbo = None
+            self._glyph_vbo = None
+
+    def _release_quad_vbo(self):
+        buffers = [vbo for vbo in (self._quad_vbo, self._glyph_vbo) if vbo is not None]
+        if buffers:
+            try:
+                glDeleteBuffers(len(buffers), buffers)
+            except Exception:
+                pass  # 上下文已销毁时缓冲区随之释放
+        self._quad_vbo = None
+        self._glyph_vbo = None
+
+    def _render_glyph_batches(self, batches):
+        """所有 ASCII 文字一次上传，每个字号一次 glDrawArrays"""
+        ranges = []
+        chunks = []
+        first = 0
+        for size, commands in batches.items():
+            atlas = self._get_glyph_atlas(size)
+            vertices = self._glyph_vertices(atlas, commands)
+            ranges.append((atlas['texture'], first, len(vertices)))
+            chunks.append(vertices)
+            first += len(vertices)
+        vertices = np.concatenate(chunks)
+        
+        glBindBuffer(GL_ARRAY_BUFFER, self._glyph_vbo)
+        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STREAM_DRAW)
+        glEnableClientState(GL_COLOR_ARRAY)
+        glVertexPointer(2, GL_FLOAT, self.GLYPH_STRIDE, ctypes.c_void_p(0))
+        glTexCoordPointer(2, GL_FLOAT, self.GLYPH_STRIDE, ctypes.c_void_p(2 * 4))
+        glColorPointer(4, GL_FLOAT, self.GLYPH_STRIDE, ctypes.c_void_p(4 * 4))
+        for texture_id, first, count in ranges:
+            glBindTexture(GL_TEXTURE_2D, texture_id)
+            glDrawArrays(GL_TRIANGLES, first, count)
+        glDisableClientState(GL_COLOR_ARRAY)
+
+    def preload_glyph_atlases(self):
+        """
+        预先为常用字号生成字形图集（需要 GL 上下文）。
+        按钮标签、面板数字等 ASCII 文字因此在第一帧就不再触发光栅化和纹理上传。
+        """
+        for size in self.PRELOAD_FONT_SIZES:
+            self._get_glyph_atlas(size)
 
     def render(self):
-        if not self.surface: return
-        
-        # Use NEAREST for crisp text on overlay
-        texture_data = pygame.image.tostring(self.surface, "RGBA", 1)
+        if not self.width or not self._commands or self._quad_vbo is None: return
+        # 首帧（及窗口重建后）在上下文可用时一次性预热图集
+        if not self._glyph_atlases:
+            self.preload_glyph_atlases()
         
         glEnable(GL_TEXTURE_2D)
-        glBindTexture(GL_TEXTURE_2D, self.texture_id)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
-        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, self.width, self.height, 0, GL_RGBA, GL_UNSIGNED_BYTE, texture_data)
-        
         glDisable(GL_DEPTH_TEST)
         glEnable(GL_BLEND)
         glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
@@ -844,25 +1370,443 @@ class OverlayManager:
         glPushMatrix()
         glLoadIdentity()
         
+        # (x, y) 为 OpenGL 坐标（y=0 在底部），即文字左下角
+        batches = {}
+        singles = []
+        for command in self._commands:
+            text = command[2]
+            if not text:
+                continue
+            if text.isascii() and text.isprintable():
+                batches.setdefault(command[4], []).append(command)
+            else:
+                singles.append(command)
+        
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+        if batches:
+            self._render_glyph_batches(batches)
+        
         glColor4f(1, 1, 1, 1)
-        glBegin(GL_QUADS)
-        glTexCoord2f(0, 0); glVertex2f(0, 0)
-        glTexCoord2f(1, 0); glVertex2f(self.width, 0)
-        glTexCoord2f(1, 1); glVertex2f(self.width, self.height)
-        glTexCoord2f(0, 1); glVertex2f(0, self.height)
-        glEnd()
+        glBindBuffer(GL_ARRAY_BUFFER, self._quad_vbo)
+        glVertexPointer(2, GL_FLOAT, self.QUAD_STRIDE, ctypes.c_void_p(0))
+        glTexCoordPointer(2, GL_FLOAT, self.QUAD_STRIDE, ctypes.c_void_p(2 * 4))
+        for x, y, text, color, size in singles:
+            texture_id, w, h = self._get_text_texture(text, color, size)
+            glBindTexture(GL_TEXTURE_2D, texture_id)
+            glLoadIdentity()
+            glTranslatef(x, y, 0)
+            glScalef(w, h, 1)
+            glDrawArrays(GL_TRIANGLE_STRIP, 0, 4)
+        
+        glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
         
         glPopMatrix()
         glMatrixMode(GL_PROJECTION)
         glPopMatrix()
         glMatrixMode(GL_MODELVIEW)
         
+        glBindTexture(GL_TEXTURE_2D, 0)
         glDisable(GL_BLEND)
         glDisable(GL_TEXTURE_2D)
         glEnable(GL_DEPTH_TEST)
 
 overlay_manager = OverlayManager()
 
+# Skeleton numeric state (SoA)
+class SkeletonState:
+    """
+    Numeric per-joint state stored as parallel arrays indexed by ``Joint.index``.
+    
+    ``dtype`` sets the float precision of the per-frame arrays: float64 for parsed BVH files,
+    float32 for the real-time skeleton whose matrices only feed rendering.
+    
+    Attributes:
+        matrices (np.ndarray): (J, 4, 4) world transformation matrices
+        positions (np.ndarray): (J, 3) world positions
+        velocities (np.ndarray): (J, 3) linear velocities
+        accelerations (np.ndarray): (J, 3) linear accelerations
+        parents (np.ndarray): (J,) int32 parent row of each joint, -1 for roots
+        levels (list): Row index arrays grouped by depth (roots first)
+    """
+    def __init__(self, joint_count, dtype=np.float64):
+        self.matrices = np.tile(np.identity(4, dtype=dtype), (joint_count, 1, 1))
+        self.positions = np.zeros((joint_count, 3), dtype=dtype)
+        self.velocities = np.zeros((joint_count, 3), dtype=dtype)
+        self.accelerations = np.zeros((joint_count, 3), dtype=dtype)
+        self.parents = np.full(joint_count, -1, dtype=np.int32)
+        self.levels = []
+        self.topological = False
+        self._local = np.tile(np.identity(4, dtype=dtype), (joint_count, 1, 1))
+        self._rot_cols = np.zeros((joint_count, 3), dtype=np.intp)
+        self._rot_mask = np.zeros((joint_count, 3), dtype=bool)
+        self._rot_axes = np.zeros((joint_count, 3), dtype=np.intp)
+        self._pos_rows = np.zeros(0, dtype=np.intp)
+        self._pos_cols = np.zeros((0, 3), dtype=np.intp)
+        self._pos_mask = np.zeros((0, 3), dtype=bool)
+        self._root_cols = np.full((joint_count, 3), -1, dtype=np.intp)
+        self._euler = None  # 所有关节共用同一旋转通道顺序时的专用旋转函数
+        # 实时模式每帧复用的输入缓冲：四元数 (w, x, y, z)；旋转直接写入局部矩阵的 3x3 视图
+        self._quats = np.tile((1.0, 0.0, 0.0, 0.0), (joint_count, 1))
+        self._local_rotations = self._local[:, :3, :3]
+
+    def set_topology(self, joints):
+        """
+        Flatten the joint tree into parent indices, per-depth row groups and channel index arrays.
+        
+        Args:
+            joints (iterable): Joint objects already bound to this state
+        """
+        joints = list(joints)
+        depth = np.zeros(len(self.parents), dtype=np.int32)
+        # 解析顺序即先序遍历：父关节总在子关节之前
+        for joint in joints:
+            parent = joint.parent
+            if parent is not None and parent.state is self:
+                self.parents[joint.index] = parent.index
+                depth[joint.index] = depth[parent.index] + 1
+            else:
+                self.parents[joint.index] = -1
+            self._local[joint.index, :3, 3] = joint.offset
+            # 每个关节最多三个旋转通道，缺失的槽位角度为 0（单位矩阵）
+            for slot, (col, axis) in enumerate(zip(joint.rot_indices[:3], joint.rot_axes[:3])):
+                self._rot_cols[joint.index, slot] = col
+                self._rot_axes[joint.index, slot] = axis
+                self._rot_mask[joint.index, slot] = True
+        self.levels = [np.flatnonzero(depth == d) for d in range(int(depth.max()) + 1)] if len(depth) else []
+        # 父关节行号总小于子关节时可以按行号顺序逐个累乘（JIT 内核要求）
+        self.topological = bool(np.all(self.parents < np.arange(len(self.parents))))
+        # BVH 文件几乎总是所有关节同一欧拉顺序：按该顺序生成展开后的旋转函数
+        uniform = len(self._rot_axes) and self._rot_mask.all() and (self._rot_axes == self._rot_axes[0]).all()
+        self._euler = euler_rotation_kernel(self._rot_axes[0]) if uniform else None
+        
+        # 根关节的世界平移直接取位置通道（不叠加 OFFSET）
+        roots = np.flatnonzero(self.parents < 0)
+        self._pos_rows = roots
+        self._pos_cols = np.zeros((len(roots), 3), dtype=np.intp)
+        self._pos_mask = np.zeros((len(roots), 3), dtype=bool)
+        joints_by_index = {joint.index: joint for joint in joints}
+        for i, row in enumerate(roots):
+            channel_indices = joints_by_index[row].channel_indices
+            for axis, channel in enumerate(('Xposition', 'Yposition', 'Zposition')):
+                if channel in channel_indices:
+                    self._pos_cols[i, axis] = channel_indices[channel]
+                    self._pos_mask[i, axis] = True
+                    self._root_cols[row, axis] = channel_indices[channel]
+            self._local[row, :3, 3] = 0.0
+
+    def update_matrices(self, frame_data):
+        """Compute all world matrices for one motion-data row: batched local matrices, then one matmul per depth."""
+        frame_data = np.asarray(frame_data, dtype=np.float64)
+        angles = np.radians(np.where(self._rot_mask, frame_data[self._rot_cols], 0.0))
+        local = self._local
+        local[self._pos_rows, :3, 3] = np.where(self._pos_mask, frame_data[self._pos_cols], 0.0)
+        if self._euler is not None:
+            self._euler(angles, local[:, :3, :3])
+        else:
+            local[:, :3, :3] = _axis_rotation_batch(self._rot_axes[:, 0], angles[:, 0])
+            for slot in (1, 2):
+                local[:, :3, :3] = local[:, :3, :3] @ _axis_rotation_batch(self._rot_axes[:, slot], angles[:, slot])
+        self._compose(local)
+
+    def update_from_rotations(self, rotations, root_translation):
+        """
+        Compute all world matrices from externally supplied local rotations (real-time modes).
+        
+        Args:
+            rotations (np.ndarray): (J, 3, 3) local rotation per row, or None when
+                ``_local_rotations`` was already filled in place
+            root_translation: World translation applied to the root rows
+        """
+        local = self._local
+        if rotations is not None:
+            local[:, :3, :3] = rotations
+        local[self._pos_rows, :3, 3] = root_translation
+        self._compose(local)
+
+    def _compose(self, local):
+        """World matrices from (J, 4, 4) local matrices into ``self.matrices``."""
+        world = self.matrices
+        if NUMBA_AVAILABLE and self.topological:
+            _compose_world_matrices(local, self.parents, world)
+            return
+        for level, rows in enumerate(self.levels):
+            if level == 0:
+                world[rows] = local[rows]
+            else:
+                world[rows] = world[self.parents[rows]] @ local[rows]
+
+    def world_matrices(self, frames):
+        """
+        World matrices for many motion-data rows at once.
+        
+        Args:
+            frames (np.ndarray): (F, C) motion data
+        
+        Returns:
+            np.ndarray: (F, J, 4, 4) world matrices in the frames' float precision
+                (float32 stays float32); ``self.matrices`` is left untouched
+        """
+        frames = np.asarray(frames)
+        dtype = np.result_type(frames.dtype, np.float32)
+        frames = frames.astype(dtype, copy=False)
+        if NUMBA_AVAILABLE and self.topological:
+            # JIT 内核按帧并行，逐关节标量计算，不产生中间数组
+            world = np.empty((len(frames),) + self._local.shape, dtype=dtype)
+            _fk_kernel(self.parents, self._rot_axes, self._rot_cols, self._rot_mask,
+                       np.ascontiguousarray(self._local[:, :3, 3], dtype=dtype), self._root_cols,
+                       np.ascontiguousarray(frames), world)
+            return world
+        angles = np.radians(np.where(self._rot_mask, frames[:, self._rot_cols], dtype.type(0)))  # (F, J, 3)
+        local = np.broadcast_to(self._local.astype(dtype), (len(frames),) + self._local.shape).copy()
+        local[..., :3, 3][:, self._pos_rows] = np.where(self._pos_mask, frames[:, self._pos_cols], dtype.type(0))
+        if self._euler is not None:
+            self._euler(angles, local[..., :3, :3])
+        else:
+            rotation = _axis_rotation_batch(self._rot_axes[:, 0], angles[..., 0])
+            for slot in (1, 2):
+                rotation = rotation @ _axis_rotation_batch(self._rot_axes[:, slot], angles[..., slot])
+            local[..., :3, :3] = rotation
+        
+        # 同一深度的关节互不依赖：每层一次批量乘法覆盖全部帧
+        world = np.empty_like(local)
+        for level, rows in enumerate(self.levels):
+            if level == 0:
+                world[:, rows] = local[:, rows]
+            else:
+                world[:, rows] = world[:, self.parents[rows]] @ local[:, rows]
+        return world
+
+
+def _compose_world_matrices(local, parents, out):
+    """
+    World matrices in row order: out[i] = out[parents[i]] @ local[i], roots copy local[i].
+    
+    Both operands are rigid transforms (last row 0, 0, 0, 1), so only the 3x3 block and
+    translation column are multiplied: parent[:3, :3] @ R and parent[:3, :3] @ t + parent[:3, 3].
+    """
+    for i in range(local.shape[0]):
+        p = parents[i]
+        if p < 0:
+            out[i] = local[i]
+            continue
+        for r in range(3):
+            a0 = out[p, r, 0]
+            a1 = out[p, r, 1]
+            a2 = out[p, r, 2]
+            for c in range(3):
+                out[i, r, c] = a0 * local[i, 0, c] + a1 * local[i, 1, c] + a2 * local[i, 2, c]
+            out[i, r, 3] = a0 * local[i, 0, 3] + a1 * local[i, 1, 3] + a2 * local[i, 2, 3] + out[p, r, 3]
+        out[i, 3, 0] = 0.0
+        out[i, 3, 1] = 0.0
+        out[i, 3, 2] = 0.0
+        out[i, 3, 3] = 1.0
+
+
+if NUMBA_AVAILABLE:
+    _compose_world_matrices = njit(cache=True, fastmath=True)(_compose_world_matrices)
+
+
+def _fk_kernel(parents, rot_axes, rot_cols, rot_mask, translations, root_cols, frames, out):
+    """
+    Forward kinematics for every frame: out[f, i] = out[f, parents[i]] @ local(f, i).
+    
+    Requires parent rows before child rows. ``root_cols`` holds the position channel per
+    row/axis (-1 keeps ``translations``); only compiled when Numba is available.
+    """
+    deg = np.pi / 180.0
+    for f in prange(frames.shape[0]):
+        for i in range(parents.shape[0]):
+            m = out[f, i]
+            m[:, :] = 0.0
+            m[0, 0] = 1.0
+            m[1, 1] = 1.0
+            m[2, 2] = 1.0
+            m[3, 3] = 1.0
+            # 局部旋转：逐通道右乘平面旋转，只改写 (a, b) 两列
+            for slot in range(3):
+                if not rot_mask[i, slot]:
+                    continue
+                a = (rot_axes[i, slot] + 1) % 3
+                b = (rot_axes[i, slot] + 2) % 3
+                angle = frames[f, rot_cols[i, slot]] * deg
+                c = np.cos(angle)
+                s = np.sin(angle)
+                for r in range(3):
+                    x = m[r, a]
+                    y = m[r, b]
+                    m[r, a] = c * x + s * y
+                    m[r, b] = c * y - s * x
+            for axis in range(3):
+                col = root_cols[i, axis]
+                m[axis, 3] = frames[f, col] if col >= 0 else translations[i, axis]
+            
+            # 按列原地左乘父关节世界矩阵：结果第 c 列只依赖局部矩阵第 c 列
+            p = parents[i]
+            if p < 0:
+                continue
+            for c in range(4):
+                l0 = m[0, c]
+                l1 = m[1, c]
+                l2 = m[2, c]
+                l3 = m[3, c]
+                for r in range(4):
+                    m[r, c] = out[f, p, r, 0] * l0 + out[f, p, r, 1] * l1 + out[f, p, r, 2] * l2 + out[f, p, r, 3] * l3
+
+
+if NUMBA_AVAILABLE:
+    _fk_kernel = njit(cache=True, fastmath=True, parallel=True)(_fk_kernel)
+
+
+def _quat_rotation_kernel(quats, out):
+    """Scalar quaternion -> rotation matrix per row; only compiled when Numba is available."""
+    for i in range(quats.shape[0]):
+        w = quats[i, 0]
+        x = quats[i, 1]
+        y = quats[i, 2]
+        z = quats[i, 3]
+        out[i, 0, 0] = 1 - 2 * (y * y + z * z)
+        out[i, 0, 1] = 2 * (x * y - z * w)
+        out[i, 0, 2] = 2 * (x * z + y * w)
+        out[i, 1, 0] = 2 * (x * y + z * w)
+        out[i, 1, 1] = 1 - 2 * (x * x + z * z)
+        out[i, 1, 2] = 2 * (y * z - x * w)
+        out[i, 2, 0] = 2 * (x * z - y * w)
+        out[i, 2, 1] = 2 * (y * z + x * w)
+        out[i, 2, 2] = 1 - 2 * (x * x + y * y)
+
+
+if NUMBA_AVAILABLE:
+    _quat_rotation_kernel = njit(cache=True, fastmath=True)(_quat_rotation_kernel)
+
+
+# 四元数 -> 旋转矩阵的 9 个元素均为 I + 两个 2*q_i*q_j 乘积的带符号和（行优先）
+# 乘积在展平的 (w, x, y, z) 外积中的列号：i * 4 + j，w=0, x=1, y=2, z=3
+QUAT_PRODUCT_COLUMNS = np.array([
+    [10, 6, 7, 6, 5, 11, 7, 11, 5],   # yy, xy, xz, xy, xx, yz, xz, yz, xx
+    [15, 12, 8, 12, 15, 4, 8, 4, 10],  # zz, zw, yw, zw, zz, xw, yw, xw, yy
+], dtype=np.intp)
+QUAT_PRODUCT_SIGNS = np.array([
+    [-1, 1, 1, 1, -1, 1, 1, 1, -1],
+    [-1, -1, 1, 1, -1, -1, -1, 1, -1],
+], dtype=np.float64)
+IDENTITY_3X3_FLAT = np.identity(3).ravel()
+
+
+def _quats_to_rotations(quats, out=None):
+    """(N, 4) quaternions (w, x, y, z) -> (N, 3, 3) rotation matrices, written into ``out`` when given."""
+    quats = np.asarray(quats, dtype=np.float64)
+    mats = np.empty((len(quats), 3, 3)) if out is None else out
+    if NUMBA_AVAILABLE:
+        # 逐关节标量展开，不产生 w/x/y/z 及中间乘积的临时数组
+        _quat_rotation_kernel(quats, mats)
+        return mats
+    # 一次外积得到全部两两乘积，再按列表取出两项：整批只有少量 ufunc 调用
+    products = (2.0 * quats[:, :, None] * quats[:, None, :]).reshape(len(quats), 16)
+    flat = (IDENTITY_3X3_FLAT
+            + QUAT_PRODUCT_SIGNS[0] * products[:, QUAT_PRODUCT_COLUMNS[0]]
+            + QUAT_PRODUCT_SIGNS[1] * products[:, QUAT_PRODUCT_COLUMNS[1]])
+    mats[:] = flat.reshape(len(quats), 3, 3)
+    return mats
+
+
+def _axis_rotation_batch(axes, angles):
+    """
+    Rotation matrices about per-joint axis codes 0/1/2 (X/Y/Z).
+    
+    ``axes`` has shape (J,); ``angles`` (radians) has shape (..., J) and the result (..., J, 3, 3).
+    """
+    c = np.cos(angles)
+    s = np.sin(angles)
+    mats = np.zeros(np.shape(angles) + (3, 3), dtype=c.dtype)
+    # 轴 k 上为 1，其余两轴 (i, j) 构成平面旋转 [[c, -s], [s, c]]
+    # X: (1, 2)，Y: (2, 0)，Z: (0, 1)
+    i = (axes + 1) % 3
+    j = (axes + 2) % 3
+    rows = np.arange(len(axes))
+    mats[..., rows, axes, axes] = 1.0
+    mats[..., rows, i, i] = c
+    mats[..., rows, j, j] = c
+    mats[..., rows, i, j] = -s
+    mats[..., rows, j, i] = s
+    return mats
+
+
+def euler_rotation_kernel(axes):
+    """
+    Fused rotation builder for one fixed channel order, generated once and cached.
+    
+    ``axes`` are the axis codes of the three rotation channels in file order
+    (e.g. (2, 0, 1) for Zrotation Xrotation Yrotation). The returned function
+    ``kernel(angles, out)`` writes R = R(axes[0]) @ R(axes[1]) @ R(axes[2]) for
+    (..., 3) radians into (..., 3, 3) ``out`` as closed-form products of the
+    six sines/cosines, instead of building and multiplying three matrices.
+    """
+    axes = tuple(int(axis) for axis in axes)
+    kernel = _EULER_KERNELS.get(axes)
+    if kernel is not None:
+        return kernel
+    
+    # 每个矩阵元素是若干 (符号, 因子) 项之和；单位元素为空因子，零元素为空列表
+    def axis_matrix(slot, axis):
+        m = [[[] for _ in range(3)] for _ in range(3)]
+        i, j = (axis + 1) % 3, (axis + 2) % 3
+        m[axis][axis] = [(1, ())]
+        m[i][i] = [(1, (f'c{slot}',))]
+        m[j][j] = [(1, (f'c{slot}',))]
+        m[i][j] = [(-1, (f's{slot}',))]
+        m[j][i] = [(1, (f's{slot}',))]
+        return m
+    
+    def matmul(a, b):
+        return [[[(sa * sb, fa + fb) for k in range(3) for sa, fa in a[r][k] for sb, fb in b[k][c]]
+                 for c in range(3)] for r in range(3)]
+    
+    product = axis_matrix(0, axes[0])
+    for slot in (1, 2):
+        product = matmul(product, axis_matrix(slot, axes[slot]))
+    
+    lines = [f"def kernel(angles, out):"]
+    for slot in range(3):
+        lines.append(f"    c{slot} = np.cos(angles[..., {slot}])")
+        lines.append(f"    s{slot} = np.sin(angles[..., {slot}])")
+    for r in range(3):
+        for c in range(3):
+            terms = ''.join(f"{'-' if sign < 0 else '+'}{'*'.join(factors) or '1.0'}"
+                            for sign, factors in product[r][c])
+            lines.append(f"    out[..., {r}, {c}] = {terms.lstrip('+') or '0.0'}")
+    namespace = {'np': np}
+    exec('\n'.join(lines), namespace)
+    kernel = _EULER_KERNELS[axes] = namespace['kernel']
+    return kernel
+
+_EULER_KERNELS = {}  # 轴序元组 -> 生成的旋转函数
+
+
+class _StateField:
+    """Joint attribute backed by a SkeletonState row once the joint is bound, else by the instance."""
+    def __init__(self, array_name):
+        self.array_name = array_name
+
+    def __set_name__(self, owner, name):
+        self.attr_name = '_' + name
+
+    def __get__(self, joint, owner=None):
+        if joint is None:
+            return self
+        if joint.state is None:
+            return joint.__dict__[self.attr_name]
+        return getattr(joint.state, self.array_name)[joint.index]
+
+    def __set__(self, joint, value):
+        if joint.state is None:
+            joint.__dict__[self.attr_name] = value
+        else:
+            getattr(joint.state, self.array_name)[joint.index] = value
+
+
 # BVH Joint Class
 class Joint:
     """
@@ -874,28 +1818,42 @@ class Joint:
         children (list): Child joints
         offset (np.ndarray): Offset from parent (3D vector)
         channels (list): Animation channels (e.g., ['Xrotation', 'Yrotation'])
+        rot_order (tuple): Rotation channel names in file order
+        rot_indices (np.ndarray): int32 motion-data columns of the rotation channels
+        rot_axes (np.ndarray): int8 axis codes (see ROTATION_AXIS_CODE) of the rotation channels
         matrix (np.ndarray): 4x4 transformation matrix
         position (np.ndarray): World position
         velocity (np.ndarray): Linear velocity
         acceleration (np.ndarray): Linear acceleration
-        rom (dict): Range of motion for rotational channels
+        rom (np.ndarray): (3, 2) range of motion [min, max] for X/Y/Z rotation channels
         anatomical_angles (dict): Calculated anatomical angles
+        index (int): Row of this joint in the bound SkeletonState (-1 if unbound)
+        state (SkeletonState): Shared numeric state, or None for standalone joints
     """
+    matrix = _StateField('matrices')
+    position = _StateField('positions')
+    velocity = _StateField('velocities')
+    acceleration = _StateField('accelerations')
+
     def __init__(self, name, parent=None):
+        self.index = -1
+        self.state = None
         self.name = name
         self.children = []
         self.parent = parent
         self.offset = np.zeros(3)
         self.channels = []
         self.channel_indices = {}
+        self.rot_order = ()
+        self.rot_indices = np.zeros(0, dtype=np.int32)
+        self.rot_axes = np.zeros(0, dtype=np.int8)
         self.matrix = np.identity(4)
         self.end_site = None
         self.position = np.zeros(3)
         self.velocity = np.zeros(3)
         self.acceleration = np.zeros(3)
-        self.rom = {'Xrotation': [float('inf'), float('-inf')],
-                    'Yrotation': [float('inf'), float('-inf')],
-                    'Zrotation': [float('inf'), float('-inf')]}
+        # Rows: X/Y/Z rotation; columns: [min, max] in degrees
+        self.rom = np.array([[np.inf, -np.inf]] * 3, dtype=np.float32)
         self.anatomical_angles = {} 
         self.channel_start_index = 0  # Store channel start index
     
@@ -910,10 +1868,37 @@ class Joint:
         self.channel_start_index = channel_start_index
         for i, channel in enumerate(channels):
             self.channel_indices[channel] = channel_start_index + i
+        # Rotation channels resolved once, so analysis code never scans channel names
+        self.rot_order = tuple(c for c in channels if 'rotation' in c)
+        self.rot_indices = np.array([self.channel_indices[c] for c in self.rot_order], dtype=np.int32)
+        self.rot_axes = np.array([ROTATION_AXIS_CODE[c] for c in self.rot_order], dtype=np.int8)
     
     def set_end_site(self, end_site):
         self.end_site = np.array(end_site)
 
+    ROM_AXES = ('Xrotation', 'Yrotation', 'Zrotation')
+
+    @property
+    def rom_by_channel(self):
+        """Range of motion keyed by channel name; values are [min, max] row views into ``rom``."""
+        return {channel: self.rom[i] for i, channel in enumerate(self.ROM_AXES)}
+
+    def update_rom(self, motion_data):
+        """Compute the range of motion for this joint's rotation channels over all frames."""
+        for i, channel in enumerate(self.ROM_AXES):
+            if channel in self.channel_indices and len(motion_data) > 0:
+                column = motion_data[:, self.channel_indices[channel]]
+                self.rom[i] = (column.min(), column.max())
+
+    def bind_state(self, state, index):
+        """Move numeric state into row ``index`` of ``state`` (values are copied over)."""
+        matrix, position = self.matrix, self.position
+        velocity, acceleration = self.velocity, self.acceleration
+        self.state = state
+        self.index = index
+        self.matrix, self.position = matrix, position
+        self.velocity, self.acceleration = velocity, acceleration
+
 # BVH File Parser
 def parse_bvh(file_path):
     """
@@ -926,87 +1911,95 @@ def parse_bvh(file_path):
         tuple: (root_joint, joints_dict, motion_data, num_frames, frame_time)
             - root_joint (Joint): Root joint of the skeleton
             - joints_dict (dict): Dictionary mapping joint names to Joint objects
-            - motion_data (list): List of frames, each frame is a list of channel values
+            - motion_data (np.ndarray): float32 array of shape (num_frames, channel_count)
             - num_frames (int): Total number of frames
             - frame_time (float): Time per frame in seconds
         
         Returns (None, {}, [], 0, 0) if parsing fails.
     """
-    try:
-        with open(file_path, 'r') as f:
-            lines = f.readlines()
-    except Exception as e:
-        print(f"Error reading file: {e}")
-        return None, {}, [], 0, 0
-    lines = [line.strip() for line in lines]
     root_joint = None
     joints = {}
     stack = []
-    line_index = 0
     channel_count = 0
-    while line_index < len(lines) and lines[line_index] != 'MOTION':
-        line = lines[line_index]
-        parts = line.split()
-        if not parts:
-            line_index += 1
-            continue
-        if parts[0] == 'HIERARCHY':
-            line_index += 1
-            continue
-        elif parts[0] == 'ROOT' or parts[0] == 'JOINT':
-            joint_name = parts[1]
-            new_joint = Joint(joint_name, parent=stack[-1] if stack else None)
-            if not root_joint:
-                root_joint = new_joint
-            joints[joint_name] = new_joint
-            if stack:
-                stack[-1].add_child(new_joint)
-            stack.append(new_joint)
-            line_index += 1
-        elif parts[0] == '{':
-            line_index += 1
-        elif parts[0] == 'OFFSET':
-            offset = [float(p) for p in parts[1:]]
-            stack[-1].set_offset(offset)
-            line_index += 1
-        elif parts[0] == 'CHANNELS':
-            num_channels = int(parts[1])
-            channels = parts[2:]
-            stack[-1].set_channels(channels, channel_count)
-            channel_count += num_channels
-            line_index += 1
-        elif parts[0] == 'End' and parts[1] == 'Site':
-            line_index += 2
-            end_site = [float(p) for p in lines[line_index].split()[1:]]
-            stack[-1].set_end_site(end_site)
-            line_index += 2
-        elif parts[0] == '}':
-            if stack:
-                stack.pop()
-            line_index += 1
-        else:
-            line_index += 1
-    
-    motion_data = []
     frames = 0
     frame_time = 0.0
-    while line_index < len(lines):
-        line = lines[line_index]
-        parts = line.split()
-        if not parts:
-            line_index += 1
-            continue
-        if parts[0] == 'MOTION':
-            line_index += 1
-        elif parts[0] == 'Frames:':
-            frames = int(parts[1])
-            line_index += 1
-        elif parts[0] == 'Frame' and parts[1] == 'Time:':
-            frame_time = float(parts[2])
-            line_index += 1
-        else:
-            motion_data.append([float(p) for p in parts])
-            line_index += 1
+    try:
+        with open(file_path, 'r') as f:
+            # HIERARCHY 部分一次 split 成词元流，按状态机解析，不保留整份文件的行列表
+            hierarchy = []
+            for line in f:
+                if line.strip() == 'MOTION':
+                    break
+                hierarchy.append(line)
+            tokens = iter(''.join(hierarchy).split())
+            for token in tokens:
+                if token == 'ROOT' or token == 'JOINT':
+                    joint_name = next(tokens)
+                    new_joint = Joint(joint_name, parent=stack[-1] if stack else None)
+                    if not root_joint:
+                        root_joint = new_joint
+                    joints[joint_name] = new_joint
+                    if stack:
+                        stack[-1].add_child(new_joint)
+                    stack.append(new_joint)
+                elif token == 'OFFSET':
+                    stack[-1].set_offset([float(next(tokens)) for _ in range(3)])
+                elif token == 'CHANNELS':
+                    num_channels = int(next(tokens))
+                    stack[-1].set_channels([next(tokens) for _ in range(num_channels)], channel_count)
+                    channel_count += num_channels
+                elif token == 'End' and next(tokens) == 'Site':
+                    # End Site { OFFSET x y z }
+                    end_site = None
+                    for site_token in tokens:
+                        if site_token == 'OFFSET':
+                            end_site = [float(next(tokens)) for _ in range(3)]
+                        elif site_token == '}':
+                            break
+                    if end_site is not None:
+                        stack[-1].set_end_site(end_site)
+                elif token == '}':
+                    if stack:
+                        stack.pop()
+            
+            # "Frames:" 与 "Frame Time:" 的数值都位于行尾，读完后文件正好停在数值块开头
+            tokens = (token for line in f for token in line.split())
+            for token in tokens:
+                if token == 'Frames:':
+                    frames = int(next(tokens))
+                elif token == 'Time:':
+                    frame_time = float(next(tokens))
+                    break
+            motion_lines = [line for line in f if not line.isspace()]
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Error reading file: {e}")
+        return None, {}, [], 0, 0
+    except (StopIteration, ValueError, IndexError) as e:
+        print(f"Error parsing hierarchy: {e}")
+        return None, {}, [], 0, 0
+    
+    # 关节数值状态集中存放在 SoA 数组中，Joint 只保留拓扑信息
+    state = SkeletonState(len(joints))
+    for index, joint in enumerate(joints.values()):
+        joint.bind_state(state, index)
+    state.set_topology(joints.values())
+    
+    # 数值块交给 NumPy 的 C 解析器一次读完，得到连续的 (帧数, 通道数) 数组
+    if not motion_lines:
+        return root_joint, joints, np.empty((0, channel_count), dtype=np.float64), frames, frame_time
+    try:
+        # 动捕精度远低于 float32 的分辨率，单精度让整段运动学的内存带宽减半
+        motion_data = np.loadtxt(motion_lines, dtype=np.float32, ndmin=2)
+    except ValueError as e:
+        print(f"Error parsing motion data: {e}")
+        return None, {}, [], 0, 0
+    
+    # 活动范围一次性按列计算，不进入逐帧更新路径
+    for joint in joints.values():
+        joint.update_rom(motion_data)
+    # 加载时先算一帧，JIT 内核的编译开销不落在播放的第一帧上
+    if NUMBA_AVAILABLE and len(motion_data):
+        state.update_matrices(motion_data[0])
     return root_joint, joints, motion_data, frames, frame_time
 
 # Get joint world coordinates
@@ -1015,198 +2008,379 @@ def get_world_position(joint):
 
 # Update joint matrices
 def update_joint_matrices(joint, frame_data, all_joints):
-    if joint.parent is None:
-        pos_x = frame_data[joint.channel_indices.get('Xposition', -1)] if 'Xposition' in joint.channels else 0
-        pos_y = frame_data[joint.channel_indices.get('Yposition', -1)] if 'Yposition' in joint.channels else 0
-        pos_z = frame_data[joint.channel_indices.get('Zposition', -1)] if 'Zposition' in joint.channels else 0
-        
-        T = np.identity(4)
-        T[0, 3] = pos_x
-        T[1, 3] = pos_y
-        T[2, 3] = pos_z
-        joint.matrix = T
-    else:
-        joint.matrix = all_joints[joint.parent.name].matrix @ np.array([
-            [1, 0, 0, joint.offset[0]],
-            [0, 1, 0, joint.offset[1]],
-            [0, 0, 1, joint.offset[2]],
-            [0, 0, 0, 1]
-        ])
-    for channel in joint.channels:
-        if 'rotation' in channel:
-            axis = channel[0]
-            angle = frame_data[joint.channel_indices[channel]]
-            
-            R = np.identity(4)
-            angle_rad = np.radians(angle)
-            c = np.cos(angle_rad)
-            s = np.sin(angle_rad)
-            
-            if axis == 'X':
-                R = np.array([
-                    [1, 0, 0, 0],
-                    [0, c, -s, 0],
-                    [0, s, c, 0],
-                    [0, 0, 0, 1]
-                ])
-            elif axis == 'Y':
-                R = np.array([
-                    [c, 0, s, 0],
-                    [0, 1, 0, 0],
-                    [-s, 0, c, 0],
-                    [0, 0, 0, 1]
-                ])
-            elif axis == 'Z':
-                R = np.array([
-                    [c, -s, 0, 0],
-                    [s, c, 0, 0],
-                    [0, 0, 1, 0],
-                    [0, 0, 0, 1]
-                ])
-            
+    # 解析得到的骨骼走扁平化的批量路径，一次算出所有关节
+    if joint.parent is None and joint.state is not None and len(joint.state.levels):
+        joint.state.update_matrices(frame_data)
+        return
+    # 显式栈按先序遍历，避免逐关节递归调用
+    stack = [joint]
+    while stack:
+        joint = stack.pop()
+        if joint.parent is None:
+            pos_x = frame_data[joint.channel_indices.get('Xposition', -1)] if 'Xposition' in joint.channels else 0
+            pos_y = frame_data[joint.channel_indices.get('Yposition', -1)] if 'Yposition' in joint.channels else 0
+            pos_z = frame_data[joint.channel_indices.get('Zposition', -1)] if 'Zposition' in joint.channels else 0
+        
+            T = np.identity(4)
+            T[0, 3] = pos_x
+            T[1, 3] = pos_y
+            T[2, 3] = pos_z
+            joint.matrix = T
+        else:
+            joint.matrix = joint.parent.matrix @ np.array([
+                [1, 0, 0, joint.offset[0]],
+                [0, 1, 0, joint.offset[1]],
+                [0, 0, 1, joint.offset[2]],
+                [0, 0, 0, 1]
+            ])
+        # 按 set_channels 预先解析的轴编号查表写入 c/s，无需逐轴分支
+        for axis, index in zip(joint.rot_axes.tolist(), joint.rot_indices.tolist()):
+            angle_rad = math.radians(frame_data[index])
+            c = math.cos(angle_rad)
+            s = math.sin(angle_rad)
+            R = IDENTITY_4X4.copy()
+            R[ROTATION_PLANE_INDEX[axis]] = (c, -s, s, c)
             joint.matrix = joint.matrix @ R
-    for child in joint.children:
-        update_joint_matrices(child, frame_data, all_joints)
+        stack.extend(reversed(joint.children))
 
 # Calculate anatomical angles (full-body adjacent joint vector angles, including fingers)
-def calculate_anatomical_angles(joints):
-    angles = {}
-    # Universal vector angle calculation function (core: parent->current->child joint vector angle)
-    def get_vector_angle(parent_joint_name, current_joint_name, child_joint_name):
-        """
-        parent_joint_name: Parent joint (vector 1 start point)
-        current_joint_name: Current joint (angle vertex, child node of adjacent joint pair)
-        child_joint_name: Child joint (vector 2 end point)
-        Returns: Vector angle formed by three joints (degrees, rounded to 2 decimal places)
-        """
-        # Check if all three joints exist in BVH data
-        if (parent_joint_name in joints and 
-            current_joint_name in joints and 
-            child_joint_name in joints):
-            # Get world coordinates of three joints
-            p_parent = get_world_position(joints[parent_joint_name])  # Parent joint (vector 1 start)
-            p_current = get_world_position(joints[current_joint_name])  # Current joint (angle vertex)
-            p_child = get_world_position(joints[child_joint_name])  # Child joint (vector 2 end)
-            
-            # Calculate two vectors: vertex->parent, vertex->child
-            vec_parent = p_parent - p_current
-            vec_child = p_child - p_current
-            
-            # Avoid calculation errors from zero-length vectors
-            if np.linalg.norm(vec_parent) > 1e-6 and np.linalg.norm(vec_child) > 1e-6:
-                cos_theta = np.dot(vec_parent, vec_child) / (np.linalg.norm(vec_parent) * np.linalg.norm(vec_child))
-                cos_theta = np.clip(cos_theta, -1.0, 1.0)  # Clamp cos value range to avoid calculation errors
-                angle = np.degrees(np.arccos(cos_theta))
-                return round(angle, 2)  # Round to 2 decimal places for cleaner data
-        # Return None when joint doesn't exist/vector is invalid (filtered later)
-        return None
+# Non-adjacent key angles evaluated after the adjacent joint pairs; they overwrite
+# (or drop, when invalid) an adjacent angle of the same name
+# Back Bend Angle (Hips→Spine→Spine2), Head Down Angle (Spine2→Neck→Head)
+SUPPLEMENTAL_ANGLE_TRIPLETS = (
+    ('Hips', 'Spine', 'Spine2'),
+    ('Spine2', 'Neck', 'Head'),
+)
+
+def anatomical_angle_layout(joints):
+    """
+    Angles evaluated by calculate_anatomical_angles, in evaluation order.
+    
+    Joints are referred to by their position in ``joints`` (the column of an
+    (F, N, 3) position tensor in joints order, and the SkeletonState row).
+    The topology never changes between frames, so the layout is built once
+    per skeleton and cached, keyed on the Joint objects themselves (the
+    joints dict is cleared and refilled in place when the real-time
+    skeleton is rebuilt).
     
+    Returns:
+        dict: 'names' (E angle names), 'replace' (E flags), 'valid' (entries whose
+            joints all exist, also as the int32 array 'columns') and 'triplets'
+            ((T, 3) int32 (parent, vertex, child) columns of those entries)
+    """
+    key = tuple(joints.values())
+    cache = anatomical_angle_layout._cache
+    if cache is not None and cache[0] == key:
+        return cache[1]
+    column = {name: i for i, name in enumerate(joints)}
+    entries = []
     # -------------------------- Key: Iterate through all adjacent joint pairs (including fingers) --------------------------
     # Based on CUSTOM_JOINT_ORDER, ensure iteration order matches the bone structure
-    for joint_name in CUSTOM_JOINT_ORDER:
-        # Skip non-existent joints (to avoid KeyError)
-        if joint_name not in joints:
-            continue
+    # Angle name: ParentJointName_CurrentJointName (e.g. RightArm → RightForeArm → RightHand = RightArm_RightForeArm)
+    for joint_name in ordered_joint_names(joints):
         current_joint = joints[joint_name]
-        
-        # 1. Skip the root joint with no parent (e.g., Hips, no "adjacent parent joint")
+        # Skip the root joint with no parent
         if current_joint.parent is None:
             continue
-        parent_joint_name = current_joint.parent.name  # Adjacent parent joint name
-        
-        # 2. Iterate through all children of the current joint (each child corresponds to an "adjacent child joint")
+        parent_joint_name = current_joint.parent.name
+        if parent_joint_name not in joints:
+            continue
         for child_joint in current_joint.children:
-            child_joint_name = child_joint.name
-            # Skip if child joint doesn't exist (theoretically won't happen, but for safety)
-            if child_joint_name not in joints:
+            if child_joint.name in joints:
+                triplet = (column[parent_joint_name], column[joint_name], column[child_joint.name])
+                entries.append((f"{parent_joint_name}_{joint_name}", triplet, False))
+    
+    for triplet in SUPPLEMENTAL_ANGLE_TRIPLETS:
+        present = all(name in joints for name in triplet)
+        entries.append((f"{triplet[0]}_{triplet[1]}", tuple(column[name] for name in triplet) if present else None, True))
+    
+    valid = [i for i, (_, triplet, _) in enumerate(entries) if triplet is not None]
+    layout = {
+        'names': [entry[0] for entry in entries],
+        'replace': [entry[2] for entry in entries],
+        'valid': valid,
+        'columns': np.array(valid, dtype=np.int32),
+        'triplets': np.array([entries[i][1] for i in valid], dtype=np.int32).reshape(-1, 3),
+    }
+    anatomical_angle_layout._cache = (key, layout)
+    return layout
+anatomical_angle_layout._cache = None
+
+def _vector_angles_kernel(positions, triplets, columns, out):
+    """
+    Scalar form of ``vector_angles``, frames in parallel: triplet t is written to
+    ``out[:, columns[t]]`` so results land directly in a wider angle table.
+    Only compiled when Numba is available.
+    """
+    to_degrees = 180.0 / np.pi
+    for f in prange(positions.shape[0]):
+        for t in range(triplets.shape[0]):
+            parent = triplets[t, 0]
+            vertex = triplets[t, 1]
+            child = triplets[t, 2]
+            dot = 0.0
+            norm_parent = 0.0
+            norm_child = 0.0
+            for axis in range(3):
+                origin = np.float64(positions[f, vertex, axis])
+                a = positions[f, parent, axis] - origin
+                b = positions[f, child, axis] - origin
+                dot += a * b
+                norm_parent += a * a
+                norm_child += b * b
+            norm_parent = np.sqrt(norm_parent)
+            norm_child = np.sqrt(norm_child)
+            if norm_parent <= 1e-6 or norm_child <= 1e-6:
+                out[f, columns[t]] = np.nan
                 continue
-            
-            # 3. Generate angle name: ParentJointName_CurrentJointName (consistent with RightUpArm_RightForeArm style)
-            # Example: RightArm (Parent) → RightForeArm (Current) → RightHand (Child) → Angle Name = RightArm_RightForeArm
-            angle_name = f"{parent_joint_name}_{joint_name}"
-            
-            # 4. Calculate the vector angle for this adjacent joint pair
-            angle_value = get_vector_angle(
-                parent_joint_name=parent_joint_name,
-                current_joint_name=joint_name,
-                child_joint_name=child_joint_name
-            )
-            
-            # 5. Keep only valid angles (filter out None values)
-            if angle_value is not None:
-                angles[angle_name] = angle_value
-    
-    # -------------------------- Retain original back bend and head down angles (supplement non-adjacent key angles) --------------------------
-    # Back Bend Angle (Hips→Spine→Spine2): Non-adjacent but important, calculated separately
-    angles['Hips_Spine'] = get_vector_angle(
-        parent_joint_name='Hips',
-        current_joint_name='Spine',
-        child_joint_name='Spine2'
-    )
-    # Head Down Angle (Spine2→Neck→Head): Non-adjacent but important, calculated separately
-    angles['Spine2_Neck'] = get_vector_angle(
-        parent_joint_name='Spine2',
-        current_joint_name='Neck',
-        child_joint_name='Head'
-    )
+            cos_theta = min(1.0, max(-1.0, dot / (norm_parent * norm_child)))
+            out[f, columns[t]] = np.rint(np.arccos(cos_theta) * to_degrees * 100.0) / 100.0
+
+
+if NUMBA_AVAILABLE:
+    _vector_angles_kernel = njit(cache=True, parallel=True)(_vector_angles_kernel)
+
+
+def vector_angles(positions, triplets):
+    """
+    Angles at the vertex of many joint triplets across many frames.
+    
+    Args:
+        positions (np.ndarray): (F, N, 3) world positions
+        triplets (np.ndarray): (T, 3) column indices of (parent, vertex, child)
+    
+    Returns:
+        np.ndarray: (F, T) angles in degrees rounded to 2 decimals, NaN where a vector has zero length
+    """
+    if NUMBA_AVAILABLE:
+        angles = np.empty((len(positions), len(triplets)))
+        _vector_angles_kernel(np.ascontiguousarray(positions), np.ascontiguousarray(triplets),
+                              np.arange(len(triplets), dtype=np.int32), angles)
+        return angles
+    # arccos 在 ±1 附近病态，夹角在双精度下计算（(F, T, 3) 远小于矩阵张量）
+    vertex = positions[:, triplets[:, 1]].astype(np.float64)
+    vec_parent = positions[:, triplets[:, 0]] - vertex
+    vec_child = positions[:, triplets[:, 2]] - vertex
+    norm_parent = np.linalg.norm(vec_parent, axis=-1)
+    norm_child = np.linalg.norm(vec_child, axis=-1)
+    dot = np.einsum('fti,fti->ft', vec_parent, vec_child)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cos_theta = np.clip(dot / (norm_parent * norm_child), -1.0, 1.0)
+    angles = np.round(np.degrees(np.arccos(cos_theta)), 2)
+    # Avoid calculation errors from zero-length vectors
+    angles[(norm_parent <= 1e-6) | (norm_child <= 1e-6)] = np.nan
+    return angles
+
+class AngleFrameSeries(Sequence):
+    """
+    Per-frame anatomical angles backed by one (F, E) array.
+    
+    ``series[frame]`` builds the ``{angle_name: degrees}`` dict on demand, dropping invalid
+    (NaN) angles; entries flagged ``replace`` overwrite or remove an earlier angle of the same name.
+    """
+    def __init__(self, values, names, replace):
+        self.values = values
+        self.names = names
+        self.replace = replace
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, frame):
+        if isinstance(frame, slice):
+            return [self[i] for i in range(*frame.indices(len(self)))]
+        angles = {}
+        for name, value, replace in zip(self.names, self.values[frame], self.replace):
+            if value == value:
+                angles[name] = value
+            elif replace:
+                angles.pop(name, None)
+        return angles
+
+    def columns(self):
+        """
+        ``{angle_name: (F,) degrees}`` with the per-frame override/drop rules applied
+        to whole columns (NaN where a frame has no value for that name).
+        """
+        columns = {}
+        for index, (name, replace) in enumerate(zip(self.names, self.replace)):
+            column = self.values[:, index]
+            previous = columns.get(name)
+            if previous is not None and not replace:
+                column = np.where(np.isnan(column), previous, column)
+            columns[name] = column
+        return columns
+
+def calculate_anatomical_angle_series(joints, positions):
+    """
+    Anatomical angles for every frame with one batched evaluation over all joint triplets.
+    
+    Args:
+        joints (dict): Parsed joints
+        positions (np.ndarray): (F, N, 3) world positions, N in ``joints`` order
     
-    # Filter out all invalid angles (remove entries with value None)
-    return {key: val for key, val in angles.items() if val is not None}
+    Returns:
+        AngleFrameSeries: Lazy per-frame angle dicts
+    """
+    layout = anatomical_angle_layout(joints)
+    values = np.full((len(positions), len(layout['names'])), np.nan)
+    if NUMBA_AVAILABLE and layout['valid']:
+        # JIT 内核直接写入 (F, E) 表的有效列，省去 (F, T) 中间数组和散列赋值
+        _vector_angles_kernel(np.ascontiguousarray(positions), layout['triplets'], layout['columns'], values)
+    elif layout['valid']:
+        values[:, layout['valid']] = vector_angles(positions, layout['triplets'])
+    return AngleFrameSeries(values, layout['names'], layout['replace'])
+
+def calculate_anatomical_angles(joints, positions=None):
+    """
+    Joint angles for one frame.
+    
+    ``positions`` optionally maps joint names to world positions; when omitted
+    they are read straight from the world matrices of the bound SkeletonState.
+    """
+    state = next(iter(joints.values())).state if joints else None
+    if positions is not None:
+        frame_positions = np.array([positions[name] for name in joints], dtype=np.float64)
+    elif state is not None and len(state.parents) == len(joints):
+        # 解析/实时骨骼按 joints 顺序绑定：SkeletonState 的行号即列号
+        frame_positions = state.matrices[:, :3, 3]
+    else:
+        frame_positions = np.array([get_world_position(joint) for joint in joints.values()], dtype=np.float64)
+    return calculate_anatomical_angle_series(joints, frame_positions.reshape(1, -1, 3))[0]
 
 # Calculate Kinematics Data
+# Frames per batched forward-kinematics pass (bounds the (F, J, 4, 4) temporaries)
+KINEMATICS_CHUNK_FRAMES = 2048
+# Positions/velocities/accelerations precision (sub-millimetre is plenty for mocap)
+KINEMATICS_DTYPE = np.float32
+
+def _finite_differences(positions, dt, out_vel, out_acc):
+    """
+    Backward-difference velocity and acceleration in one pass over (F, N) positions.
+    
+    vel[f] = (p[f] - p[f-1]) / dt and acc[f] = (vel[f] - vel[f-1]) / dt, both zero at
+    frame 0; each frame recomputes vel[f-1] from positions so frames run in parallel.
+    Only compiled when Numba is available.
+    """
+    frames, width = positions.shape
+    for i in range(width):
+        out_vel[0, i] = 0.0
+        out_acc[0, i] = 0.0
+        if frames > 1:
+            out_vel[1, i] = (positions[1, i] - positions[0, i]) / dt
+            out_acc[1, i] = out_vel[1, i] / dt
+    for f in prange(2, frames):
+        for i in range(width):
+            vel = (positions[f, i] - positions[f - 1, i]) / dt
+            prev = (positions[f - 1, i] - positions[f - 2, i]) / dt
+            out_vel[f, i] = vel
+            out_acc[f, i] = (vel - prev) / dt
+
+
+if NUMBA_AVAILABLE:
+    _finite_differences = njit(cache=True, parallel=True)(_finite_differences)
+
+
+class JointFrameSeries(Sequence):
+    """
+    Per-frame joint vectors backed by one contiguous (F, J, 3) array.
+    
+    ``series[frame]`` builds the ``{joint_name: vec}`` dict for that frame on demand,
+    so the UI panels keep their dict access without storing F dicts; bulk consumers
+    (CSV export, trajectories) read ``columns``/``column`` straight from the array.
+    
+    Attributes:
+        array (np.ndarray): (F, J, 3) values
+        names (list): Joint names matching the J axis
+    """
+    def __init__(self, array, names):
+        self.array = array
+        self.names = list(names)
+        self._columns = {name: i for i, name in enumerate(self.names)}
+
+    def __len__(self):
+        return len(self.array)
+
+    def __getitem__(self, frame):
+        if isinstance(frame, slice):
+            return [self[i] for i in range(*frame.indices(len(self)))]
+        return dict(zip(self.names, self.array[frame]))
+
+    def column(self, name):
+        """(F, 3) values of one joint across all frames (zeros if the joint is unknown)."""
+        index = self._columns.get(name)
+        if index is None:
+            return np.zeros((len(self.array), 3), dtype=self.array.dtype)
+        return self.array[:, index]
+
+    def columns(self, names, frames=slice(None)):
+        """(F, len(names), 3) values of several joints in the given order (zeros for unknown joints), optionally for a frame slice."""
+        window = self.array[frames]
+        out = np.zeros((len(window), len(names), 3), dtype=self.array.dtype)
+        for j, name in enumerate(names):
+            index = self._columns.get(name)
+            if index is not None:
+                out[:, j] = window[:, index]
+        return out
+
 def calculate_kinematics(joints, all_frames_data, frame_time):
     num_frames = len(all_frames_data)
+    names = list(joints)
+    if not names:
+        empty = np.zeros((num_frames, 0, 3), dtype=KINEMATICS_DTYPE)
+        return (JointFrameSeries(empty, []), JointFrameSeries(empty, []), JointFrameSeries(empty, []),
+                AngleFrameSeries(np.zeros((num_frames, 0)), [], []))
+    
+    # Forward kinematics for all frames at once through the parsed skeleton's SkeletonState
+    state = joints[names[0]].state
+    rows = [joints[name].index for name in names]
+    positions = np.empty((num_frames, len(names), 3), dtype=KINEMATICS_DTYPE)
+    for start in range(0, num_frames, KINEMATICS_CHUNK_FRAMES):
+        stop = start + KINEMATICS_CHUNK_FRAMES
+        positions[start:stop] = state.world_matrices(all_frames_data[start:stop])[..., :3, 3][:, rows]
+    
+    positions_per_frame = JointFrameSeries(positions, names)
+    anatomical_angles_per_frame = calculate_anatomical_angle_series(joints, positions)
+
+    # Velocity/acceleration for all joints and frames at once (frame 0 starts at zero)
+    velocities = np.empty_like(positions)
+    accelerations = np.empty_like(positions)
+    if NUMBA_AVAILABLE:
+        # (F, J*3) 视图：每帧一段连续内存，内层循环可向量化
+        _finite_differences(positions.reshape(num_frames, -1), positions.dtype.type(frame_time),
+                            velocities.reshape(num_frames, -1), accelerations.reshape(num_frames, -1))
+    else:
+        velocities[:1] = 0.0
+        accelerations[:1] = 0.0
+        np.subtract(positions[1:], positions[:-1], out=velocities[1:])
+        velocities[1:] /= frame_time
+        np.subtract(velocities[1:], velocities[:-1], out=accelerations[1:])
+        accelerations[1:] /= frame_time
     
-    positions_per_frame = []
-    anatomical_angles_per_frame = []
-    
-    for frame_data in all_frames_data:
-        temp_joints = {}
-        for name, joint in joints.items():
-            temp_joints[name] = Joint(joint.name, parent=joint.parent)
-            temp_joints[name].set_offset(joint.offset)
-            temp_joints[name].set_channels(joint.channels, joint.channel_start_index)
-            if joint.end_site is not None:
-                temp_joints[name].set_end_site(joint.end_site)
-        for name, joint in joints.items():
-            for child in joint.children:
-                if child.name in temp_joints:
-                    temp_joints[name].add_child(temp_joints[child.name])
-        temp_root = temp_joints[list(joints.keys())[0]]
-        
-        update_joint_matrices(temp_root, frame_data, temp_joints)
-        
-        frame_positions = {name: get_world_position(joint) for name, joint in temp_joints.items()}
-        positions_per_frame.append(frame_positions)
-        
-        frame_anatomical_angles = calculate_anatomical_angles(temp_joints)
-        anatomical_angles_per_frame.append(frame_anatomical_angles)
-
-    # Initialize with zeros for the first frame's velocity and acceleration
-    velocities_per_frame = [{name: np.zeros(3) for name in joints}] 
-    accelerations_per_frame = [{name: np.zeros(3) for name in joints}] 
-
-    # Calculate velocity for frame 1 onwards (assuming initial velocity/acceleration are zero)
-    for i in range(1, num_frames):
-        current_velocities = {}
-        current_accelerations = {}
-        
-        # Calculate velocity for current frame i
-        for name in joints:
-            pos_diff = positions_per_frame[i][name] - positions_per_frame[i-1][name]
-            velocity = pos_diff / frame_time
-            current_velocities[name] = velocity
-            
-            # Calculate acceleration for current frame i
-            vel_diff = current_velocities[name] - velocities_per_frame[i-1][name]
-            acceleration = vel_diff / frame_time
-            current_accelerations[name] = acceleration
-            
-        velocities_per_frame.append(current_velocities)
-        accelerations_per_frame.append(current_accelerations)
+    velocities_per_frame = JointFrameSeries(velocities, names)
+    accelerations_per_frame = JointFrameSeries(accelerations, names)
 
     return positions_per_frame, velocities_per_frame, accelerations_per_frame, anatomical_angles_per_frame
 
+def _warm_kinematics_kernels():
+    """Compile the calculate_kinematics JIT kernels on 1-frame dummies with the load-time dtypes"""
+    warm_state = SkeletonState(1)
+    warm_state.topological = True
+    warm_state.world_matrices(np.zeros((1, 1), dtype=np.float32))
+    realtime_state = SkeletonState(1, dtype=np.float32)
+    realtime_state.topological = True
+    _quats_to_rotations(realtime_state._quats, realtime_state._local_rotations)
+    realtime_state.update_from_rotations(None, (0.0, 0.0, 0.0))
+    positions = np.zeros((1, 3, 3), dtype=KINEMATICS_DTYPE)
+    flat = positions.reshape(1, -1)
+    _finite_differences(flat, KINEMATICS_DTYPE(1.0), np.empty_like(flat), np.empty_like(flat))
+    vector_angles(positions, np.array([[0, 1, 2]], dtype=np.int32))
+    _vector_angles_kernel(positions, np.array([[0, 1, 2]], dtype=np.int32), np.zeros(1, dtype=np.int32), np.empty((1, 2)))
+
+if NUMBA_AVAILABLE:
+    # 导入时预编译（cache=True 时直接读磁盘缓存），首次加载 BVH 不再等待编译
+    _warm_kinematics_kernels()
+
 # Custom Skeleton Drawing Order
 CUSTOM_JOINT_ORDER = [
     'Hips',
@@ -1231,63 +2405,251 @@ CUSTOM_JOINT_ORDER = [
     'Spine3'
 ]
 
-# Redefined Skeleton Drawing Function
-def draw_custom_skeleton(joints):
-    for joint_name in CUSTOM_JOINT_ORDER:
-        if joint_name not in joints:
-            continue
-        joint = joints[joint_name]
+def ordered_joint_names(joints):
+    """
+    CUSTOM_JOINT_ORDER filtered to the joints present (duplicates removed, order kept).
+    
+    Cached per set of joint names (not per dict: the same dict is refilled
+    when the real-time skeleton is rebuilt) so the per-frame draw paths skip
+    the membership tests.
+    """
+    key = tuple(joints)
+    cache = ordered_joint_names._cache
+    if cache is None or cache[0] != key:
+        names = tuple(dict.fromkeys(name for name in CUSTOM_JOINT_ORDER if name in joints))
+        cache = ordered_joint_names._cache = (key, names)
+    return cache[1]
+ordered_joint_names._cache = None
+
+class SkeletonRenderer:
+    """
+    骨骼绘制
+    
+    骨段与末端（End Site）线段合并成一个顶点数组，每帧一次 glBufferSubData 上传、
+    一次 glDrawArrays(GL_LINES) 绘制；关节球体预先编译进显示列表，
+    每个关节只需平移后 glCallList，不再逐帧创建/销毁二次曲面。
+    """
+    JOINT_RADIUS = 2.5 * 0.4
+    END_SITE_RADIUS = 2.5 * 0.3
+    SPHERE_SLICES = 16
+    LINE_WIDTH = 2.0
+
+    def __init__(self):
+        self._layout = None  # (Joint 对象元组, layout dict)
+        self._sphere_lists = None  # 显示列表基址：+0 关节球，+1 末端球
+        self._line_vbo = None
+        self._line_vbo_bytes = 0
+
+    def _build_layout(self, joints):
+        """按绘制顺序整理关节行、骨段端点对和末端偏移（每套骨骼只做一次）"""
+        names = list(ordered_joint_names(joints))
+        sphere_count = len(names)
+        # 父关节不在绘制顺序中时也要取其位置作为骨段起点
+        for name in names[:sphere_count]:
+            parent = joints[name].parent
+            if parent is not None and parent.name in joints and parent.name not in names:
+                names.append(parent.name)
+        index = {name: i for i, name in enumerate(names)}
+        
+        bones = [(index[joints[name].parent.name], index[name]) for name in names[:sphere_count]
+                 if joints[name].parent is not None and joints[name].parent.name in joints]
+        end_rows = [i for i, name in enumerate(names[:sphere_count]) if joints[name].end_site is not None]
+        
+        state = joints[names[0]].state if names else None
+        if state is not None and all(joints[name].state is state for name in names):
+            state_rows = np.array([joints[name].index for name in names], dtype=np.intp)
+        else:
+            state, state_rows = None, None
+        return {
+            'names': names,
+            'sphere_count': sphere_count,
+            'state': state,
+            'state_rows': state_rows,
+            'bones': np.array(bones, dtype=np.intp).reshape(-1, 2),
+            'end_rows': np.array(end_rows, dtype=np.intp),
+            'end_offsets': np.array([joints[names[i]].end_site for i in end_rows], dtype=np.float64).reshape(-1, 3),
+            'lines': np.zeros((2 * (len(bones) + len(end_rows)), 3), dtype=np.float32),
+        }
+
+    def _get_layout(self, joints):
+        # 以 Joint 对象为键：实时骨骼重建时同一个 dict 被清空后重新填充，行号和 SkeletonState 都会变
+        key = tuple(joints.values())
+        if self._layout is None or self._layout[0] != key:
+            self._layout = (key, self._build_layout(joints))
+        return self._layout[1]
+
+    def _create_resources(self):
+        base = glGenLists(2)
+        quad = gluNewQuadric()
+        glNewList(base, GL_COMPILE)
+        gluSphere(quad, self.JOINT_RADIUS, self.SPHERE_SLICES, self.SPHERE_SLICES)
+        glEndList()
+        glNewList(base + 1, GL_COMPILE)
+        gluSphere(quad, self.END_SITE_RADIUS, self.SPHERE_SLICES, self.SPHERE_SLICES)
+        glEndList()
+        gluDeleteQuadric(quad)
+        self._sphere_lists = base
+        try:
+            self._line_vbo = glGenBuffers(1)
+        except Exception as e:
+            print(f"Warning: skeleton VBO unavailable: {e}")
+            self._line_vbo = None
+        self._line_vbo_bytes = 0
+
+    def release(self):
+        """释放 GL 资源（窗口重建后旧上下文的对象可能已失效，下次绘制时重新生成）"""
+        try:
+            if self._sphere_lists is not None:
+                glDeleteLists(self._sphere_lists, 2)
+            if self._line_vbo is not None:
+                glDeleteBuffers(1, [self._line_vbo])
+        except Exception:
+            pass  # 上下文已销毁时资源随之释放
+        self._sphere_lists = None
+        self._line_vbo = None
+        self._line_vbo_bytes = 0
+
+    def draw(self, joints):
+        layout = self._get_layout(joints)
+        if not layout['names']:
+            return
+        if self._sphere_lists is None:
+            self._create_resources()
+        
+        if layout['state'] is not None:
+            matrices = layout['state'].matrices[layout['state_rows']]
+        else:
+            matrices = np.array([joints[name].matrix for name in layout['names']], dtype=np.float64)
+        positions = matrices[:, :3, 3]
+        
+        # 线段端点：骨段 (父, 子) 之后接末端 (关节, End Site)
+        lines = layout['lines']
+        bones, end_rows = layout['bones'], layout['end_rows']
+        bone_vertices = 2 * len(bones)
+        lines[0:bone_vertices:2] = positions[bones[:, 0]]
+        lines[1:bone_vertices:2] = positions[bones[:, 1]]
+        end_positions = np.einsum('eij,ej->ei', matrices[end_rows, :3, :3], layout['end_offsets']) + positions[end_rows]
+        lines[bone_vertices::2] = positions[end_rows]
+        lines[bone_vertices + 1::2] = end_positions
         
-        # Render current joint (Sphere)
         glColor3f(0.0, 0.0, 0.0)
+        # 球心之间按相对位移平移，整组只需一次 push/pop：每个球 2 个 GL 调用
         glPushMatrix()
-        joint_pos = joint.matrix[:3, 3]
-        glTranslatef(joint_pos[0], joint_pos[1], joint_pos[2])
-        quad = gluNewQuadric()
-        gluSphere(quad, 2.5 * 0.4, 16, 16)
-        gluDeleteQuadric(quad)
+        previous = (0.0, 0.0, 0.0)
+        for sphere_list, centers in ((self._sphere_lists, positions[:layout['sphere_count']]),
+                                     (self._sphere_lists + 1, end_positions)):
+            for center in centers.tolist():
+                glTranslatef(center[0] - previous[0], center[1] - previous[1], center[2] - previous[2])
+                glCallList(sphere_list)
+                previous = center
         glPopMatrix()
         
-        # Draw connection line between current joint and parent joint
-        if joint.parent is not None and joint.parent.name in joints:
-            parent_joint = joints[joint.parent.name]
-            parent_pos = parent_joint.matrix[:3, 3]
-            
-            glLineWidth(2.0)
-            glColor3f(0.0, 0.0, 0.0)
-            glBegin(GL_LINES)
-            glVertex3f(*parent_pos)
-            glVertex3f(*joint_pos)
-            glEnd()
-        
-        # Draw End Site (e.g., finger tips)
-        if joint.end_site is not None:
-            end_site_pos = joint.matrix @ np.append(joint.end_site, 1.0)
-            end_site_pos = end_site_pos[:3]
-            
-            glLineWidth(2.0)
-            glColor3f(0.0, 0.0, 0.0)
-            glBegin(GL_LINES)
-            glVertex3f(*joint_pos)
-            glVertex3f(*end_site_pos)
-            glEnd()
-            
-            glPushMatrix()
-            glTranslatef(end_site_pos[0], end_site_pos[1], end_site_pos[2])
-            quad = gluNewQuadric()
-            gluSphere(quad, 2.5 * 0.3, 16, 16)
-            gluDeleteQuadric(quad)
-            glPopMatrix()
-
-# Draw right-angle rectangle
-def draw_rectangle(x, y, width, height, color):
-    glColor3f(*color)
-    glBegin(GL_QUADS)
-    glVertex2f(x, y)
-    glVertex2f(x + width, y)
-    glVertex2f(x + width, y + height)
-    glVertex2f(x, y + height)
-    glEnd()
+        if not len(lines):
+            return
+        glLineWidth(self.LINE_WIDTH)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        if self._line_vbo is not None:
+            glBindBuffer(GL_ARRAY_BUFFER, self._line_vbo)
+            if self._line_vbo_bytes != lines.nbytes:
+                glBufferData(GL_ARRAY_BUFFER, lines.nbytes, lines, GL_DYNAMIC_DRAW)
+                self._line_vbo_bytes = lines.nbytes
+            else:
+                glBufferSubData(GL_ARRAY_BUFFER, 0, lines.nbytes, lines)
+            glVertexPointer(3, GL_FLOAT, 0, ctypes.c_void_p(0))
+        else:
+            glVertexPointer(3, GL_FLOAT, 0, lines)
+        glDrawArrays(GL_LINES, 0, len(lines))
+        if self._line_vbo is not None:
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+skeleton_renderer = SkeletonRenderer()
+
+# Redefined Skeleton Drawing Function
+def draw_custom_skeleton(joints):
+    skeleton_renderer.draw(joints)
+
+# Unit-square corners: two triangles for a fill, four segments for a border
+RECT_FILL_CORNERS = np.array([[0, 0], [1, 0], [1, 1], [0, 0], [1, 1], [0, 1]], dtype=np.float32)
+RECT_BORDER_CORNERS = np.array([[0, 0], [1, 0], [1, 0], [1, 1], [1, 1], [0, 1], [0, 1], [0, 0]], dtype=np.float32)
+RECT_VERTEX_STRIDE = 5 * 4  # 每个顶点 (x, y, r, g, b) 5 个 float32
+
+def _rect_vertices(rects):
+    """
+    Interleaved (x, y, r, g, b) vertices of ``draw_rects`` tuples:
+    all fills (GL_TRIANGLES) first, then the borders (GL_LINES); returns (vertices, fill_count)
+    """
+    boxes = np.array([rect[:4] for rect in rects], dtype=np.float32)
+    fills = np.array([rect[4] for rect in rects], dtype=np.float32)
+    bordered = [i for i, rect in enumerate(rects) if rect[5] is not None]
+    borders = np.array([rects[i][5] for i in bordered], dtype=np.float32).reshape(-1, 3)
+    vertices = np.empty((len(rects) * len(RECT_FILL_CORNERS) + len(bordered) * len(RECT_BORDER_CORNERS), 5), dtype=np.float32)
+    fill_count = len(rects) * len(RECT_FILL_CORNERS)
+    fill_part = vertices[:fill_count].reshape(len(rects), len(RECT_FILL_CORNERS), 5)
+    fill_part[..., :2] = boxes[:, None, :2] + RECT_FILL_CORNERS * boxes[:, None, 2:]
+    fill_part[..., 2:] = fills[:, None]
+    border_part = vertices[fill_count:].reshape(len(bordered), len(RECT_BORDER_CORNERS), 5)
+    border_part[..., :2] = boxes[bordered, None, :2] + RECT_BORDER_CORNERS * boxes[bordered, None, 2:]
+    border_part[..., 2:] = borders[:, None]
+    return vertices, fill_count
+
+def release_rect_buffer():
+    """释放矩形顶点 VBO（窗口重建后旧上下文的缓冲区可能已失效，下次绘制时重新创建）"""
+    if draw_rects._vbo is not None:
+        try:
+            glDeleteBuffers(1, [draw_rects._vbo])
+        except Exception:
+            pass  # 上下文已销毁时缓冲区随之释放
+        draw_rects._vbo = None
+
+def draw_rects(rects):
+    """
+    Filled rectangles with optional 1px borders in two draw calls.
+    
+    ``rects`` holds (x, y, width, height, fill_color, line_color) tuples; their colored
+    vertices are uploaded together, then one GL_TRIANGLES draw covers every fill and
+    one GL_LINES draw every border.
+    """
+    if not rects:
+        return
+    vertices, fill_count = _rect_vertices(rects)
+    if draw_rects._vbo is None:
+        draw_rects._vbo = glGenBuffers(1)
+    glBindBuffer(GL_ARRAY_BUFFER, draw_rects._vbo)
+    glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STREAM_DRAW)
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glEnableClientState(GL_COLOR_ARRAY)
+    glVertexPointer(2, GL_FLOAT, RECT_VERTEX_STRIDE, ctypes.c_void_p(0))
+    glColorPointer(3, GL_FLOAT, RECT_VERTEX_STRIDE, ctypes.c_void_p(2 * 4))
+    glDrawArrays(GL_TRIANGLES, 0, fill_count)
+    if len(vertices) > fill_count:
+        glLineWidth(1.0)
+        glDrawArrays(GL_LINES, fill_count, len(vertices) - fill_count)
+    glDisableClientState(GL_COLOR_ARRAY)
+    glDisableClientState(GL_VERTEX_ARRAY)
+    glBindBuffer(GL_ARRAY_BUFFER, 0)
+draw_rects._vbo = None
+
+def draw_rect_batch(x, y, width, height, fill_color, line_color=None):
+    """Filled rectangle with an optional 1px border (single-rectangle ``draw_rects``)"""
+    draw_rects(((x, y, width, height, fill_color, line_color),))
+
+# X/Y/Z cells of one panel row (values shown in m with 4 decimal places)
+PANEL_ROW_FORMAT = "X:%.4f\0Y:%.4f\0Z:%.4f"
+
+def format_panel_rows(values, joints):
+    """
+    (joint_name, x_text, y_text, z_text) rows for the position/velocity panels.
+    
+    The cm vectors of all displayed joints are stacked, converted to m in one
+    division and formatted with a single % call instead of 3 f-strings per joint.
+    """
+    names = [name for name in ordered_joint_names(joints) if name in values]
+    if not names:
+        return []
+    flat = (np.array([values[name] for name in names]) / 100).ravel().tolist()
+    texts = ('\0'.join([PANEL_ROW_FORMAT] * len(names)) % tuple(flat)).split('\0')
+    return list(zip(names, texts[0::3], texts[1::3], texts[2::3]))
 
 # Left Position Panel
 def draw_position_panel(display, current_positions, joints):
@@ -1324,17 +2686,10 @@ def draw_position_panel(display, current_positions, joints):
     draw_text_2d(title_x, panel_y, title_text, title_color, title_font_size)
     current_y = panel_y - line_height
 
-    # Iterate joints by custom order
-    for joint_name in CUSTOM_JOINT_ORDER:
-        if joint_name not in joints or joint_name not in current_positions:
-            continue
+    # Iterate joints by custom order (Convert cm to m, keep 4 decimal places)
+    for joint_name, x_text, y_text, z_text in format_panel_rows(current_positions, joints):
         # Draw joint name
         draw_text_2d(joint_name_col_start, current_y, joint_name, content_color, content_font_size)
-        # Convert cm to m, keep 4 decimal places
-        pos = current_positions[joint_name] / 100
-        x_text = f"X:{pos[0]:.4f}"
-        y_text = f"Y:{pos[1]:.4f}"
-        z_text = f"Z:{pos[2]:.4f}"
         draw_text_2d(X_COL_START, current_y, x_text, content_color, content_font_size)
         draw_text_2d(Y_COL_START, current_y, y_text, content_color, content_font_size)
         draw_text_2d(Z_COL_START, current_y, z_text, content_color, content_font_size)
@@ -1383,17 +2738,10 @@ def draw_velocity_panel(display, current_velocities, joints):
     draw_text_2d(title_x, panel_y, title_text, title_color, title_font_size)
     current_y = panel_y - line_height
 
-    # Iterate joints by custom order
-    for joint_name in CUSTOM_JOINT_ORDER:
-        if joint_name not in joints or joint_name not in current_velocities:
-            continue
+    # Iterate joints by custom order (Convert cm/s to m/s, keep 4 decimal places)
+    for joint_name, x_text, y_text, z_text in format_panel_rows(current_velocities, joints):
         # Draw joint name
         draw_text_2d(joint_name_col_start, current_y, joint_name, content_color, content_font_size)
-        # Convert cm/s to m/s, keep 4 decimal places
-        vel = current_velocities[joint_name] / 100
-        x_text = f"X:{vel[0]:.4f}"
-        y_text = f"Y:{vel[1]:.4f}"
-        z_text = f"Z:{vel[2]:.4f}"
         draw_text_2d(X_COL_START, current_y, x_text, content_color, content_font_size)
         draw_text_2d(Y_COL_START, current_y, y_text, content_color, content_font_size)
         draw_text_2d(Z_COL_START, current_y, z_text, content_color, content_font_size)
@@ -1415,37 +2763,30 @@ def draw_axes_and_labels():
     
     axis_length = 16.67
     label_offset = 21.0
+    # X/Y/Z 标签位置一次批量投影
+    label_pos = _project_batch(np.eye(3) * label_offset, modelview_matrix, projection_matrix, viewport).tolist()
     glColor3f(1.0, 0.0, 0.0)
     glLineWidth(2.0)
     glBegin(GL_LINES)
     glVertex3f(0.0, 0.0, 0.0)
     glVertex3f(axis_length, 0.0, 0.0)
     glEnd()
-    try:
-        x_pos_3d = gluProject(label_offset, 0, 0, modelview_matrix, projection_matrix, viewport)
-        draw_text_2d(x_pos_3d[0], x_pos_3d[1], "X", (1.0, 0.0, 0.0), 18)
-    except ValueError:
-        pass
+    if not math.isnan(label_pos[0][0]):
+        draw_text_2d(label_pos[0][0], label_pos[0][1], "X", (1.0, 0.0, 0.0), 18)
     glColor3f(0.0, 1.0, 0.0)
     glBegin(GL_LINES)
     glVertex3f(0.0, 0.0, 0.0)
     glVertex3f(0.0, axis_length, 0.0)
     glEnd()
-    try:
-        y_pos_3d = gluProject(0, label_offset, 0, modelview_matrix, projection_matrix, viewport)
-        draw_text_2d(y_pos_3d[0], y_pos_3d[1], "Y", (0.0, 1.0, 0.0), 18)
-    except ValueError:
-        pass
+    if not math.isnan(label_pos[1][0]):
+        draw_text_2d(label_pos[1][0], label_pos[1][1], "Y", (0.0, 1.0, 0.0), 18)
     glColor3f(0.0, 0.0, 1.0)
     glBegin(GL_LINES)
     glVertex3f(0.0, 0.0, 0.0)
     glVertex3f(0.0, 0.0, axis_length)
     glEnd()
-    try:
-        z_pos_3d = gluProject(0, 0, label_offset, modelview_matrix, projection_matrix, viewport)
-        draw_text_2d(z_pos_3d[0], z_pos_3d[1], "Z", (0.0, 0.0, 1.0), 18)
-    except ValueError:
-        pass
+    if not math.isnan(label_pos[2][0]):
+        draw_text_2d(label_pos[2][0], label_pos[2][1], "Z", (0.0, 0.0, 1.0), 18)
 
 # Draw Grid
 def draw_grid():
@@ -1470,6 +2811,29 @@ def draw_text_2d(x, y, text, color, font_size=18):
     overlay_manager.draw_text(x, y, text, c, font_size)
 
 # -------------------------- Optimization: Joint Trajectory Drawing Function (Solid line -> Green small dots, only visible during playback) --------------------------
+def _trajectory_buffer(joint_name, trajectory):
+    """VBO holding a joint's full (F, 3) trajectory; uploaded once per trajectory array"""
+    buffers = draw_joint_trajectories._buffers
+    entry = buffers.get(joint_name)
+    if entry is not None and entry[0] is trajectory:
+        return entry[1]
+    vbo = entry[1] if entry is not None else glGenBuffers(1)
+    data = np.ascontiguousarray(trajectory, dtype=np.float32)
+    glBindBuffer(GL_ARRAY_BUFFER, vbo)
+    glBufferData(GL_ARRAY_BUFFER, data.nbytes, data, GL_STATIC_DRAW)
+    buffers[joint_name] = (trajectory, vbo)
+    return vbo
+
+def release_trajectory_buffers():
+    """释放轨迹 VBO（窗口重建后旧上下文的缓冲区可能已失效，下次绘制时重新上传）"""
+    buffers = draw_joint_trajectories._buffers
+    if buffers:
+        try:
+            glDeleteBuffers(len(buffers), [entry[1] for entry in buffers.values()])
+        except Exception:
+            pass  # 上下文已销毁时缓冲区随之释放
+        buffers.clear()
+
 def draw_joint_trajectories(show_trajectories, selected_joints, joint_trajectories, joint_colors, current_frame):
     if not show_trajectories or not selected_joints or not joint_trajectories:
         return
@@ -1477,6 +2841,7 @@ def draw_joint_trajectories(show_trajectories, selected_joints, joint_trajectori
     glDisable(GL_DEPTH_TEST)  # Trajectory displays above the skeleton
     glColor3f(0.0, 1.0, 0.0)  # Fixed green color
     glPointSize(1.0)          # Point size (1 pixel, subtle)
+    glEnableClientState(GL_VERTEX_ARRAY)
     
     for joint_name in selected_joints:
         if joint_name not in joint_trajectories:
@@ -1486,25 +2851,23 @@ def draw_joint_trajectories(show_trajectories, selected_joints, joint_trajectori
             continue
         
         # Only draw points up to and including the current frame (accumulates as playback progresses)
-        glBegin(GL_POINTS)
-        for i in range(0, current_frame + 1):
-            if i >= len(trajectory):
-                break
-            pos = trajectory[i]
-            glVertex3f(*pos)
-        glEnd()
+        glBindBuffer(GL_ARRAY_BUFFER, _trajectory_buffer(joint_name, trajectory))
+        glVertexPointer(3, GL_FLOAT, 0, ctypes.c_void_p(0))
+        glDrawArrays(GL_POINTS, 0, min(current_frame + 1, len(trajectory)))
     
+    glBindBuffer(GL_ARRAY_BUFFER, 0)
+    glDisableClientState(GL_VERTEX_ARRAY)
     glEnable(GL_DEPTH_TEST)
+draw_joint_trajectories._buffers = {}  # joint_name -> (trajectory array, VBO)
 
 # -------------------------- Trajectory Settings Window (Joint multi-select + switch) --------------------------
 def open_trajectory_settings(joints, all_joint_positions, show_trajectories, selected_joints, joint_trajectories, joint_colors):
     if not joints or not all_joint_positions:
-        tk.Tk().withdraw()
-        tk.messagebox.showwarning("Hint", "Please load a BVH file first!")
+        messagebox.showwarning("Hint", "Please load a BVH file first!", parent=get_tk_root())
         return
     
     # Create new Tkinter window
-    settings_win = tk.Tk()
+    settings_win = tk.Toplevel(get_tk_root())
     settings_win.title("Joint Trajectory Settings")
     settings_win.geometry("300x400")
     
@@ -1527,7 +2890,7 @@ def open_trajectory_settings(joints, all_joint_positions, show_trajectories, sel
         height=15
     )
     # Load all joint names (by custom order)
-    joint_names = [name for name in CUSTOM_JOINT_ORDER if name in joints]
+    joint_names = ordered_joint_names(joints)
     for idx, name in enumerate(joint_names):
         listbox.insert(idx, name)
         # Pre-select joints that were previously selected
@@ -1549,12 +2912,8 @@ def open_trajectory_settings(joints, all_joint_positions, show_trajectories, sel
         # 3. Build trajectory data for selected joints (extract from all_joint_positions)
         joint_trajectories.clear()
         for joint_name in selected_joints:
-            trajectory = []
-            for frame_pos in all_joint_positions:
-                # Extract the position of this joint in the current frame
-                pos = frame_pos.get(joint_name, np.zeros(3))
-                trajectory.append(pos)
-            joint_trajectories[joint_name] = trajectory
+            # (F, 3) column of the contiguous positions array
+            joint_trajectories[joint_name] = all_joint_positions.column(joint_name)
         
         # 4. Assign a unique color to each selected joint (HSV color wheel for distinctness)
         joint_colors.clear()
@@ -1579,7 +2938,7 @@ def open_trajectory_settings(joints, all_joint_positions, show_trajectories, sel
     )
     confirm_btn.pack(pady=10)
     
-    settings_win.mainloop()
+    settings_win.wait_window()
     # Return updated data (for variable synchronization in main function)
     return show_trajectories, selected_joints, joint_trajectories, joint_colors
 
@@ -1594,68 +2953,16 @@ def draw_2d_ui(display, current_frame, frames, is_playing, fps, load_btn_rect, e
     glLoadIdentity()
     glDisable(GL_DEPTH_TEST)
     
-    # 1. Load Button
-    load_x = load_btn_rect.x
-    load_y = display[1] - load_btn_rect.y - load_btn_rect.height
-    load_width = load_btn_rect.width
-    load_height = load_btn_rect.height
-    draw_rectangle(load_x, load_y, load_width, load_height, (0.8, 0.8, 0.8))
-    glColor3f(0.0, 0.0, 0.0)
-    glLineWidth(1.0)
-    glBegin(GL_LINE_LOOP)
-    glVertex2f(load_x, load_y)
-    glVertex2f(load_x + load_width, load_y)
-    glVertex2f(load_x + load_width, load_y + load_height)
-    glVertex2f(load_x, load_y + load_height)
-    glEnd()
-    load_text = "Load File"
-    text_width = len(load_text) * 8
+    # 1-3. Load / Export / Trajectory Settings buttons: backgrounds and borders in one batched draw
+    buttons = []
+    for rect, text in ((load_btn_rect, "Load File"), (export_btn_rect, "Export Data"), (trajectory_btn_rect, "Trajectory")):
+        buttons.append((rect.x, display[1] - rect.y - rect.height, rect.width, rect.height, text))
+    draw_rects([(x, y, width, height, (0.8, 0.8, 0.8), (0.0, 0.0, 0.0)) for x, y, width, height, _ in buttons])
     text_height = 12
-    load_text_x = load_x + (load_width - text_width) / 2 + 8  
-    load_text_y = load_y + (load_height + text_height) / 2 - 10  
-    draw_text_2d(load_text_x, load_text_y, load_text, (0.0, 0.0, 0.0), font_size=12)
-    
-    # 2. Export Button
-    export_x = export_btn_rect.x
-    export_y = display[1] - export_btn_rect.y - export_btn_rect.height
-    export_width = export_btn_rect.width
-    export_height = export_btn_rect.height
-    draw_rectangle(export_x, export_y, export_width, export_height, (0.8, 0.8, 0.8))
-    glColor3f(0.0, 0.0, 0.0)
-    glLineWidth(1.0)
-    glBegin(GL_LINE_LOOP)
-    glVertex2f(export_x, export_y)
-    glVertex2f(export_x + export_width, export_y)
-    glVertex2f(export_x + export_width, export_y + export_height)
-    glVertex2f(export_x, export_y + export_height)
-    glEnd()
-    export_text = "Export Data"
-    export_text_width = len(export_text) * 8
-    export_text_height = 12
-    export_text_x = export_x + (export_width - export_text_width) / 2 + 8  
-    export_text_y = export_y + (export_height + export_text_height) / 2 - 10 
-    draw_text_2d(export_text_x, export_text_y, export_text, (0.0, 0.0, 0.0), font_size=12)
-    
-    # 3. Trajectory Settings Button
-    traj_x = trajectory_btn_rect.x
-    traj_y = display[1] - trajectory_btn_rect.y - trajectory_btn_rect.height
-    traj_width = trajectory_btn_rect.width
-    traj_height = trajectory_btn_rect.height
-    draw_rectangle(traj_x, traj_y, traj_width, traj_height, (0.8, 0.8, 0.8))
-    glColor3f(0.0, 0.0, 0.0)
-    glLineWidth(1.0)
-    glBegin(GL_LINE_LOOP)
-    glVertex2f(traj_x, traj_y)
-    glVertex2f(traj_x + traj_width, traj_y)
-    glVertex2f(traj_x + traj_width, traj_y + traj_height)
-    glVertex2f(traj_x, traj_y + traj_height)
-    glEnd()
-    traj_text = "Trajectory"
-    traj_text_width = len(traj_text) * 8
-    traj_text_height = 12
-    traj_text_x = traj_x + (traj_width - traj_text_width) / 2 + 8  
-    traj_text_y = traj_y + (traj_height + traj_text_height) / 2 - 10 
-    draw_text_2d(traj_text_x, traj_text_y, traj_text, (0.0, 0.0, 0.0), font_size=12)
+    for x, y, width, height, text in buttons:
+        text_x = x + (width - len(text) * 8) / 2 + 8
+        text_y = y + (height + text_height) / 2 - 10
+        draw_text_2d(text_x, text_y, text, (0.0, 0.0, 0.0), font_size=12)
     
     # Timeline drawing
     if frames > 0:
@@ -1664,50 +2971,27 @@ def draw_2d_ui(display, current_frame, frames, is_playing, fps, load_btn_rect, e
         frame_text = f"Frame: {current_frame}"
         draw_text_2d((display[0] - len(frame_text)*8) // 2, timeline_rect.y + timeline_rect.height + 5, frame_text, (0.0, 0.0, 0.0), font_size=12)
         
-        glColor3f(0.7, 0.7, 0.7)
-        glBegin(GL_QUADS)
-        glVertex2f(timeline_rect.x, timeline_rect.y)
-        glVertex2f(timeline_rect.x + timeline_rect.width, timeline_rect.y)
-        glVertex2f(timeline_rect.x + timeline_rect.width, timeline_rect.y + timeline_rect.height)
-        glVertex2f(timeline_rect.x, timeline_rect.y + timeline_rect.height)
-        glEnd()
         progress_width = (current_frame / (frames - 1)) * timeline_rect.width if frames > 1 else 0
-        glColor3f(0.4, 0.4, 0.4)
-        glBegin(GL_QUADS)
-        glVertex2f(timeline_rect.x, timeline_rect.y)
-        glVertex2f(timeline_rect.x + progress_width, timeline_rect.y)
-        glVertex2f(timeline_rect.x + progress_width, timeline_rect.y + timeline_rect.height)
-        glVertex2f(timeline_rect.x, timeline_rect.y + timeline_rect.height)
-        glEnd()
-        
         slider_x = timeline_rect.x + progress_width
         slider_y = timeline_rect.y
         slider_w = 8
         slider_h = 16
-        glColor3f(0.0, 0.0, 0.0)
-        glBegin(GL_QUADS)
-        glVertex2f(slider_x - slider_w/2, slider_y - slider_h/2 + timeline_rect.height/2)
-        glVertex2f(slider_x + slider_w/2, slider_y - slider_h/2 + timeline_rect.height/2)
-        glVertex2f(slider_x + slider_w/2, slider_y + slider_h/2 + timeline_rect.height/2)
-        glVertex2f(slider_x - slider_w/2, slider_y + slider_h/2 + timeline_rect.height/2)
-        glEnd()
+        # 轨道、进度条和滑块一次绘制
+        draw_rects((
+            (timeline_rect.x, timeline_rect.y, timeline_rect.width, timeline_rect.height, (0.7, 0.7, 0.7), None),
+            (timeline_rect.x, timeline_rect.y, progress_width, timeline_rect.height, (0.4, 0.4, 0.4), None),
+            (slider_x - slider_w/2, slider_y - slider_h/2 + timeline_rect.height/2, slider_w, slider_h, (0.0, 0.0, 0.0), None),
+        ))
     
     # Play/Pause Button
-    glColor3f(0.0, 0.0, 0.0)
     if is_playing:
-        glBegin(GL_QUADS)
-        glVertex2f(play_pause_btn_rect.x, play_pause_btn_rect.y)
-        glVertex2f(play_pause_btn_rect.x + play_pause_btn_rect.width * 0.4, play_pause_btn_rect.y)
-        glVertex2f(play_pause_btn_rect.x + play_pause_btn_rect.width * 0.4, play_pause_btn_rect.y + play_pause_btn_rect.height)
-        glVertex2f(play_pause_btn_rect.x, play_pause_btn_rect.y + play_pause_btn_rect.height)
-        glEnd()
-        glBegin(GL_QUADS)
-        glVertex2f(play_pause_btn_rect.x + play_pause_btn_rect.width * 0.6, play_pause_btn_rect.y)
-        glVertex2f(play_pause_btn_rect.x + play_pause_btn_rect.width, play_pause_btn_rect.y)
-        glVertex2f(play_pause_btn_rect.x + play_pause_btn_rect.width, play_pause_btn_rect.y + play_pause_btn_rect.height)
-        glVertex2f(play_pause_btn_rect.x + play_pause_btn_rect.width * 0.6, play_pause_btn_rect.y + play_pause_btn_rect.height)
-        glEnd()
+        bar_width = play_pause_btn_rect.width * 0.4
+        draw_rects((
+            (play_pause_btn_rect.x, play_pause_btn_rect.y, bar_width, play_pause_btn_rect.height, (0.0, 0.0, 0.0), None),
+            (play_pause_btn_rect.x + play_pause_btn_rect.width * 0.6, play_pause_btn_rect.y, bar_width, play_pause_btn_rect.height, (0.0, 0.0, 0.0), None),
+        ))
     else:
+        glColor3f(0.0, 0.0, 0.0)
         glBegin(GL_TRIANGLES)
         glVertex2f(play_pause_btn_rect.x, play_pause_btn_rect.y)
         glVertex2f(play_pause_btn_rect.x, play_pause_btn_rect.y + play_pause_btn_rect.height)
@@ -1728,20 +3012,136 @@ def draw_2d_ui(display, current_frame, frames, is_playing, fps, load_btn_rect, e
     glMatrixMode(GL_MODELVIEW)
     glPopMatrix()
 
-# ======================== 绘制实时模式UI ========================
-def draw_realtime_ui(display, mode_btn_rect, connect_btn_rect, record_btn_rect, calibrate_btn_rect, export_bvh_btn_rect):
+def _phase_color_table(rules):
     """
-    绘制实时模式相关的UI按钮和状态信息
-    支持 Mocap 和 Secap 两种模式
+    {(capture_phase, calibration_state): color} for every known combination.
+    
+    ``rules`` are (phases, states, color) checked in order, the first match wins;
+    None matches any value. Combinations matching no rule are left out.
     """
-    glMatrixMode(GL_PROJECTION)
-    glPushMatrix()
-    glLoadIdentity()
-    glOrtho(0, display[0], 0, display[1], -1, 1)
-    glMatrixMode(GL_MODELVIEW)
-    glPushMatrix()
-    glLoadIdentity()
-    glDisable(GL_DEPTH_TEST)
+    phases = (CapturePhase.IDLE, CapturePhase.STABILIZING, CapturePhase.READY, CapturePhase.CALIBRATED)
+    states = (CalibrationState.NONE, CalibrationState.PREPARING, CalibrationState.COUNTDOWN,
+              CalibrationState.IN_PROGRESS, CalibrationState.COMPLETED, CalibrationState.FAILED)
+    table = {}
+    for phase in phases:
+        for state in states:
+            for rule_phases, rule_states, color in rules:
+                if (rule_phases is None or phase in rule_phases) and (rule_states is None or state in rule_states):
+                    table[(phase, state)] = color
+                    break
+    return table
+
+if CapturePhase is not None:
+    _CALIBRATING_STATES = (CalibrationState.PREPARING, CalibrationState.COUNTDOWN, CalibrationState.IN_PROGRESS)
+    # Calibrate 按钮底色
+    CALIBRATE_BUTTON_COLORS = _phase_color_table((
+        ((CapturePhase.CALIBRATED,), (CalibrationState.COMPLETED,), (0.4, 0.8, 0.4)),  # 绿色表示已校准
+        (None, _CALIBRATING_STATES, (0.9, 0.7, 0.2)),                                  # 橙色表示校准中
+        ((CapturePhase.READY,), None, (0.3, 0.7, 0.9)),                                # 蓝色表示可以校准
+        ((CapturePhase.STABILIZING,), None, (0.7, 0.7, 0.7)),                          # 灰色表示稳定化中
+        (None, (CalibrationState.FAILED,), (0.9, 0.3, 0.3)),                           # 红色表示校准失败
+    ))
+    # 采集阶段/校准状态提示文字颜色
+    CAPTURE_STATUS_COLORS = _phase_color_table((
+        ((CapturePhase.CALIBRATED,), (CalibrationState.COMPLETED,), (0.0, 0.6, 0.0)),
+        (None, _CALIBRATING_STATES, (0.8, 0.5, 0.0)),
+        ((CapturePhase.STABILIZING,), None, (0.0, 0.4, 0.8)),
+        ((CapturePhase.READY,), None, (0.0, 0.6, 0.3)),
+        (None, (CalibrationState.FAILED,), (0.8, 0.0, 0.0)),
+    ))
+else:
+    CALIBRATE_BUTTON_COLORS = {}
+    CAPTURE_STATUS_COLORS = {}
+
+def _realtime_status_key():
+    """
+    Everything the realtime status lines depend on. The exact recording frame count
+    is part of the key: it changes at most once per received frame, so the lines are
+    still rebuilt only when the shown text changes.
+    """
+    key = [AppState.mode]
+    mocap = AppState.mocap_connector
+    axis_studio = AppState.axis_studio_connector
+    if AppState.mode == AppMode.MOCAP and mocap:
+        key += [mocap.is_connected, mocap.device_ip, mocap.device_port]
+        if mocap.is_connected:
+            key += [mocap.get_overall_status_message(), mocap.capture_phase, mocap.calibration_state]
+    elif AppState.mode == AppMode.SECAP and axis_studio:
+        key += [axis_studio.is_listening, axis_studio.is_receiving_data,
+                axis_studio.get_connection_status_text(), axis_studio.get_endpoint_label()]
+    recorder = AppState.recording_manager
+    if recorder and recorder.is_recording:
+        key.append(recorder.get_frame_count())
+    return tuple(key)
+
+def _realtime_status_lines():
+    """(text, color) status lines shown bottom-left in the realtime modes"""
+    lines = []
+    # 显示模式信息
+    if AppState.mode == AppMode.MOCAP:
+        lines.append(("Mode: MOCAP", (0.0, 0.5, 0.0)))
+        
+        # 显示 Mocap 连接状态
+        if AppState.mocap_connector:
+            if AppState.mocap_connector.is_connected:
+                conn_info = f"Status: Connected ({AppState.mocap_connector.device_ip}:{AppState.mocap_connector.device_port})"
+                lines.append((conn_info, (0.0, 0.5, 0.0)))
+            else:
+                lines.append(("Status: Disconnected", (0.5, 0.0, 0.0)))
+            
+            # Mocap 模式的采集阶段和校准状态
+            if AppState.mocap_connector.is_connected:
+                status_msg = AppState.mocap_connector.get_overall_status_message()
+                if status_msg:
+                    phase_key = (AppState.mocap_connector.capture_phase, AppState.mocap_connector.calibration_state)
+                    lines.append((status_msg, CAPTURE_STATUS_COLORS.get(phase_key, (0.5, 0.5, 0.5))))
+    
+    elif AppState.mode == AppMode.SECAP:
+        lines.append(("Mode: SECAP (Axis Studio)", (0.0, 0.4, 0.8)))
+        
+        # 显示 Secap 状态
+        if AppState.axis_studio_connector:
+            status_text = AppState.axis_studio_connector.get_connection_status_text()
+            endpoint_info = f"Endpoint: {AppState.axis_studio_connector.get_endpoint_label()}"
+            
+            if AppState.axis_studio_connector.is_listening:
+                status_color = (0.0, 0.5, 0.0) if AppState.axis_studio_connector.is_receiving_data else (0.5, 0.5, 0.0)
+                lines.append((f"Status: {status_text}", status_color))
+                lines.append((endpoint_info, (0.0, 0.4, 0.8)))
+                
+                if not AppState.axis_studio_connector.is_receiving_data:
+                    lines.append(("⚠️ Please start BVH broadcast in Axis Studio", (0.8, 0.5, 0.0)))
+            else:
+                lines.append(("Status: Not Listening", (0.5, 0.0, 0.0)))
+                lines.append((endpoint_info, (0.0, 0.4, 0.8)))
+    
+    # 显示录制状态（两种模式共用）
+    if AppState.recording_manager and AppState.recording_manager.is_recording:
+        lines.append((f"Recording: {AppState.recording_manager.get_frame_count()} frames", (0.9, 0.0, 0.0)))
+    return lines
+
+def _realtime_is_connected():
+    """Mocap: device connected; Secap: listening for the Axis Studio broadcast"""
+    if AppState.mode == AppMode.MOCAP and AppState.mocap_connector:
+        return AppState.mocap_connector.is_connected
+    if AppState.mode == AppMode.SECAP and AppState.axis_studio_connector:
+        return AppState.axis_studio_connector.is_listening
+    return False
+
+def _realtime_button_key(display, btn_rects):
+    """Everything the realtime button colours, labels and positions depend on"""
+    key = [tuple(display), tuple(tuple(rect) for rect in btn_rects), AppState.mode, _realtime_is_connected(),
+           bool(AppState.recording_manager and AppState.recording_manager.is_recording)]
+    if AppState.mode == AppMode.MOCAP and AppState.mocap_connector:
+        key += [AppState.mocap_connector.capture_phase, AppState.mocap_connector.calibration_state]
+    return tuple(key)
+
+def _realtime_button_layout(display, mode_btn_rect, connect_btn_rect, record_btn_rect, calibrate_btn_rect, export_bvh_btn_rect):
+    """
+    Realtime-mode buttons as ``draw_rects`` tuples plus their (x, y, text) labels
+    """
+    button_rects = []
+    labels = []  # (x, y, text)，黑色 12 号字
     
     # 1. Mode Button (模式切换按钮：Offline / Mocap / Secap)
     mode_x = mode_btn_rect.x
@@ -1755,26 +3155,17 @@ def draw_realtime_ui(display, mode_btn_rect, connect_btn_rect, record_btn_rect,
         mode_color = (0.4, 0.7, 0.9)  # 蓝色表示 Secap 模式
     else:
         mode_color = (0.8, 0.8, 0.8)  # 灰色表示离线模式
-    draw_rectangle(mode_x, mode_y, mode_width, mode_height, mode_color)
-    glColor3f(0.0, 0.0, 0.0)
-    glLineWidth(1.0)
-    glBegin(GL_LINE_LOOP)
-    glVertex2f(mode_x, mode_y)
-    glVertex2f(mode_x + mode_width, mode_y)
-    glVertex2f(mode_x + mode_width, mode_y + mode_height)
-    glVertex2f(mode_x, mode_y + mode_height)
-    glEnd()
+    button_rects.append((mode_x, mode_y, mode_width, mode_height, mode_color, (0.0, 0.0, 0.0)))
     if AppState.mode == AppMode.MOCAP:
         mode_text = "Mocap"
     elif AppState.mode == AppMode.SECAP:
         mode_text = "Secap"
     else:
         mode_text = "Offline"
-    mode_text_width = len(mode_text) * 8
-    mode_text_height = 12
-    mode_text_x = mode_x + (mode_width - mode_text_width) / 2 + 8
-    mode_text_y = mode_y + (mode_height + mode_text_height) / 2 - 10
-    draw_text_2d(mode_text_x, mode_text_y, mode_text, (0.0, 0.0, 0.0), font_size=12)
+    mode_text_width, mode_text_height = overlay_manager.text_size(mode_text, 12)
+    mode_text_x = mode_x + (mode_width - mode_text_width) / 2
+    mode_text_y = mode_y + (mode_height - mode_text_height) / 2
+    labels.append((mode_text_x, mode_text_y, mode_text))
     
     # 2. Connect Button (连接按钮 - Mocap/Secap 模式共用)
     conn_x = connect_btn_rect.x
@@ -1782,22 +3173,10 @@ def draw_realtime_ui(display, mode_btn_rect, connect_btn_rect, record_btn_rect,
     conn_width = connect_btn_rect.width
     conn_height = connect_btn_rect.height
     # 根据连接状态设置按钮颜色
-    is_connected = False
-    if AppState.mode == AppMode.MOCAP and AppState.mocap_connector:
-        is_connected = AppState.mocap_connector.is_connected
-    elif AppState.mode == AppMode.SECAP and AppState.axis_studio_connector:
-        is_connected = AppState.axis_studio_connector.is_listening
+    is_connected = _realtime_is_connected()
     
     conn_color = (0.4, 0.8, 0.4) if is_connected else (0.8, 0.8, 0.8)
-    draw_rectangle(conn_x, conn_y, conn_width, conn_height, conn_color)
-    glColor3f(0.0, 0.0, 0.0)
-    glLineWidth(1.0)
-    glBegin(GL_LINE_LOOP)
-    glVertex2f(conn_x, conn_y)
-    glVertex2f(conn_x + conn_width, conn_y)
-    glVertex2f(conn_x + conn_width, conn_y + conn_height)
-    glVertex2f(conn_x, conn_y + conn_height)
-    glEnd()
+    button_rects.append((conn_x, conn_y, conn_width, conn_height, conn_color, (0.0, 0.0, 0.0)))
     
     # 按钮文本根据模式调整
     if AppState.mode == AppMode.MOCAP:
@@ -1806,11 +3185,10 @@ def draw_realtime_ui(display, mode_btn_rect, connect_btn_rect, record_btn_rect,
         conn_text = "Stop" if is_connected else "Listen"
     else:
         conn_text = "N/A"
-    conn_text_width = len(conn_text) * 8
-    conn_text_height = 12
-    conn_text_x = conn_x + (conn_width - conn_text_width) / 2 + 8
-    conn_text_y = conn_y + (conn_height + conn_text_height) / 2 - 10
-    draw_text_2d(conn_text_x, conn_text_y, conn_text, (0.0, 0.0, 0.0), font_size=12)
+    conn_text_width, conn_text_height = overlay_manager.text_size(conn_text, 12)
+    conn_text_x = conn_x + (conn_width - conn_text_width) / 2
+    conn_text_y = conn_y + (conn_height - conn_text_height) / 2
+    labels.append((conn_text_x, conn_text_y, conn_text))
     
     # 3. Record Button (录制按钮 - 两种模式共用)
     rec_x = record_btn_rect.x
@@ -1822,21 +3200,12 @@ def draw_realtime_ui(display, mode_btn_rect, connect_btn_rect, record_btn_rect,
         rec_color = (0.9, 0.3, 0.3)  # 红色表示正在录制
     else:
         rec_color = (0.8, 0.8, 0.8)  # 灰色表示未录制
-    draw_rectangle(rec_x, rec_y, rec_width, rec_height, rec_color)
-    glColor3f(0.0, 0.0, 0.0)
-    glLineWidth(1.0)
-    glBegin(GL_LINE_LOOP)
-    glVertex2f(rec_x, rec_y)
-    glVertex2f(rec_x + rec_width, rec_y)
-    glVertex2f(rec_x + rec_width, rec_y + rec_height)
-    glVertex2f(rec_x, rec_y + rec_height)
-    glEnd()
+    button_rects.append((rec_x, rec_y, rec_width, rec_height, rec_color, (0.0, 0.0, 0.0)))
     rec_text = "Stop" if (AppState.recording_manager and AppState.recording_manager.is_recording) else "Record"
-    rec_text_width = len(rec_text) * 8
-    rec_text_height = 12
-    rec_text_x = rec_x + (rec_width - rec_text_width) / 2 + 8
-    rec_text_y = rec_y + (rec_height + rec_text_height) / 2 - 10
-    draw_text_2d(rec_text_x, rec_text_y, rec_text, (0.0, 0.0, 0.0), font_size=12)
+    rec_text_width, rec_text_height = overlay_manager.text_size(rec_text, 12)
+    rec_text_x = rec_x + (rec_width - rec_text_width) / 2
+    rec_text_y = rec_y + (rec_height - rec_text_height) / 2
+    labels.append((rec_text_x, rec_text_y, rec_text))
     
     # 4. Calibrate Button (校准按钮 - 仅 Mocap 模式可用)
     cal_x = calibrate_btn_rect.x
@@ -1845,133 +3214,65 @@ def draw_realtime_ui(display, mode_btn_rect, connect_btn_rect, record_btn_rect,
     cal_height = calibrate_btn_rect.height
     # 根据采集阶段和校准状态设置按钮颜色（仅 Mocap 模式）
     if AppState.mode == AppMode.MOCAP and AppState.mocap_connector:
-        capture_phase = AppState.mocap_connector.capture_phase
-        cal_state = AppState.mocap_connector.calibration_state
-        
-        if capture_phase == CapturePhase.CALIBRATED and cal_state == CalibrationState.COMPLETED:
-            cal_color = (0.4, 0.8, 0.4)  # 绿色表示已校准
-        elif cal_state in [CalibrationState.PREPARING, CalibrationState.COUNTDOWN, CalibrationState.IN_PROGRESS]:
-            cal_color = (0.9, 0.7, 0.2)  # 橙色表示校准中
-        elif capture_phase == CapturePhase.READY:
-            cal_color = (0.3, 0.7, 0.9)  # 蓝色表示可以校准
-        elif capture_phase == CapturePhase.STABILIZING:
-            cal_color = (0.7, 0.7, 0.7)  # 灰色表示稳定化中
-        elif cal_state == CalibrationState.FAILED:
-            cal_color = (0.9, 0.3, 0.3)  # 红色表示校准失败
-        else:
-            cal_color = (0.8, 0.8, 0.8)  # 灰色
+        phase_key = (AppState.mocap_connector.capture_phase, AppState.mocap_connector.calibration_state)
+        cal_color = CALIBRATE_BUTTON_COLORS.get(phase_key, (0.8, 0.8, 0.8))  # 默认灰色
     else:
         # Secap 模式不需要校准，按钮置灰
         cal_color = (0.6, 0.6, 0.6)
-    draw_rectangle(cal_x, cal_y, cal_width, cal_height, cal_color)
-    glColor3f(0.0, 0.0, 0.0)
-    glLineWidth(1.0)
-    glBegin(GL_LINE_LOOP)
-    glVertex2f(cal_x, cal_y)
-    glVertex2f(cal_x + cal_width, cal_y)
-    glVertex2f(cal_x + cal_width, cal_y + cal_height)
-    glVertex2f(cal_x, cal_y + cal_height)
-    glEnd()
+    button_rects.append((cal_x, cal_y, cal_width, cal_height, cal_color, (0.0, 0.0, 0.0)))
     cal_text = "Calibrate" if AppState.mode == AppMode.MOCAP else "N/A"
-    cal_text_width = len(cal_text) * 8
-    cal_text_height = 12
-    cal_text_x = cal_x + (cal_width - cal_text_width) / 2 + 8
-    cal_text_y = cal_y + (cal_height + cal_text_height) / 2 - 10
-    draw_text_2d(cal_text_x, cal_text_y, cal_text, (0.0, 0.0, 0.0), font_size=12)
+    cal_text_width, cal_text_height = overlay_manager.text_size(cal_text, 12)
+    cal_text_x = cal_x + (cal_width - cal_text_width) / 2
+    cal_text_y = cal_y + (cal_height - cal_text_height) / 2
+    labels.append((cal_text_x, cal_text_y, cal_text))
     
     # 5. Export BVH Button (导出BVH按钮)
     exp_x = export_bvh_btn_rect.x
     exp_y = display[1] - export_bvh_btn_rect.y - export_bvh_btn_rect.height
     exp_width = export_bvh_btn_rect.width
     exp_height = export_bvh_btn_rect.height
-    draw_rectangle(exp_x, exp_y, exp_width, exp_height, (0.8, 0.8, 0.8))
-    glColor3f(0.0, 0.0, 0.0)
-    glLineWidth(1.0)
-    glBegin(GL_LINE_LOOP)
-    glVertex2f(exp_x, exp_y)
-    glVertex2f(exp_x + exp_width, exp_y)
-    glVertex2f(exp_x + exp_width, exp_y + exp_height)
-    glVertex2f(exp_x, exp_y + exp_height)
-    glEnd()
+    button_rects.append((exp_x, exp_y, exp_width, exp_height, (0.8, 0.8, 0.8), (0.0, 0.0, 0.0)))
     exp_text = "Export BVH"
-    exp_text_width = len(exp_text) * 8
-    exp_text_height = 12
-    exp_text_x = exp_x + (exp_width - exp_text_width) / 2 + 8
-    exp_text_y = exp_y + (exp_height + exp_text_height) / 2 - 10
-    draw_text_2d(exp_text_x, exp_text_y, exp_text, (0.0, 0.0, 0.0), font_size=12)
-    
-    # 6. 状态信息显示
-    status_y = 50  # 状态信息显示在左下角
-    
-    # 显示模式信息
-    if AppState.mode == AppMode.MOCAP:
-        mode_info = f"Mode: MOCAP"
-        draw_text_2d(10, status_y, mode_info, (0.0, 0.5, 0.0), font_size=12)
-        status_y += 15
-        
-        # 显示 Mocap 连接状态
-        if AppState.mocap_connector:
-            if AppState.mocap_connector.is_connected:
-                conn_info = f"Status: Connected ({AppState.mocap_connector.device_ip}:{AppState.mocap_connector.device_port})"
-                draw_text_2d(10, status_y, conn_info, (0.0, 0.5, 0.0), font_size=12)
-            else:
-                conn_info = "Status: Disconnected"
-                draw_text_2d(10, status_y, conn_info, (0.5, 0.0, 0.0), font_size=12)
-            status_y += 15
-            
-            # Mocap 模式的采集阶段和校准状态
-            if AppState.mocap_connector.is_connected:
-                status_msg = AppState.mocap_connector.get_overall_status_message()
-                if status_msg:
-                    capture_phase = AppState.mocap_connector.capture_phase
-                    cal_state = AppState.mocap_connector.calibration_state
-                    
-                    if capture_phase == CapturePhase.CALIBRATED and cal_state == CalibrationState.COMPLETED:
-                        msg_color = (0.0, 0.6, 0.0)
-                    elif cal_state in [CalibrationState.PREPARING, CalibrationState.COUNTDOWN, CalibrationState.IN_PROGRESS]:
-                        msg_color = (0.8, 0.5, 0.0)
-                    elif capture_phase == CapturePhase.STABILIZING:
-                        msg_color = (0.0, 0.4, 0.8)
-                    elif capture_phase == CapturePhase.READY:
-                        msg_color = (0.0, 0.6, 0.3)
-                    elif cal_state == CalibrationState.FAILED:
-                        msg_color = (0.8, 0.0, 0.0)
-                    else:
-                        msg_color = (0.5, 0.5, 0.5)
-                    draw_text_2d(10, status_y, status_msg, msg_color, font_size=12)
-                    status_y += 15
-    
-    elif AppState.mode == AppMode.SECAP:
-        mode_info = f"Mode: SECAP (Axis Studio)"
-        draw_text_2d(10, status_y, mode_info, (0.0, 0.4, 0.8), font_size=12)
-        status_y += 15
-        
-        # 显示 Secap 状态
-        if AppState.axis_studio_connector:
-            status_text = AppState.axis_studio_connector.get_connection_status_text()
-            endpoint_info = f"Endpoint: {AppState.axis_studio_connector.get_endpoint_label()}"
-            
-            if AppState.axis_studio_connector.is_listening:
-                status_color = (0.0, 0.5, 0.0) if AppState.axis_studio_connector.is_receiving_data else (0.5, 0.5, 0.0)
-                draw_text_2d(10, status_y, f"Status: {status_text}", status_color, font_size=12)
-                status_y += 15
-                draw_text_2d(10, status_y, endpoint_info, (0.0, 0.4, 0.8), font_size=12)
-                status_y += 15
-                
-                if not AppState.axis_studio_connector.is_receiving_data:
-                    hint = "⚠️ Please start BVH broadcast in Axis Studio"
-                    draw_text_2d(10, status_y, hint, (0.8, 0.5, 0.0), font_size=12)
-                    status_y += 15
-            else:
-                draw_text_2d(10, status_y, "Status: Not Listening", (0.5, 0.0, 0.0), font_size=12)
-                status_y += 15
-                draw_text_2d(10, status_y, endpoint_info, (0.0, 0.4, 0.8), font_size=12)
-                status_y += 15
-    
-    # 显示录制状态（两种模式共用）
-    if AppState.recording_manager and AppState.recording_manager.is_recording:
-        rec_info = f"Recording: {AppState.recording_manager.get_frame_count()} frames"
-        draw_text_2d(10, status_y, rec_info, (0.9, 0.0, 0.0), font_size=12)
+    exp_text_width, exp_text_height = overlay_manager.text_size(exp_text, 12)
+    exp_text_x = exp_x + (exp_width - exp_text_width) / 2
+    exp_text_y = exp_y + (exp_height - exp_text_height) / 2
+    labels.append((exp_text_x, exp_text_y, exp_text))
+    return button_rects, labels
+
+# ======================== 绘制实时模式UI ========================
+def draw_realtime_ui(display, mode_btn_rect, connect_btn_rect, record_btn_rect, calibrate_btn_rect, export_bvh_btn_rect):
+    """
+    绘制实时模式相关的UI按钮和状态信息
+    支持 Mocap 和 Secap 两种模式
+    """
+    glMatrixMode(GL_PROJECTION)
+    glPushMatrix()
+    glLoadIdentity()
+    glOrtho(0, display[0], 0, display[1], -1, 1)
+    glMatrixMode(GL_MODELVIEW)
+    glPushMatrix()
+    glLoadIdentity()
+    glDisable(GL_DEPTH_TEST)
+    # 按钮的矩形和文字位置只在窗口尺寸或连接/录制/校准状态变化时重新计算
+    button_cache = draw_realtime_ui._button_cache
+    button_key = _realtime_button_key(display, (mode_btn_rect, connect_btn_rect, record_btn_rect, calibrate_btn_rect, export_bvh_btn_rect))
+    if button_key != button_cache['key']:
+        button_cache['key'] = button_key
+        button_cache['rects'], button_cache['labels'] = _realtime_button_layout(
+            display, mode_btn_rect, connect_btn_rect, record_btn_rect, calibrate_btn_rect, export_bvh_btn_rect)
+    draw_rects(button_cache['rects'])
+    for label_x, label_y, label_text in button_cache['labels']:
+        draw_text_2d(label_x, label_y, label_text, (0.0, 0.0, 0.0), font_size=12)
+    
+    # 6. 状态信息显示（左下角）：状态不变时直接复用上次生成的文本行
+    status_cache = draw_realtime_ui._status_cache
+    status_key = _realtime_status_key()
+    if status_key != status_cache['key']:
+        status_cache['key'] = status_key
+        status_cache['lines'] = _realtime_status_lines()
+    status_y = 50
+    for status_text, status_color in status_cache['lines']:
+        draw_text_2d(10, status_y, status_text, status_color, font_size=12)
         status_y += 15
     
     glEnable(GL_DEPTH_TEST)
@@ -1979,6 +3280,8 @@ def draw_realtime_ui(display, mode_btn_rect, connect_btn_rect, record_btn_rect,
     glPopMatrix()
     glMatrixMode(GL_MODELVIEW)
     glPopMatrix()
+draw_realtime_ui._button_cache = {'key': None, 'rects': [], 'labels': []}
+draw_realtime_ui._status_cache = {'key': None, 'lines': []}
 # ======================== 绘制实时模式UI结束 ========================
 
 # ======================== Apple-style UI Rendering ========================
@@ -2258,61 +3561,159 @@ def _draw_apple_status_bar(display, overlay_manager):
 # ======================== Apple-style UI Rendering End ========================
 
 # Draw Joint Angle Label
-def draw_joint_angle_label(joint1_name, joint2_name, joint3_name, joints, display, arc_radius=3.3, color=(0.5, 0.5, 0.5)):
+def _arc_kernel(center, start, cross, parallel, step, out):
+    """
+    Fill ``out`` (N, 3) with the Rodrigues sweep, point i at i * ``step`` degrees.
+    Only compiled when Numba is available.
+    """
+    step_rad = math.radians(step)
+    for i in range(out.shape[0]):
+        c = math.cos(i * step_rad)
+        s = math.sin(i * step_rad)
+        for axis in range(3):
+            out[i, axis] = center[axis] + start[axis] * c + cross[axis] * s + parallel[axis] * (1.0 - c)
+
+
+if NUMBA_AVAILABLE:
+    _arc_kernel = njit(cache=True, fastmath=True)(_arc_kernel)
+    # 导入时预编译（cache=True 时之后的启动直接读缓存），避免首次绘制角度标签卡顿
+    _arc_kernel(np.zeros(3), np.zeros(3), np.zeros(3), np.zeros(3), 5.0, np.empty((1, 3)))
+
+
+def _arc_points(center, start, cross, parallel, angle_deg, step):
+    """
+    (N, 3) Rodrigues sweep of ``start`` about a unit axis k, one point every ``step`` degrees.
+    
+    ``cross`` is k × start and ``parallel`` is k (k · start):
+    p(t) = center + start cos t + cross sin t + parallel (1 - cos t)
+    """
+    if NUMBA_AVAILABLE:
+        out = np.empty((int(angle_deg) // step + 1, 3))
+        _arc_kernel(center, start, cross, parallel, float(step), out)
+        return out
+    t = np.radians(np.arange(0, int(angle_deg) + 1, step, dtype=np.float64))[:, None]
+    c = np.cos(t)
+    return center + start * c + cross * np.sin(t) + parallel * (1.0 - c)
+
+def _project_batch(points_world, modelview, projection, viewport):
+    """
+    gluProject for a stack of (N, 3) world points in one matrix product.
+    
+    ``modelview``/``projection`` are the column-major arrays returned by glGetDoublev,
+    so row vectors multiply them untransposed. Points with w == 0 (where gluProject
+    fails) come back as NaN.
+    """
+    points = np.asarray(points_world, dtype=np.float64).reshape(-1, 3)
+    clip = np.hstack((points, np.ones((len(points), 1)))) @ np.asarray(modelview) @ np.asarray(projection)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ndc = clip[:, :3] / clip[:, 3:]
+    ndc[clip[:, 3] == 0] = np.nan
+    x, y, width, height = np.asarray(viewport, dtype=np.float64)[:4]
+    return np.column_stack((x + width * (ndc[:, 0] + 1) / 2,
+                            y + height * (ndc[:, 1] + 1) / 2,
+                            (ndc[:, 2] + 1) / 2))
+
+# CPU-side camera: the modelview kept in the glGetDoublev (column-major) layout, so the
+# handlers read camera axes without a GPU readback and the frame loads it with glLoadMatrixd.
+# Appending an op X in GL (M = M @ X) is view = X.T @ view in this layout.
+def _perspective_view(fovy, aspect, near, far):
+    """gluPerspective as a column-major (4, 4) array."""
+    f = 1.0 / math.tan(math.radians(fovy) / 2.0)
+    view = np.zeros((4, 4))
+    view[0, 0] = f / aspect
+    view[1, 1] = f
+    view[2, 2] = (far + near) / (near - far)
+    view[2, 3] = -1.0
+    view[3, 2] = 2.0 * far * near / (near - far)
+    return view
+
+def _translate_view(view, offset):
+    """glTranslatef applied in place to a column-major matrix."""
+    view[3] += offset[0] * view[0] + offset[1] * view[1] + offset[2] * view[2]
+
+def _rotate_view_y(view, angle_deg):
+    """glRotatef(angle_deg, 0, 1, 0) applied in place to a column-major matrix."""
+    c = math.cos(math.radians(angle_deg))
+    s = math.sin(math.radians(angle_deg))
+    view[0], view[2] = c * view[0] - s * view[2], s * view[0] + c * view[2]
+
+def draw_projected_labels(labels, font_size=12, color=(0, 0, 0)):
+    """Project the queued (text_pos_3d, text) angle labels together and draw them"""
+    if not labels:
+        return
+    screen = _project_batch([pos for pos, _ in labels], glGetDoublev(GL_MODELVIEW_MATRIX),
+                            glGetDoublev(GL_PROJECTION_MATRIX), glGetIntegerv(GL_VIEWPORT))
+    for (_, text), (x, y, _) in zip(labels, screen.tolist()):
+        if not math.isnan(x):
+            draw_text_2d(x, y, text, color, font_size)
+
+def joint_world_positions(joints):
+    """{name: [x, y, z]} world positions of all joints; joints sharing a SkeletonState are read in one copy"""
+    states = {joint.state for joint in joints.values()}
+    if len(states) == 1 and None not in states:
+        rows = next(iter(states)).matrices[:, :3, 3].tolist()
+        return {name: rows[joint.index] for name, joint in joints.items()}
+    return {name: joint.matrix[:3, 3].tolist() for name, joint in joints.items()}
+
+def draw_joint_angle_label(joint1_name, joint2_name, joint3_name, joints, display, arc_radius=3.3, color=(0.5, 0.5, 0.5), labels=None, positions=None):
+    """``positions`` (from joint_world_positions) lets several labels per frame share one position lookup"""
     if joint1_name not in joints or joint2_name not in joints:
         return
-    p1 = joints[joint1_name].matrix[:3, 3]
-    p2 = joints[joint2_name].matrix[:3, 3]
+    if positions is None:
+        positions = {name: joints[name].matrix[:3, 3].tolist()
+                     for name in (joint1_name, joint2_name, joint3_name) if name in joints}
+    p1 = positions[joint1_name]
     
     if joint3_name in joints:
-        p3 = joints[joint3_name].matrix[:3, 3]
+        p3 = positions[joint3_name]
     else:
-        if joints[joint2_name].end_site is not None and len(joints[joint2_name].end_site) == 3:
-            end_site_pos = joints[joint2_name].matrix @ np.append(joints[joint2_name].end_site, 1.0)
-            p3 = end_site_pos[:3]
+        joint2 = joints[joint2_name]
+        if joint2.end_site is not None and len(joint2.end_site) == 3:
+            # End Site in world space: rotate the offset, then add the joint position (no homogeneous temp)
+            p3 = (joint2.matrix[:3, :3] @ joint2.end_site + joint2.matrix[:3, 3]).tolist()
         else:
             return
-    vec1 = p1 - p2
-    vec2 = p3 - p2
-    
-    if np.linalg.norm(vec1) == 0 or np.linalg.norm(vec2) == 0:
+    # 3 维向量直接用 math 标量运算，避免 np.linalg.norm/np.dot/np.cross 的调度开销
+    x2, y2, z2 = positions[joint2_name]
+    ax, ay, az = (v - o for v, o in zip(p1, (x2, y2, z2)))
+    bx, by, bz = (v - o for v, o in zip(p3, (x2, y2, z2)))
+    len1 = math.sqrt(ax * ax + ay * ay + az * az)
+    len2 = math.sqrt(bx * bx + by * by + bz * bz)
+    if len1 == 0 or len2 == 0:
         return
-    vec1_norm = vec1 / np.linalg.norm(vec1)
-    vec2_norm = vec2 / np.linalg.norm(vec2)
+    ax, ay, az = ax / len1, ay / len1, az / len1
+    bx, by, bz = bx / len2, by / len2, bz / len2
     
-    angle_rad = np.arccos(np.clip(np.dot(vec1_norm, vec2_norm), -1.0, 1.0))
-    angle_deg = np.degrees(angle_rad)
+    angle_rad = math.acos(max(-1.0, min(1.0, ax * bx + ay * by + az * bz)))
+    angle_deg = math.degrees(angle_rad)
     
-    axis = np.cross(vec1_norm, vec2_norm)
-    if np.linalg.norm(axis) == 0:
+    # Rotation axis (unit normal of the two vectors)
+    kx, ky, kz = ay * bz - az * by, az * bx - ax * bz, ax * by - ay * bx
+    axis_len = math.sqrt(kx * kx + ky * ky + kz * kz)
+    if axis_len == 0:
         return
-    axis = axis / np.linalg.norm(axis)
-    start_vector = vec1_norm * arc_radius
+    kx, ky, kz = kx / axis_len, ky / axis_len, kz / axis_len
+    # Rodrigues terms of the start vector: v, k×v and k(k·v)
+    vx, vy, vz = ax * arc_radius, ay * arc_radius, az * arc_radius
+    cx, cy, cz = ky * vz - kz * vy, kz * vx - kx * vz, kx * vy - ky * vx
+    k_dot_v = kx * vx + ky * vy + kz * vz
     angle_step = 5
+    arc = _arc_points(np.array((x2, y2, z2)), np.array((vx, vy, vz)), np.array((cx, cy, cz)),
+                      np.array((kx * k_dot_v, ky * k_dot_v, kz * k_dot_v)), angle_deg, angle_step)
     glLineWidth(1.5)
     glColor3f(*color)
-    glBegin(GL_LINE_STRIP)
-    for i in range(0, int(angle_deg) + 1, angle_step):
-        angle_current_rad = np.radians(i)
-        
-        rotated_vector = start_vector * np.cos(angle_current_rad) + \
-                         np.cross(axis, start_vector) * np.sin(angle_current_rad) + \
-                         axis * np.dot(axis, start_vector) * (1 - np.cos(angle_current_rad))
-        
-        arc_point = p2 + rotated_vector
-        glVertex3f(*arc_point)
-    glEnd()
-    text_pos_3d = p2 + (vec1_norm + vec2_norm) / 2.0 * arc_radius * 1.5
-    modelview_matrix = glGetDoublev(GL_MODELVIEW_MATRIX)
-    projection_matrix = glGetDoublev(GL_PROJECTION_MATRIX)
-    viewport = glGetIntegerv(GL_VIEWPORT)
-    
-    try:
-        text_pos_2d = gluProject(text_pos_3d[0], text_pos_3d[1], text_pos_3d[2], modelview_matrix, projection_matrix, viewport)
-        angle_text = f"{angle_deg:.1f}°"
-        draw_text_2d(text_pos_2d[0], text_pos_2d[1], angle_text, (0, 0, 0), 12)
-    except ValueError:
-        pass
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glVertexPointer(3, GL_DOUBLE, 0, arc)
+    glDrawArrays(GL_LINE_STRIP, 0, len(arc))
+    glDisableClientState(GL_VERTEX_ARRAY)
+    text_scale = arc_radius * 1.5 / 2.0
+    text_pos_3d = (x2 + (ax + bx) * text_scale, y2 + (ay + by) * text_scale, z2 + (az + bz) * text_scale)
+    # 传入 labels 时只排队，由调用方用 draw_projected_labels 一次性投影全部标签
+    label = (text_pos_3d, f"{angle_deg:.1f}°")
+    if labels is not None:
+        labels.append(label)
+    else:
+        draw_projected_labels([label])
 
 # Unproject
 def unproject(winX, winY, winZ=0.0):
@@ -2323,78 +3724,66 @@ def unproject(winX, winY, winZ=0.0):
     return obj_point
 
 # Export Data Dialog
+# CSV export: frames formatted per write, and the file's write buffer size
+EXPORT_CHUNK_FRAMES = 1024
+EXPORT_WRITE_BUFFER = 1 << 20
+# Per-joint CSV columns, in the order of the (pos, vel, accel) x (X, Y, Z) table block
+EXPORT_JOINT_COLUMNS = tuple(f'{quantity}_{axis}({unit})'
+                             for quantity, unit in (('pos', 'm'), ('vel', 'm/s'), ('accel', 'm/s²'))
+                             for axis in 'XYZ')
+
 def export_data_dialog(all_joints, all_positions, all_velocities, all_accelerations, all_anatomical_angles):
-    root = tk.Tk()
-    root.withdraw()
     # Pop up save dialog, default CSV format
     file_path = filedialog.asksaveasfilename(
+        parent=get_tk_root(),
         defaultextension=".csv", 
         filetypes=[("CSV files", "*.csv")],
         title="Export All Joint Angle Data"
     )
-    root.destroy()
     
     if not file_path:
         print("Data export cancelled.")
         return
     try:
         # Use utf-8-sig encoding to solve Chinese/special character (°) encoding issues, compatible with Excel
-        with open(file_path, 'w', newline='', encoding='utf-8-sig') as f:
-            writer = csv.writer(f)
-            
+        # 1 MB 写缓冲：大文件按块写入，不产生大量小的系统调用
+        with open(file_path, 'w', newline='', encoding='utf-8-sig', buffering=EXPORT_WRITE_BUFFER) as f:
             # -------------------------- 1. Build CSV Header --------------------------
             header = ['Frame']  # First column: Frame Number
             # 1.1 Add Joint Position/Velocity/Acceleration (by custom order)
-            joint_names = [name for name in CUSTOM_JOINT_ORDER if name in all_joints]
-            for joint_name in joint_names:
-                header.extend([
-                    f'{joint_name}_pos_X(m)',
-                    f'{joint_name}_pos_Y(m)',
-                    f'{joint_name}_pos_Z(m)',
-                    f'{joint_name}_vel_X(m/s)',
-                    f'{joint_name}_vel_Y(m/s)',
-                    f'{joint_name}_vel_Z(m/s)',
-                    f'{joint_name}_accel_X(m/s²)',
-                    f'{joint_name}_accel_Y(m/s²)',
-                    f'{joint_name}_accel_Z(m/s²)'
-                ])
+            joint_names = ordered_joint_names(all_joints)
+            header.extend(f'{joint_name}_{column}' for joint_name in joint_names for column in EXPORT_JOINT_COLUMNS)
             # 1.2 Add All Joint Angles (automatically collected, includes full body + fingers)
-            angle_keys = set()
-            for frame_angles in all_anatomical_angles:
-                if frame_angles:
-                    angle_keys.update(frame_angles.keys())
-            angle_keys = sorted(angle_keys)  # Sort to ensure consistent export order
+            num_frames = len(all_positions)
+            angle_columns = {name: column for name, column in all_anatomical_angles.columns().items()
+                             if not np.isnan(column).all()}
+            angle_keys = sorted(angle_columns)  # Sort to ensure consistent export order
             for angle_key in angle_keys:
                 header.append(f'{angle_key}(°)')  # Add angle unit for clarity
             
-            # Write header
-            writer.writerow(header)
+            # Write header (field names contain no commas or quotes, no CSV quoting needed)
+            f.write(','.join(header) + '\r\n')
             
-            # -------------------------- 2. Write Data Frame by Frame --------------------------
-            num_frames = len(all_positions)
-            for frame_idx in range(num_frames):
-                row = [frame_idx + 1]  # Frame number starts at 1 (standard convention)
-                
-                # 2.1 Write Position/Velocity/Acceleration (Unit conversion: cm → m)
-                for joint_name in joint_names:
-                    # Get joint information from per-frame data, fill with 0 if no data
-                    pos = all_positions[frame_idx].get(joint_name, np.zeros(3)) / 100
-                    vel = all_velocities[frame_idx].get(joint_name, np.zeros(3)) / 100
-                    accel = all_accelerations[frame_idx].get(joint_name, np.zeros(3)) / 100
-                    # Keep 4 decimal places to avoid data redundancy
-                    row.extend([round(val, 4) for val in pos])
-                    row.extend([round(val, 4) for val in vel])
-                    row.extend([round(val, 4) for val in accel])
-                
-                # 2.2 Write All Joint Angles (includes full body + fingers)
-                current_frame_angles = all_anatomical_angles[frame_idx] if frame_idx < len(all_anatomical_angles) else {}
-                for angle_key in angle_keys:
-                    # Fill with NaN if no angle data (for easier later data analysis)
-                    angle_val = current_frame_angles.get(angle_key, float('nan'))
-                    row.append(angle_val)
-                
-                # Write current frame data
-                writer.writerow(row)
+            # -------------------------- 2. Write Frames in Blocks --------------------------
+            # 每 EXPORT_CHUNK_FRAMES 帧填一块 (B, 1 + 9J + A) 表，用一次 % 格式化成整段文本再 f.write，
+            # 不逐帧逐值循环；只有这一块表常驻内存，不随帧数增长
+            motion_width = 9 * len(joint_names)
+            block = np.empty((min(num_frames, EXPORT_CHUNK_FRAMES), 1 + motion_width + len(angle_keys)))
+            # Position/Velocity/Acceleration per joint as (B, J, quantity, axis) view of the block
+            motion = block[:, 1:1 + motion_width].reshape(len(block), len(joint_names), 3, 3)
+            # Keep 4 decimal places for motion data to avoid data redundancy; angles are already 0.01°
+            row_format = ','.join(['%d'] + ['%.4f'] * motion_width + ['%.2f'] * len(angle_keys)) + '\r\n'
+            for start in range(0, num_frames, EXPORT_CHUNK_FRAMES):
+                window = slice(start, min(start + EXPORT_CHUNK_FRAMES, num_frames))
+                rows = window.stop - start
+                block[:rows, 0] = np.arange(start + 1, window.stop + 1)  # Frame number starts at 1 (standard convention)
+                # Unit conversion: cm → m
+                for quantity, series in enumerate((all_positions, all_velocities, all_accelerations)):
+                    motion[:rows, :, quantity] = series.columns(joint_names, window) / 100
+                # All Joint Angles, NaN where a frame has no angle data (for easier later data analysis)
+                for offset, angle_key in enumerate(angle_keys, start=1 + motion_width):
+                    block[:rows, offset] = angle_columns[angle_key][window]
+                f.write((row_format * rows) % tuple(block[:rows].ravel().tolist()))
             
             # Export success log (shows number of exported angles for verification)
             print(f"✅ Data successfully exported to: {file_path}")
@@ -2406,6 +3795,24 @@ def export_data_dialog(all_joints, all_positions, all_velocities, all_accelerati
     except Exception as e:
         print(f"Data export failed: {e}")
 
+# Event queue coalescing
+def coalesce_mouse_motion(events):
+    """
+    Keep only the last event of each run of consecutive MOUSEMOTION events.
+    
+    The motion handlers work from absolute positions (delta to ``last_mouse_pos``), and
+    a pan or a Y-rotation about a fixed pivot composes additively, so dropping the
+    intermediate events of a run leaves a single drag unchanged. Order relative to
+    button and key events is preserved.
+    """
+    merged = []
+    for event in events:
+        if event.type == pygame.MOUSEMOTION and merged and merged[-1].type == pygame.MOUSEMOTION:
+            merged[-1] = event
+        else:
+            merged.append(event)
+    return merged
+
 # Main function
 def main():
     """
@@ -2434,6 +3841,12 @@ def main():
     # Initialize overlay size
     overlay_manager.update_display_size(display[0], display[1])
     
+    # 启动时就创建共享的隐藏 Tk 根窗口，首次打开对话框不再承担 Tcl 初始化开销
+    try:
+        get_tk_root()
+    except tk.TclError as e:
+        print(f"[Tk] Hidden root unavailable: {e}")
+    
     # -------------------------- New: Set Title Bar/Thumbnail Logo (retained original code, just adapting to the new window) --------------------------
     try:
         app_icon = pygame.image.load("app_icon.ico")
@@ -2451,6 +3864,7 @@ def main():
     # -------------------------- The following is original code (only retaining heavily related initialization logic, no changes needed) --------------------------
     root_joint, joints, motion_data, frames, frame_time = None, {}, [], 0, 0
     current_frame = 0
+    realtime_frame_key = None  # (连接器, 帧序号, 根关节)：与上次相同时跳过骨骼重算
     is_playing = False
     bvh_fps = 0.0
     bvh_total_frames = 0
@@ -2674,14 +4088,17 @@ def main():
     all_anatomical_angles = []
     joint_roms = {}
     
+    # 相机矩阵在 CPU 端维护（列主序），缩放/平移/旋转只改这里，每帧渲染前 glLoadMatrixd 载入
+    camera_matrix = np.identity(4)
+    
     # -------------------------- View Reset Function Adaptation (Ensure correct perspective after scaling) --------------------------
     def reset_view():
         nonlocal aspect_ratio # Must be non-local if aspect_ratio is defined outside and modified within another scope
-        glMatrixMode(GL_MODELVIEW)
-        glLoadIdentity()
         # Key: Use the calculated aspect_ratio (3/4 window's aspect ratio) to set the perspective projection
-        gluPerspective(45, aspect_ratio, 0.1, 1000.0)  # 45° FoV, near clip 0.1, far clip 1000
-        glTranslatef(0.0, -100.0, -300)  # Initial camera position (retained original code, fits skeleton display)
+        camera_matrix[:] = _perspective_view(45, aspect_ratio, 0.1, 1000.0)  # 45° FoV, near clip 0.1, far clip 1000
+        _translate_view(camera_matrix, (0.0, -100.0, -300))  # Initial camera position (retained original code, fits skeleton display)
+        glMatrixMode(GL_MODELVIEW)
+        glLoadMatrixd(camera_matrix)
     
     # The following toggle_play_pause, load_file_dialog, and subsequent logic do not require changes...
         
@@ -2698,17 +4115,13 @@ def main():
         joint_trajectories.clear()
         joint_colors.clear()
         
-        root = tk.Tk()
-        root.withdraw()
-        file_path = filedialog.askopenfilename(defaultextension=".bvh", filetypes=[("BVH files", "*.bvh")])
-        root.destroy()
+        file_path = filedialog.askopenfilename(parent=get_tk_root(), defaultextension=".bvh", filetypes=[("BVH files", "*.bvh")])
         
         if file_path:
             global current_bvh_file_path
             current_bvh_file_path = file_path  # 保存文件路径供网球分析使用
             root_joint, joints, motion_data, frames, frame_time = parse_bvh(file_path)
             if root_joint:
-                motion_data = np.array(motion_data)
                 frames = len(motion_data)
                 current_frame = 0
                 
@@ -2740,12 +4153,13 @@ def main():
         if AppState.axis_studio_connector.is_listening:
             messagebox.showinfo(
                 "Secap Network Settings",
-                "Stop listening before changing Secap network settings."
+                "Stop listening before changing Secap network settings.",
+                parent=get_tk_root()
             )
             return
 
         prefs = AppState.get_secap_preferences()
-        settings_win = tk.Tk()
+        settings_win = tk.Toplevel(get_tk_root())
         settings_win.title("Secap Network Settings")
         settings_win.resizable(False, False)
 
@@ -2804,7 +4218,7 @@ def main():
                 if not tcp_ip:
                     raise ValueError("TCP IP is required")
             except ValueError as exc:
-                messagebox.showerror("Invalid Secap Settings", str(exc))
+                messagebox.showerror("Invalid Secap Settings", str(exc), parent=settings_win)
                 return
 
             UserPreferences.set("secap_transport", transport_var.get())
@@ -2837,7 +4251,7 @@ def main():
         y = max(0, (screen_height - height) // 2)
         settings_win.geometry(f"{width}x{height}+{x}+{y}")
         settings_win.minsize(width, height)
-        settings_win.mainloop()
+        settings_win.wait_window()
     
     # ======================== 实时模式辅助函数 ========================
     def switch_to_mode(target_mode: str):
@@ -2955,6 +4369,12 @@ def main():
             AppState.mode = AppMode.OFFLINE
             print("[Mode] Switched to OFFLINE mode")
     
+    def record_secap_frame(frame_data):
+        """Secap 后台轮询回调：在轮询线程中录制每一帧，渲染卡顿（窗口缩放、对话框）不再丢帧"""
+        recorder = AppState.recording_manager
+        if recorder and recorder.is_recording:
+            recorder.record_frame(frame_data['joints'])
+    
     def toggle_connection():
         """
         切换连接状态
@@ -3007,6 +4427,8 @@ def main():
                         AppState.apply_secap_preferences()
                         success, msg = AppState.axis_studio_connector.start_listening()
                         if success:
+                            # 轮询与录制放到后台线程，渲染循环只取最新帧
+                            AppState.axis_studio_connector.start_background_polling(on_frame=record_secap_frame)
                             endpoint = AppState.axis_studio_connector.get_endpoint_label()
                             if toast_manager:
                                 toast_manager.success(f"已开始接收 {endpoint}")
@@ -3126,14 +4548,12 @@ def main():
             print("[Export] No recording data to export")
             return
         
-        root = tk.Tk()
-        root.withdraw()
         file_path = filedialog.asksaveasfilename(
+            parent=get_tk_root(),
             defaultextension=".bvh",
             filetypes=[("BVH files", "*.bvh")],
             title="Export BVH File"
         )
-        root.destroy()
         
         if file_path:
             success = AppState.recording_manager.export_to_bvh(file_path)
@@ -3153,7 +4573,8 @@ def main():
         - Root joint (Hips): Uses real-time position as world translation
         - Child joints: Use predefined bone lengths from RecordingManager.DEFAULT_OFFSETS
         - Local rotation: Uses quaternions from SDK
-        - World matrix: Computed recursively as M_world = M_parent @ T(offset) @ R(quat)
+        - World matrix: M_world = M_parent @ T(offset) @ R(quat), composed through the
+          SkeletonState parent-index arrays (see init_realtime_skeleton)
         
         Args:
             frame_data (dict): Frame data containing 'joints' dictionary
@@ -3177,43 +4598,40 @@ def main():
                 print(f"[Secap] WARNING: No hand joints in received data!")
             print(f"[Secap] All joints: {', '.join(received_joints[:20])}...")
         
-        def quat_to_rot3x3(w, x, y, z):
-            """四元数转 3×3 旋转矩阵"""
-            return np.array([
-                [1 - 2 * (y * y + z * z), 2 * (x * y - z * w),     2 * (x * z + y * w)],
-                [2 * (x * y + z * w),     1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
-                [2 * (x * z - y * w),     2 * (y * z + x * w),     1 - 2 * (x * x + y * y)]
-            ], dtype=float)
-        
-        def update_joint(joint):
-            # 取当前关节的实时数据（可能缺失）
-            data = frame_joints.get(joint.name, {})
-            rot = data.get('rotation', (1.0, 0.0, 0.0, 0.0))  # (w, x, y, z)
-            w, x, y, z = rot
-            
-            # 构建 4×4 旋转矩阵
-            R3 = quat_to_rot3x3(w, x, y, z)
-            R4 = np.identity(4, dtype=float)
-            R4[:3, :3] = R3
-            
-            if joint.parent is None:
-                # 根关节：使用实时 position 作为世界平移
-                pos = np.array(data.get('position', (0.0, 0.0, 0.0)), dtype=float)
-                T = np.identity(4, dtype=float)
-                T[:3, 3] = pos
-                joint.matrix = T @ R4
-            else:
-                # 子关节：使用预定义骨长 offset（RecordingManager.DEFAULT_OFFSETS 已写入 joint.offset）
-                parent_matrix = target_joints[joint.parent.name].matrix
-                T = np.identity(4, dtype=float)
-                T[:3, 3] = joint.offset  # 单位：cm，与离线 BVH 一致
-                joint.matrix = parent_matrix @ T @ R4
-            
-            # 递归更新子节点
-            for child in joint.children:
-                update_joint(child)
-        
-        update_joint(root_joint)
+        # 骨骼由 init_realtime_skeleton 绑定到 SkeletonState：偏移（骨长）已在拓扑数组中，
+        # 每帧只需填入各关节的局部旋转和根关节平移，再按父关节索引批量合成世界矩阵
+        state = root_joint.state
+        rotations = state._local_rotations  # 局部矩阵的旋转块，偏移列在初始化时已写好
+        root_translation = (0.0, 0.0, 0.0)
+        
+        rot_mats = frame_data.get('joints_rotmat')
+        name_to_row = frame_data.get('name_to_id')
+        if rot_mats is not None and name_to_row is not None:
+            # Secap 帧自带批量计算好的旋转矩阵：行映射按骨骼布局缓存，每帧一次花式索引拷贝
+            row_map = getattr(update_realtime_joints, '_row_map', None)
+            if row_map is None or row_map[0] is not name_to_row or row_map[1] is not state:
+                pairs = [(joint.index, name_to_row[name]) for name, joint in target_joints.items() if name in name_to_row]
+                row_map = (name_to_row, state,
+                           np.array([p[0] for p in pairs], dtype=np.intp),
+                           np.array([p[1] for p in pairs], dtype=np.intp))
+                update_realtime_joints._row_map = row_map
+            rotations[:] = np.identity(3)  # 缺失的关节保持单位旋转
+            rotations[row_map[2]] = rot_mats[row_map[3]]
+            root_row = name_to_row.get(root_joint.name)
+            if root_row is not None:
+                root_translation = frame_data['joints_pos'][root_row]
+        else:
+            # Mocap 帧为 {name: {position, rotation}}：先收集四元数再一次性转换
+            quats = state._quats
+            quats[:] = (1.0, 0.0, 0.0, 0.0)
+            for name, data in frame_joints.items():
+                joint = target_joints.get(name)
+                if joint is not None:
+                    quats[joint.index] = data.get('rotation', (1.0, 0.0, 0.0, 0.0))  # (w, x, y, z)
+            _quats_to_rotations(quats, rotations)
+            root_translation = frame_joints.get(root_joint.name, {}).get('position', (0.0, 0.0, 0.0))
+        
+        state.update_from_rotations(None, root_translation)
     
     def init_realtime_skeleton():
         """
@@ -3264,20 +4682,15 @@ def main():
         
         joints.clear()
         
+        # 使用 RecordingManager 中的默认偏移（模块不可用或不存在时为 0）
+        default_offsets = RecordingManager.DEFAULT_OFFSETS if RECORDING_AVAILABLE else {}
+        
         # 创建所有关节，并写入默认 offset（骨长），单位 cm
         for joint_name in joint_hierarchy.keys():
             parent_name = joint_hierarchy[joint_name]
             parent = joints.get(parent_name) if parent_name else None
             joint = Joint(joint_name, parent=parent)
-            
-            
-            # 使用 RecordingManager 中的默认偏移（若不存在则为 0）
-            try:
-                from recording_manager import RecordingManager
-                offset = RecordingManager.DEFAULT_OFFSETS.get(joint_name, (0.0, 0.0, 0.0))
-            except ImportError:
-                offset = (0.0, 0.0, 0.0)
-            joint.set_offset(offset)
+            joint.set_offset(default_offsets.get(joint_name, (0.0, 0.0, 0.0)))
             
             joints[joint_name] = joint
             if parent:
@@ -3285,6 +4698,13 @@ def main():
         
         root_joint = joints.get('Hips')
         
+        # 数值状态放入 SoA 数组，实时更新走扁平化的父关节索引路径；
+        # 实时矩阵只用于绘制，float32 与 Secap 旋转矩阵及顶点缓冲同精度，无需转换
+        state = SkeletonState(len(joints), dtype=np.float32)
+        for index, joint in enumerate(joints.values()):
+            joint.bind_state(state, index)
+        state.set_topology(joints.values())
+        
         # Debug: Print skeleton structure
         print(f"[Secap] Initialized realtime skeleton with {len(joints)} joints")
         hand_joints = [j for j in joints.keys() if 'Hand' in j]
@@ -3294,12 +4714,12 @@ def main():
         return joints, root_joint
     # ======================== 实时模式辅助函数结束 ========================
     
-    reset_view()
-    running = True
-    while running:
-        overlay_manager.clear()
+    play_btn_size = 20
+    timeline_height = 8
+    
+    def recompute_ui_layout():
+        """Place the play/pause button and timeline for the current display size (startup and VIDEORESIZE only)"""
         # Play button position update
-        play_btn_size = 20
         play_btn_x = (display[0] - play_btn_size) // 2
         play_btn_y = display[1] - 30 - play_btn_size
         play_pause_btn_rect.update(play_btn_x, play_btn_y, play_btn_size, play_btn_size)
@@ -3307,9 +4727,14 @@ def main():
         # Timeline position update
         timeline_width = display[0] - 200
         timeline_x = (display[0] - timeline_width) // 2
-        timeline_height = 8
         timeline_y = play_btn_y - 10 - timeline_height
         timeline_rect.update(timeline_x, timeline_y, timeline_width, timeline_height)
+    
+    reset_view()
+    recompute_ui_layout()
+    running = True
+    while running:
+        overlay_manager.clear()
         
         # ======================== Apple Button Manager Update ========================
         # Update button states with hover/click effects
@@ -3406,7 +4831,8 @@ def main():
         # ======================== Apple Button Manager End ========================
         
         # Event Handling (Optimized mouse operation logic)
-        for event in pygame.event.get():
+        # 高回报率鼠标一帧可积压几十个 MOUSEMOTION：连续的只处理最后一个
+        for event in coalesce_mouse_motion(pygame.event.get()):
             if event.type == pygame.QUIT:
                 pygame.quit()
                 quit()
@@ -3417,6 +4843,9 @@ def main():
                 display = (event.w, event.h)
                 aspect_ratio = event.w / event.h  # Real-time aspect ratio update
                 overlay_manager.update_display_size(event.w, event.h)
+                skeleton_renderer.release()
+                release_trajectory_buffers()
+                release_rect_buffer()
                 
                 # Rebuild window: retain DOUBLEBUF + hardware acceleration, prevent buffer clearing
                 pygame.display.set_mode(
@@ -3431,14 +4860,7 @@ def main():
                 pygame.display.flip()  # Immediately refresh Pygame window to prevent black screen
                 
                 # Synchronize UI control positions (prevent UI misalignment after scaling)
-                play_btn_x = (display[0] - play_btn_size) // 2
-                play_btn_y = display[1] - 30 - play_btn_size
-                play_pause_btn_rect.update(play_btn_x, play_btn_y, play_btn_size, play_btn_size)
-                
-                timeline_width = display[0] - 200
-                timeline_x = (display[0] - timeline_width) // 2
-                timeline_y = play_btn_y - 10 - timeline_height
-                timeline_rect.update(timeline_x, timeline_y, timeline_width, timeline_height)
+                recompute_ui_layout()
             # Mouse Button Down Event (Left-click pan, Middle-click reset, Right-click rotate, Scroll wheel zoom based on view)
             if event.type == pygame.MOUSEBUTTONDOWN:
                 last_mouse_pos = event.pos
@@ -3456,17 +4878,15 @@ def main():
                     middle_button_down = True  # Right-click rotate state
                 elif event.button == 4:
                     # Scroll up: Zoom in based on current view (closer to screen center)
-                    view_matrix = glGetFloatv(GL_MODELVIEW_MATRIX)
                     # Extract camera forward direction (3rd column of view matrix, negative direction is camera forward)
-                    cam_forward = np.array([-view_matrix[2][0], -view_matrix[2][1], -view_matrix[2][2]])
+                    cam_forward = -camera_matrix[2, :3]
                     cam_forward = cam_forward / np.linalg.norm(cam_forward)  # Normalize direction
-                    glTranslatef(*(cam_forward * 10.0))  # Move along forward direction (Zoom in)
+                    _translate_view(camera_matrix, cam_forward * 10.0)  # Move along forward direction (Zoom in)
                 elif event.button == 5:
                     # Scroll down: Zoom out based on current view (further from screen center)
-                    view_matrix = glGetFloatv(GL_MODELVIEW_MATRIX)
-                    cam_forward = np.array([-view_matrix[2][0], -view_matrix[2][1], -view_matrix[2][2]])
+                    cam_forward = -camera_matrix[2, :3]
                     cam_forward = cam_forward / np.linalg.norm(cam_forward)
-                    glTranslatef(*(cam_forward * -10.0))  # Move against forward direction (Zoom out)
+                    _translate_view(camera_matrix, cam_forward * -10.0)  # Move against forward direction (Zoom out)
                 
                 # Button click logic (Load/Export etc.) - Only for legacy UI
                 # Skip if Apple UI is handling buttons
@@ -3558,12 +4978,11 @@ def main():
                 
                 # Left-click pan (original logic remains unchanged, retained)
                 if left_button_down and not timeline_dragging:
-                    view_matrix = glGetFloatv(GL_MODELVIEW_MATRIX)
-                    right_axis = np.array([view_matrix[0][0], view_matrix[1][0], view_matrix[2][0]])
-                    up_axis = np.array([view_matrix[0][1], view_matrix[1][1], view_matrix[2][1]])
+                    right_axis = camera_matrix[:3, 0]
+                    up_axis = camera_matrix[:3, 1]
                     translate_x = rel_x * 0.2 * right_axis
                     translate_y = -rel_y * 0.2 * up_axis
-                    glTranslatef(translate_x[0], translate_y[1], translate_x[2] + translate_y[2])
+                    _translate_view(camera_matrix, (translate_x[0], translate_y[1], translate_x[2] + translate_y[2]))
                 
                 # Right-click drag: Horizontal rotation only around the mannequin (Hips joint) (simplified logic)
                 if middle_button_down and joints:  # Ensure joint data is loaded
@@ -3574,10 +4993,10 @@ def main():
                         joint_world_pos = target_joint.matrix[:3, 3]  # Hips world position
                         
                         # 2. Rotation logic: Translate to Hips center → Horizontal rotation → Translate back
-                        glTranslatef(*joint_world_pos)  # Move Hips to world origin (rotation center)
+                        _translate_view(camera_matrix, joint_world_pos)  # Move Hips to world origin (rotation center)
                         # Only horizontal rotation (around Y-axis, effective for left/right drag, ignored for up/down drag), speed 0.15 is smoother
-                        glRotatef(rel_x * 0.15, 0, 1, 0)  # Only respond to mouse X-axis offset (left/right drag)
-                        glTranslatef(-joint_world_pos[0], -joint_world_pos[1], -joint_world_pos[2])  # Translate back to original position
+                        _rotate_view_y(camera_matrix, rel_x * 0.15)  # Only respond to mouse X-axis offset (left/right drag)
+                        _translate_view(camera_matrix, -joint_world_pos)  # Translate back to original position
                     except Exception as e:
                         print(f"Exception in rotating around mannequin: {e}")
                         pass
@@ -3628,6 +5047,7 @@ def main():
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
         glFlush()  # New: Force clear buffer command to execute instantly, preventing black screen due to delay
         glMatrixMode(GL_MODELVIEW)
+        glLoadMatrixd(camera_matrix)
         
         glPushMatrix()
         draw_grid()
@@ -3646,8 +5066,13 @@ def main():
                     if not joints or root_joint is None:
                         init_realtime_skeleton()
                     
-                    # 按层级更新关节矩阵（根关节 + 子关节）
-                    update_realtime_joints(frame_data, joints, root_joint)
+                    # 重复帧（序号未变）姿态相同，不再重算骨骼
+                    frame_key = (AppState.mocap_connector, frame_data.get('seq'), root_joint)
+                    if frame_key[1] is None or frame_key != realtime_frame_key:
+                        realtime_frame_key = frame_key
+                        
+                        # 按层级更新关节矩阵（根关节 + 子关节）
+                        update_realtime_joints(frame_data, joints, root_joint)
                     
                     # 如果正在录制，记录这一帧
                     if AppState.recording_manager and AppState.recording_manager.is_recording:
@@ -3661,21 +5086,33 @@ def main():
         elif AppState.mode == AppMode.SECAP and AppState.axis_studio_connector:
             # 只要在监听就持续轮询数据
             if AppState.axis_studio_connector.is_listening:
-                # 轮询获取最新数据
-                frame_data = AppState.axis_studio_connector.poll_and_update()
+                # 后台线程轮询时只读取最新帧（录制已在轮询线程完成），否则在此轮询
+                background = AppState.axis_studio_connector.is_background_polling()
+                if background:
+                    frame_data = AppState.axis_studio_connector.get_latest_frame()
+                else:
+                    frame_data = AppState.axis_studio_connector.poll_and_update()
                 
                 if frame_data:
                     # 初始化骨骼结构（如果还没有）
                     if not joints or root_joint is None:
                         init_realtime_skeleton()
                     
-                    # 按层级更新关节矩阵（根关节 + 子关节）
-                    update_realtime_joints(frame_data, joints, root_joint)
+                    # 重复帧（序号未变）姿态相同，不再重算骨骼
+                    frame_key = (AppState.axis_studio_connector, frame_data.get('seq'), root_joint)
+                    if frame_key[1] is None or frame_key != realtime_frame_key:
+                        realtime_frame_key = frame_key
+                        
+                        # 按层级更新关节矩阵（根关节 + 子关节）
+                        update_realtime_joints(frame_data, joints, root_joint)
                     
                     # 如果正在录制，记录这一帧
-                    if AppState.recording_manager and AppState.recording_manager.is_recording:
-                        AppState.recording_manager.record_frame(frame_data['joints'])
-                
+                    if not background:
+                        record_secap_frame(frame_data)
+
+                    # 帧数据已消费完毕，归还连接器复用
+                    AppState.axis_studio_connector.release_frame(frame_data)
+
                 # 渲染骨骼
                 if joints:
                     draw_custom_skeleton(joints)
@@ -3694,6 +5131,8 @@ def main():
             draw_custom_skeleton(joints)  
 
             # -------------------------- Replaced Angle Display Code (includes upper/forearm + back bend + head down) --------------------------
+            angle_labels = []  # 角度文本统一在末尾批量投影
+            angle_positions = joint_world_positions(joints)  # 各角度共用的关节世界坐标，每帧取一次
             # 1. Upper Arm - Forearm Angle (Naming corresponds to RightUpArm_RightForeArm, Red=Right, Blue=Left)
             # Right Upper Arm - Right Forearm: Vertex=RightArm (Upper Arm), Vector 1=RightShoulder→RightArm, Vector 2=RightForeArm→RightArm
             draw_joint_angle_label(
@@ -3703,7 +5142,9 @@ def main():
                 joints=joints, 
                 display=display, 
                 arc_radius=3.3, 
-                color=(0.9, 0.2, 0.2)  # Red, consistent with original style
+                color=(0.9, 0.2, 0.2),  # Red, consistent with original style
+                labels=angle_labels,
+                positions=angle_positions
             )
             # Left Upper Arm - Left Forearm: Vertex=LeftArm (Upper Arm), Vector 1=LeftShoulder→LeftArm, Vector 2=LeftForeArm→LeftArm
             draw_joint_angle_label(
@@ -3713,7 +5154,9 @@ def main():
                 joints=joints, 
                 display=display, 
                 arc_radius=3.3, 
-                color=(0.2, 0.2, 0.9)  # Blue, consistent with original style
+                color=(0.2, 0.2, 0.9),  # Blue, consistent with original style
+                labels=angle_labels,
+                positions=angle_positions
             )
 
             # 2. Back Bend Angle (Green, Vertex=Spine (lower spine), Vector 1=Hips→Spine, Vector 2=Spine2→Spine)
@@ -3724,7 +5167,9 @@ def main():
                 joints=joints, 
                 display=display, 
                 arc_radius=5.0,           # Slightly larger radius to avoid overlap with other angles
-                color=(0.2, 0.9, 0.2)     # Green, distinguishes from other angles
+                color=(0.2, 0.9, 0.2),     # Green, distinguishes from other angles
+                labels=angle_labels,
+                positions=angle_positions
             )
 
             # 3. Head Down Angle (Yellow/Green, Vertex=Neck (neck), Vector 1=Spine2→Neck, Vector 2=Head→Neck)
@@ -3735,16 +5180,19 @@ def main():
                 joints=joints, 
                 display=display, 
                 arc_radius=3.3,           # Radius adapted to the neck area size
-                color=(0.2, 0.9, 0.2)     # Yellow/Green, noticeable and non-conflicting
+                color=(0.2, 0.9, 0.2),     # Yellow/Green, noticeable and non-conflicting
+                labels=angle_labels,
+                positions=angle_positions
             )
 
             # (Optional) Retain other necessary angles (e.g., hip, knee), can be removed if not needed
-            draw_joint_angle_label('Hips', 'RightUpLeg', 'RightLeg', joints, display, arc_radius=5.0, color=(0.9, 0.2, 0.2))
-            draw_joint_angle_label('RightArm', 'RightForeArm', 'RightHand', joints, display, arc_radius=3.3, color=(0.9, 0.2, 0.2))
-            draw_joint_angle_label('LeftArm', 'LeftForeArm', 'LeftHand', joints, display, arc_radius=3.3, color=(0.2, 0.2, 0.9))
-            draw_joint_angle_label('RightUpLeg', 'RightLeg', 'RightFoot', joints, display, arc_radius=5.0, color=(0.9, 0.2, 0.2))
-            draw_joint_angle_label('Hips', 'LeftUpLeg', 'LeftLeg', joints, display, arc_radius=5.0, color=(0.2, 0.2, 0.9))
-            draw_joint_angle_label('LeftUpLeg', 'LeftLeg', 'LeftFoot', joints, display, arc_radius=5.0, color=(0.2, 0.2, 0.9))
+            draw_joint_angle_label('Hips', 'RightUpLeg', 'RightLeg', joints, display, arc_radius=5.0, color=(0.9, 0.2, 0.2), labels=angle_labels, positions=angle_positions)
+            draw_joint_angle_label('RightArm', 'RightForeArm', 'RightHand', joints, display, arc_radius=3.3, color=(0.9, 0.2, 0.2), labels=angle_labels, positions=angle_positions)
+            draw_joint_angle_label('LeftArm', 'LeftForeArm', 'LeftHand', joints, display, arc_radius=3.3, color=(0.2, 0.2, 0.9), labels=angle_labels, positions=angle_positions)
+            draw_joint_angle_label('RightUpLeg', 'RightLeg', 'RightFoot', joints, display, arc_radius=5.0, color=(0.9, 0.2, 0.2), labels=angle_labels, positions=angle_positions)
+            draw_joint_angle_label('Hips', 'LeftUpLeg', 'LeftLeg', joints, display, arc_radius=5.0, color=(0.2, 0.2, 0.9), labels=angle_labels, positions=angle_positions)
+            draw_joint_angle_label('LeftUpLeg', 'LeftLeg', 'LeftFoot', joints, display, arc_radius=5.0, color=(0.2, 0.2, 0.9), labels=angle_labels, positions=angle_positions)
+            draw_projected_labels(angle_labels)
             # -------------------------- Replaced Angle Display Code End --------------------------
 
             # Trajectory Drawing Code (original, unchanged)
@@ -3804,13 +5252,7 @@ def main():
 
             tx = tennis_btn_rect.x
             ty = display[1] - tennis_btn_rect.y - tennis_btn_rect.height
-            draw_rectangle(tx, ty, tennis_btn_rect.width, tennis_btn_rect.height, (0.93, 0.87, 0.51))
-            
-            glColor3f(0, 0, 0); glLineWidth(1.0)
-            glBegin(GL_LINE_LOOP)
-            glVertex2f(tx, ty); glVertex2f(tx + tennis_btn_rect.width, ty)
-            glVertex2f(tx + tennis_btn_rect.width, ty + tennis_btn_rect.height); glVertex2f(tx, ty + tennis_btn_rect.height)
-            glEnd()
+            draw_rect_batch(tx, ty, tennis_btn_rect.width, tennis_btn_rect.height, (0.93, 0.87, 0.51), (0, 0, 0))
 
             t_label = "Tennis Analyze"
             label_x = tx + (tennis_btn_rect.width - len(t_label)*7) / 2
@@ -3845,7 +5287,8 @@ def main():
             
             for joint_name, joint in joints.items():
                 if hasattr(joint, 'matrix') and joint.matrix is not None:
-                    realtime_positions[joint_name] = joint.matrix[:3, 3]
+                    # 矩阵在 SkeletonState 中原地更新，需拷贝出来作为下一帧的"上一帧位置"
+                    realtime_positions[joint_name] = joint.matrix[:3, 3].copy()
             
             # Calculate velocities based on position change
             if realtime_prev_positions and realtime_prev_time is not None:
@@ -72,6 +72,7 @@ class MocapConnector:
         
         # 帧率统计
         self.frame_count = 0
+        self.frame_seq = 0  # 每解析出一帧新数据加一
         self.last_fps_time = time.time()
         self.current_fps = 0.0
         
@@ -342,7 +343,8 @@ class MocapConnector:
                 'RightUpLeg': {...},
                 ...
             },
-            'timestamp': float
+            'timestamp': float,
+            'seq': int  # 新数据帧序号，没有新帧时返回 None
         }
         """
         if not self.is_connected or not self.app:
@@ -407,6 +409,8 @@ class MocapConnector:
                     # 校准期间仍然解析数据（用于显示），但不更新 capture 状态
                     frame_data = self._parse_avatar(evt.event_data.avatar_handle)
                     frame_data['timestamp'] = evt.timestamp
+                    self.frame_seq += 1
+                    frame_data['seq'] = self.frame_seq
                     
                     # 更新帧率统计
                     self._update_fps()
@@ -1,7 +1,11 @@
 import importlib
 import sys
+import threading
 import types
 import unittest
+from unittest import mock
+
+import numpy as np
 
 
 class FakeMCPApplication:
@@ -44,6 +48,37 @@ class FakeMCPSettings:
         self.calls.append(("set_tcp", ip, port))
 
 
+def avatar_event(handle, timestamp):
+    return types.SimpleNamespace(
+        event_type=256,
+        timestamp=timestamp,
+        event_data=types.SimpleNamespace(avatar_handle=handle),
+    )
+
+
+class FakeJoint:
+    def __init__(self, name, position=(0.0, 0.0, 0.0), rotation=(1.0, 0.0, 0.0, 0.0)):
+        self.name = name
+        self.position = position
+        self.rotation = rotation
+
+    def get_name(self):
+        return self.name
+
+    def get_local_position(self):
+        return self.position
+
+    def get_local_rotation(self):
+        if self.rotation is None:
+            raise RuntimeError("joint read failed")
+        return self.rotation
+
+
+def fake_avatar_class(skeletons):
+    """MCPAvatar stand-in: avatar handle -> list of FakeJoint"""
+    return lambda handle: types.SimpleNamespace(get_joints=lambda: skeletons[handle])
+
+
 def import_connector_with_fake_sdk():
     fake_sdk = types.SimpleNamespace(
         MCPApplication=FakeMCPApplication,
@@ -92,6 +127,125 @@ class AxisStudioConnectorTests(unittest.TestCase):
         settings = FakeMCPSettings.instances[-1]
         self.assertIn(("set_udp", 7012), settings.calls)
 
+    def test_poll_parses_only_newest_avatar_event(self):
+        connector = self.connector_module.AxisStudioConnector()
+        connector.start_listening()
+        connector.app.poll_next_event = lambda: [
+            avatar_event("first", 1.0),
+            avatar_event("second", 2.0),
+            avatar_event("third", 3.0),
+        ]
+        parsed = []
+
+        def fake_parse(handle):
+            parsed.append(handle)
+            return {"joints": {}}
+
+        with mock.patch.object(type(connector), "_parse_avatar", staticmethod(fake_parse)):
+            frame = connector.poll_and_update()
+
+        self.assertEqual(["third"], parsed)
+        self.assertEqual(3.0, frame["timestamp"])
+        self.assertEqual(2, connector.dropped_frames)
+        self.assertIs(frame, connector.get_latest_frame())
+        self.assertTrue(connector.frame_ready.is_set())
+
+    def test_repeated_frame_keeps_sequence_number(self):
+        self.use_real_numpy()
+        connector = self.connector_module.AxisStudioConnector()
+        connector.start_listening()
+        hips = FakeJoint("Hips", position=(0.0, 90.0, 0.0))
+        hand = FakeJoint("RightHand", rotation=(1.0, 0.0, 0.0, 0.0))
+        timestamps = [1.0, 2.0, 3.0]
+        connector.app.poll_next_event = lambda: [avatar_event("avatar", timestamps.pop(0))]
+
+        with mock.patch.object(self.connector_module, "MCPAvatar", fake_avatar_class({"avatar": [hips, hand]})):
+            first = connector.poll_and_update()
+            repeated = connector.poll_and_update()
+            # root fixed, limb moving: still a new frame
+            hand.rotation = (0.0, 1.0, 0.0, 0.0)
+            moved = connector.poll_and_update()
+
+        self.assertIs(first, repeated)
+        self.assertEqual((1, 1.0), (repeated["seq"], repeated["timestamp"]))
+        self.assertEqual((2, 3.0), (moved["seq"], moved["timestamp"]))
+        self.assertEqual([0.0, 1.0, 0.0, 0.0], moved["joints_rot"][1].tolist())
+
+    def test_background_polling_hands_each_frame_to_callback(self):
+        connector = self.connector_module.AxisStudioConnector()
+        connector.start_listening()
+        connector.app.poll_next_event = lambda: [avatar_event("pose", 1.0)]
+        received = threading.Event()
+        frames = []
+
+        def on_frame(frame):
+            frames.append(frame)
+            received.set()
+
+        with mock.patch.object(type(connector), "_parse_avatar", staticmethod(lambda handle: {"joints": {}})):
+            self.assertTrue(connector.start_background_polling(interval=0.001, on_frame=on_frame))
+            try:
+                self.assertTrue(received.wait(timeout=1.0))
+            finally:
+                connector.stop_background_polling()
+
+        self.assertEqual(1, frames[0]["seq"])
+        self.assertFalse(connector.is_background_polling())
+
+    def use_real_numpy(self):
+        patches = [mock.patch.dict(sys.modules, {"numpy": np}),
+                   mock.patch.object(self.connector_module, "np", np)]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_parse_failure_releases_frame_without_publishing(self):
+        self.use_real_numpy()
+        connector = self.connector_module.AxisStudioConnector()
+        connector.start_listening()
+        hips = FakeJoint("Hips", position=(1.0, 2.0, 3.0))
+        skeletons = {"avatar": [hips]}
+        connector.app.poll_next_event = lambda: [avatar_event("avatar", 1.0)]
+
+        with mock.patch.object(self.connector_module, "MCPAvatar", fake_avatar_class(skeletons)):
+            first = connector.poll_and_update()
+            hips.rotation = None
+            self.assertIsNone(connector.poll_and_update())
+
+        self.assertEqual(1, connector.frame_seq)
+        self.assertIs(first, connector.get_latest_frame())
+        self.assertEqual(1, len(connector._frame_pool))
+
+    def test_avatar_swap_with_same_joint_count_rereads_names(self):
+        self.use_real_numpy()
+        connector = self.connector_module.AxisStudioConnector()
+        connector.start_listening()
+        skeletons = {"first": [FakeJoint("Hips")], "second": [FakeJoint("Root")]}
+        handles = ["first", "second"]
+        connector.app.poll_next_event = lambda: [avatar_event(handles.pop(0), 1.0)]
+
+        with mock.patch.object(self.connector_module, "MCPAvatar", fake_avatar_class(skeletons)):
+            connector.poll_and_update()
+            frame = connector.poll_and_update()
+
+        self.assertEqual(["Root"], frame["names"])
+        self.assertEqual(0, connector.joint_id("Root"))
+        self.assertIsNone(connector.joint_id("Hips"))
+
+    def test_empty_poll_still_detects_data_timeout(self):
+        connector = self.connector_module.AxisStudioConnector()
+        connector.start_listening()
+        connector.app.poll_next_event = lambda: []
+        connector.is_receiving_data = True
+        connector.last_data_time_ns -= connector.data_timeout_ns + 1
+
+        self.assertIsNone(connector.poll_and_update())
+        self.assertFalse(connector.is_receiving_data)
+        self.assertEqual(
+            self.connector_module.AxisStudioConnectionState.LISTENING,
+            connector.connection_state,
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,202 @@
+import contextlib
+import importlib
+import os
+import re
+import sys
+import tempfile
+import types
+import unittest
+
+import numpy as np
+
+
+@contextlib.contextmanager
+def replaced_modules(modules):
+    # Swap only these sys.modules entries; mock.patch.dict would also drop modules
+    # imported meanwhile (numba's lazily imported submodules fail on re-import)
+    saved = {name: sys.modules.get(name) for name in modules}
+    sys.modules.update(modules)
+    try:
+        yield
+    finally:
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+
+def import_visualizer_without_display():
+    pygame = types.ModuleType("pygame")
+    pygame.Rect = object
+    pygame.Surface = object
+    pygame.locals = types.ModuleType("pygame.locals")
+    fake_modules = {
+        "numpy": np,
+        "pygame": pygame,
+        "pygame.locals": pygame.locals,
+        "OpenGL": types.ModuleType("OpenGL"),
+        "OpenGL.GL": types.ModuleType("OpenGL.GL"),
+        "OpenGL.GLU": types.ModuleType("OpenGL.GLU"),
+    }
+    with replaced_modules(fake_modules):
+        sys.modules.pop("bvh_visualizer_improved", None)
+        return importlib.import_module("bvh_visualizer_improved")
+
+
+class OverlayGlyphBatchTests(unittest.TestCase):
+    def setUp(self):
+        self.visualizer = import_visualizer_without_display()
+
+    def test_rgb_and_rgba_commands_batch_at_same_size(self):
+        manager = self.visualizer.OverlayManager()
+        manager.width = 800
+        manager.draw_text(10, 20, "Mode", (255, 0, 0), size=13)
+        manager.draw_text(10, 40, "Secap", (0, 0, 255, 128), size=13)
+        atlas = {
+            "sizes": np.full((128, 2), (6.0, 13.0), dtype=np.float32),
+            "uvs": np.zeros((128, 4), dtype=np.float32),
+        }
+
+        vertices = manager._glyph_vertices(atlas, manager._commands).reshape(-1, 6, 8)
+
+        self.assertEqual((9, 6, 8), vertices.shape)
+        self.assertTrue(np.allclose(vertices[0, 0, 4:8], (1.0, 0.0, 0.0, 1.0)))
+        self.assertTrue(np.allclose(vertices[-1, 0, 4:8], (0.0, 0.0, 1.0, 128 / 255)))
+        self.assertEqual([10.0, 40.0], vertices[4, 0, :2].tolist())
+
+
+def use_real_numpy(test):
+    # numpy resolves submodules lazily through sys.modules, which other tests may have replaced
+    patcher = replaced_modules({"numpy": np})
+    patcher.__enter__()
+    test.addCleanup(patcher.__exit__, None, None, None)
+
+
+def build_chain(visualizer, joints, names):
+    parent = None
+    for name in names:
+        joint = visualizer.Joint(name, parent=parent)
+        if parent is not None:
+            parent.add_child(joint)
+        joints[name] = joint
+        parent = joint
+
+
+class JointLayoutCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.visualizer = import_visualizer_without_display()
+        use_real_numpy(self)
+
+    def test_layouts_follow_joints_dict_refilled_in_place(self):
+        joints = {}
+        build_chain(self.visualizer, joints, ("Hips", "Spine", "Spine1"))
+        self.assertEqual(("Hips", "Spine", "Spine1"), self.visualizer.ordered_joint_names(joints))
+        self.assertEqual(["Hips_Spine"], self.visualizer.anatomical_angle_layout(joints)["names"][:1])
+
+        # init_realtime_skeleton clears and refills the same dict
+        joints.clear()
+        build_chain(self.visualizer, joints, ("Hips", "LeftUpLeg", "LeftLeg"))
+
+        self.assertEqual(("Hips", "LeftUpLeg", "LeftLeg"), self.visualizer.ordered_joint_names(joints))
+        self.assertEqual(["Hips_LeftUpLeg"], self.visualizer.anatomical_angle_layout(joints)["names"][:1])
+
+
+# Mixed rotation channel orders (and a two-channel joint) so a wrong column or parent shows up
+MIXED_ORDER_HIERARCHY = """HIERARCHY
+ROOT Hips
+{
+  OFFSET 0.0 0.0 0.0
+  CHANNELS 6 Xposition Yposition Zposition Zrotation Xrotation Yrotation
+  JOINT Spine
+  {
+    OFFSET 0.0 10.0 1.0
+    CHANNELS 3 Xrotation Yrotation Zrotation
+    JOINT Head
+    {
+      OFFSET 0.5 8.0 0.0
+      CHANNELS 3 Yrotation Zrotation Xrotation
+      End Site
+      {
+        OFFSET 0.0 3.0 0.0
+      }
+    }
+  }
+  JOINT RightUpLeg
+  {
+    OFFSET -4.0 -1.0 0.0
+    CHANNELS 3 Zrotation Yrotation Xrotation
+    JOINT RightLeg
+    {
+      OFFSET 0.0 -12.0 0.5
+      CHANNELS 2 Xrotation Zrotation
+      End Site
+      {
+        OFFSET 0.0 -10.0 0.0
+      }
+    }
+  }
+}
+"""
+
+
+class KinematicsRegressionTests(unittest.TestCase):
+    def setUp(self):
+        self.visualizer = import_visualizer_without_display()
+        use_real_numpy(self)
+
+    def load_bvh(self, hierarchy, frames=12, frame_time=0.1):
+        rng = np.random.default_rng(7)
+        channel_count = sum(int(count) for count in re.findall(r"CHANNELS (\d+)", hierarchy))
+        motion = rng.uniform(-90.0, 90.0, (frames, channel_count))
+        motion[:, :3] = rng.uniform(-20.0, 20.0, (frames, 3))
+        rows = "\n".join(" ".join(f"{v:.4f}" for v in row) for row in motion)
+        text = f"{hierarchy}MOTION\nFrames: {frames}\nFrame Time: {frame_time}\n{rows}\n"
+        with tempfile.NamedTemporaryFile("w", suffix=".bvh", delete=False) as f:
+            f.write(text)
+        self.addCleanup(os.remove, f.name)
+        return self.visualizer.parse_bvh(f.name)
+
+    def per_frame_positions(self, joints, motion_data):
+        # Unbound copies of the parsed joints take update_joint_matrices' per-joint path
+        copies = {}
+        for name, joint in joints.items():
+            parent = copies[joint.parent.name] if joint.parent is not None else None
+            copy = self.visualizer.Joint(name, parent=parent)
+            copy.set_offset(joint.offset)
+            copy.set_channels(joint.channels, joint.channel_start_index)
+            if parent is not None:
+                parent.add_child(copy)
+            copies[name] = copy
+        root = next(iter(copies.values()))
+        positions = []
+        for frame_data in motion_data:
+            self.visualizer.update_joint_matrices(root, frame_data, copies)
+            positions.append([self.visualizer.get_world_position(joint) for joint in copies.values()])
+        return np.array(positions)
+
+    def test_batched_kinematics_matches_per_frame_update(self):
+        frame_time = 0.1
+        # A single shared order takes SkeletonState's generated Euler kernel instead
+        uniform = re.sub(r"CHANNELS [23]( \w+rotation)+", "CHANNELS 3 Zrotation Xrotation Yrotation",
+                         MIXED_ORDER_HIERARCHY)
+        for label, hierarchy in (("mixed", MIXED_ORDER_HIERARCHY), ("uniform", uniform)):
+            with self.subTest(channel_orders=label):
+                _, joints, motion_data, _, _ = self.load_bvh(hierarchy, frame_time=frame_time)
+
+                positions, velocities, accelerations, _ = self.visualizer.calculate_kinematics(
+                    joints, motion_data, frame_time)
+
+                expected = self.per_frame_positions(joints, motion_data)
+                expected_vel = np.zeros_like(expected)
+                expected_vel[1:] = np.diff(expected, axis=0) / frame_time
+                expected_acc = np.zeros_like(expected)
+                expected_acc[1:] = np.diff(expected_vel, axis=0) / frame_time
+                self.assertEqual(list(joints), positions.names)
+                self.assertTrue(np.allclose(positions.array, expected, rtol=0, atol=1e-4))
+                self.assertTrue(np.allclose(velocities.array, expected_vel, rtol=0, atol=1e-4 / frame_time))
+                self.assertTrue(np.allclose(accelerations.array, expected_acc, rtol=0, atol=1e-4 / frame_time ** 2))
+
+
+if __name__ == "__main__":
+    unittest.main()